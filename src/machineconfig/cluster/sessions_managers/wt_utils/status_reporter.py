@@ -22,7 +22,7 @@ class WTStatusReporter:
         self.session_manager = session_manager
 
     def get_comprehensive_status(self, tabs: List[TabConfig]) -> Dict[str, Any]:
-        """Get comprehensive status including Windows Terminal session and all commands."""
+        """Get comprehensive status including Windows Terminal session and all commands. Commands come from one batched, briefly cached process probe."""
         wt_status = self.session_manager.check_wt_session_status()
         commands_status = self.process_monitor.check_all_commands_status(tabs)
 
@@ -105,7 +105,7 @@ class WTStatusReporter:
         print("=" * 80)
 
     def get_windows_terminal_overview(self) -> Dict[str, Any]:
-        """Get an overview of all Windows Terminal windows and processes."""
+        """Get an overview of all Windows Terminal windows and processes. Reuses the process probe of a `get_comprehensive_status` call made within the cache TTL."""
         try:
             wt_windows = self.process_monitor.get_windows_terminal_windows()
             wt_version = self.session_manager.get_wt_version()
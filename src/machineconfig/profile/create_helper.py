@@ -1,8 +1,99 @@
 
-from typing import Literal
+from typing import Any, Callable, Literal, TypedDict
+from pathlib import Path
+import json
+import os
+import shutil
 from machineconfig.utils.source_of_truth import LIBRARY_ROOT, CONFIG_ROOT
 
 
+ASSETS_MANIFEST_DIR = CONFIG_ROOT.joinpath("manifests")
+
+
+class SyncReport(TypedDict):
+    copied: list[str]
+    deleted: list[str]
+    unchanged: int
+
+
+def _get_hasher() -> tuple[str, Callable[[], Any]]:
+    """xxhash when installed (it is not a hard dependency), blake2b otherwise. The name is stored in the manifest so switching invalidates it."""
+    try:
+        import xxhash
+        return "xxh3_128", xxhash.xxh3_128
+    except ImportError:
+        import hashlib
+        return "blake2b", lambda: hashlib.blake2b(digest_size=16)
+
+
+def _file_digest(path: str, new_hasher: Callable[[], Any]) -> str:
+    hasher = new_hasher()
+    with open(path, "rb") as f:
+        while chunk := f.read(1024 ** 2): hasher.update(chunk)
+    return hasher.hexdigest()
+
+
+def sync_tree(source: Path, target: Path, manifest_path: Path, executable: bool) -> SyncReport:
+    """Incremental one-way sync of `source` into `target`, driven by a manifest of `relative path -> [size, source mtime_ns, digest, target mtime_ns]`.
+    Unchanged files are only stat'ed. Added or changed files are written to a temp file and renamed over the target atomically (with exec bits when `executable`),
+    files whose content already matches are left untouched, and only files that disappeared upstream *and* are recorded in the manifest get deleted.
+    Empty source folders are created in `target` too, as the full copy did."""
+    algorithm, new_hasher = _get_hasher()
+    manifest: dict[str, list[Any]] = {}
+    if manifest_path.exists():
+        try:
+            content = json.loads(manifest_path.read_text(encoding="utf-8"))
+            if content.get("algorithm") == algorithm and content.get("target") == str(target): manifest = content["files"]
+        except (json.JSONDecodeError, KeyError, OSError): manifest = {}
+    report: SyncReport = {"copied": [], "deleted": [], "unchanged": 0}
+    new_manifest: dict[str, list[Any]] = {}
+    for dirpath, dirnames, filenames in os.walk(source):
+        rel_dir = os.path.relpath(dirpath, source)
+        target_dir = os.path.join(target, rel_dir)
+        if not filenames and not dirnames and not os.path.isdir(target_dir): os.makedirs(target_dir)  # non-empty folders are created on their first copy.
+        for name in filenames:
+            rel = name if rel_dir == "." else os.path.join(rel_dir, name).replace(os.sep, "/")
+            src = os.path.join(dirpath, name)
+            dst = os.path.join(target_dir, name)
+            src_stat = os.stat(src)
+            try: dst_stat: os.stat_result | None = os.stat(dst)
+            except OSError: dst_stat = None
+            needs_exec = executable and dst_stat is not None and (dst_stat.st_mode & 0o111) != 0o111
+            entry = manifest.get(rel)
+            if entry is not None and dst_stat is not None and entry[0] == src_stat.st_size == dst_stat.st_size and entry[1] == src_stat.st_mtime_ns and entry[3] == dst_stat.st_mtime_ns:
+                if needs_exec: os.chmod(dst, dst_stat.st_mode | 0o111)
+                new_manifest[rel] = entry
+                report["unchanged"] += 1
+                continue
+            digest = entry[2] if entry is not None and entry[0] == src_stat.st_size and entry[1] == src_stat.st_mtime_ns else _file_digest(src, new_hasher)
+            if dst_stat is not None and dst_stat.st_size == src_stat.st_size and _file_digest(dst, new_hasher) == digest:  # e.g. first run after the old full copy.
+                if needs_exec: os.chmod(dst, dst_stat.st_mode | 0o111)
+                new_manifest[rel] = [src_stat.st_size, src_stat.st_mtime_ns, digest, dst_stat.st_mtime_ns]
+                report["unchanged"] += 1
+                continue
+            os.makedirs(target_dir, exist_ok=True)
+            tmp = os.path.join(target_dir, f".{name}.{os.getpid()}.tmp")
+            try:
+                shutil.copyfile(src, tmp)
+                os.chmod(tmp, (src_stat.st_mode & 0o777) | (0o111 if executable else 0))
+                os.replace(tmp, dst)  # readers see either the old or the new file, never a partial one.
+            finally:
+                if os.path.exists(tmp): os.remove(tmp)
+            new_manifest[rel] = [src_stat.st_size, src_stat.st_mtime_ns, digest, os.stat(dst).st_mtime_ns]
+            report["copied"].append(rel)
+    for rel in manifest.keys() - new_manifest.keys():
+        try:
+            os.remove(os.path.join(target, rel))
+            report["deleted"].append(rel)
+        except FileNotFoundError: pass
+    if new_manifest != manifest:
+        manifest_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_manifest = manifest_path.with_suffix(f".{os.getpid()}.tmp")
+        tmp_manifest.write_text(json.dumps({"algorithm": algorithm, "target": str(target), "files": new_manifest}), encoding="utf-8")
+        os.replace(tmp_manifest, manifest_path)
+    return report
+
+
 def copy_assets_to_machine(which: Literal["scripts", "settings"]):
     # callers, symlink public, shell profile adder (requires init.ps1 and scripts dir to be present on machine)
     import platform
@@ -20,16 +111,7 @@ def copy_assets_to_machine(which: Literal["scripts", "settings"]):
         case "settings":
             source = LIBRARY_ROOT.joinpath("settings")
             target = CONFIG_ROOT.joinpath("settings")
-    from machineconfig.utils.path_extended import PathExtended
-    PathExtended(source).copy(folder=target.parent, overwrite=True)
-    import platform
-    system = platform.system().lower()
-    if system == "linux" and which == "scripts":
-        import subprocess
-        from rich.console import Console
-        console = Console()
-        console.print("\n[bold]📜 Setting executable permissions for scripts...[/bold]")
-        subprocess.run(f"chmod +x {CONFIG_ROOT.joinpath(f'scripts/{system.lower()}')} -R", shell=True, capture_output=True, text=True)
-        console.print("[green]✅ Script permissions updated[/green]")
-
-
+    executable = platform.system().lower() != "windows" and which == "scripts"
+    report = sync_tree(source=source, target=target, manifest_path=ASSETS_MANIFEST_DIR.joinpath(f"{which}_{system}.json"), executable=executable)
+    from rich.console import Console
+    Console().print(f"[green]✅ {which}: {len(report['copied'])} copied, {len(report['deleted'])} deleted, {report['unchanged']} unchanged{' (executable)' if executable else ''}[/green]")
@@ -4,7 +4,6 @@ This script Takes away all config files from the computer, place them in one dir
 
 """
 
-from machineconfig.utils.links import OperationRecord
 from rich.console import Console
 from rich.panel import Panel
 from rich.pretty import Pretty
@@ -12,7 +11,7 @@ from rich.text import Text
 from rich.table import Table
 
 from machineconfig.utils.path_extended import PathExtended
-from machineconfig.utils.links import symlink_map, copy_map
+from machineconfig.utils.links import OperationRecord, symlink_map, copy_map, plan_map, HashManifest, LINKS_HASH_MANIFEST_PATH
 from machineconfig.utils.source_of_truth import LIBRARY_ROOT, CONFIG_ROOT
 
 import platform
@@ -78,14 +77,62 @@ def read_mapper() -> MapperFileData:
     return {"public": public, "private": private}
 
 
+def _apply_one(program_name: str, file_key: str, config_file_default_path: PathExtended, self_managed_config_file_path: PathExtended, use_copy: bool, operation_type: str,
+               on_conflict: Literal["throwError", "overwriteSelfManaged", "backupSelfManaged", "overwriteDefaultPath", "backupDefaultPath"]) -> OperationRecord:
+    try:
+        if use_copy:
+            result = copy_map(config_file_default_path=config_file_default_path, self_managed_config_file_path=self_managed_config_file_path, on_conflict=on_conflict)
+        else:
+            result = symlink_map(config_file_default_path=config_file_default_path, self_managed_config_file_path=self_managed_config_file_path, on_conflict=on_conflict)
+        return {"program": program_name, "file_key": file_key, "defaultPath": str(config_file_default_path), "selfManaged": str(self_managed_config_file_path),
+                "operation": operation_type, "action": result["action"], "details": result["details"], "status": "success"}
+    except Exception as ex:
+        console.print(f"❌ [red]Config error[/red]: {program_name} | {file_key} | {config_file_default_path.name}. {ex}")
+        return {"program": program_name, "file_key": file_key, "defaultPath": str(config_file_default_path), "selfManaged": str(self_managed_config_file_path),
+                "operation": operation_type, "action": "error", "details": f"Failed to create {operation_type}: {str(ex)}", "status": f"error: {str(ex)}"}
+
+
 def apply_mapper(mapper_data: dict[str, list[ConfigMapper]],
                  on_conflict: Literal["throwError", "overwriteSelfManaged", "backupSelfManaged", "overwriteDefaultPath", "backupDefaultPath"],
-                 method: Literal["symlink", "copy"]
-                 ):
-    operation_records: list[OperationRecord] = []
+                 method: Literal["symlink", "copy"],
+                 dry_run: bool = False,
+                 ) -> list[OperationRecord]:
+    """Two phases: every mapper entry is first planned against the current filesystem (file hashes are computed in parallel and
+    cached by size/mtime), then only entries that are not already in the desired state are applied. `dry_run` stops after the plan."""
     print(f"Working with {len(mapper_data)} programs from mapper data.")
     if len(mapper_data) == 1:
         print(mapper_data)
+    # ============================== plan ==============================
+    pairs: list[tuple[str, str, PathExtended, PathExtended, bool, str]] = []  # (program, file_key, default_path, self_managed, use_copy, operation label)
+    for program_name, program_files in mapper_data.items():
+        for a_mapper in program_files:
+            config_file_default_path = PathExtended(a_mapper["config_file_default_path"]).expanduser().absolute()
+            self_managed_config_file_path = PathExtended(a_mapper["self_managed_config_file_path"].replace("CONFIG_ROOT", CONFIG_ROOT.as_posix())).expanduser().absolute()
+            # Determine whether to use copy or symlink
+            use_copy = method == "copy" or bool(a_mapper.get("copy", False))
+            if "contents" in a_mapper and a_mapper["contents"]:
+                for a_target in self_managed_config_file_path.search("*"):
+                    pairs.append((program_name, a_mapper["file_name"], config_file_default_path.joinpath(a_target.name), a_target, use_copy, "contents_copy" if use_copy else "contents_symlink"))
+            else:
+                pairs.append((program_name, a_mapper["file_name"], config_file_default_path, self_managed_config_file_path, use_copy, "copy" if use_copy else "symlink"))
+    hashes = HashManifest(path=LINKS_HASH_MANIFEST_PATH)
+    candidates = [(default_path, self_managed) for _, _, default_path, self_managed, _, _ in pairs if default_path.is_file() and not default_path.is_symlink() and self_managed.is_file()]
+    hashes.prefetch([a_path for a_pair in candidates for a_path in a_pair], workers=8)
+    plan: list[tuple[OperationRecord, bool]] = []
+    for program_name, file_key, default_path, self_managed, use_copy, operation_type in pairs:
+        predicted, changes = plan_map(default_path, self_managed, method="copy" if use_copy else "symlink", on_conflict=on_conflict, hashes=hashes)
+        plan.append(({"program": program_name, "file_key": file_key, "defaultPath": str(default_path), "selfManaged": str(self_managed),
+                      "operation": operation_type, "action": predicted["action"], "details": predicted["details"], "status": "planned" if changes else "success"}, changes))
+    hashes.save()
+    changed = [record for record, changes in plan if changes]
+    if dry_run:
+        table = Table(title=f"🧪 Dry run: {len(changed)} change(s), {len(plan) - len(changed)} entries already up to date", show_header=True, header_style="bold magenta")
+        for column in ("Program", "File Key", "Default Path", "Self Managed", "Operation", "Action", "Details"): table.add_column(column)
+        for record in changed:
+            table.add_row(record["program"], record["file_key"], record["defaultPath"], record["selfManaged"], record["operation"], record["action"], record["details"])
+        console.print(table)
+        return [record for record, _changes in plan]
+    # ============================== apply ==============================
     import os
     if os.name == "nt":
         import ctypes
@@ -93,8 +140,8 @@ def apply_mapper(mapper_data: dict[str, list[ConfigMapper]],
             is_admin = ctypes.windll.shell32.IsUserAnAdmin()
         except Exception:
             is_admin = False
-        total_length = sum(len(item) for item in mapper_data.values())
-        if not is_admin and method == "symlink" and total_length > 5:
+        total_length = sum(1 for record in changed if record["operation"] in ("symlink", "contents_symlink"))
+        if not is_admin and total_length > 5:
             warning_body = "\n".join([
                 "[bold yellow]Administrator privileges required[/]",
                 "Run the terminal as admin and try again to avoid repeated elevation prompts.",
@@ -108,113 +155,24 @@ def apply_mapper(mapper_data: dict[str, list[ConfigMapper]],
                 )
             )
             raise RuntimeError("Run terminal as admin and try again, otherwise, there will be too many popups for admin requests and no chance to terminate the program.")
-    for program_name, program_files in mapper_data.items():
-        console.rule(f"🔄 Processing [bold]{program_name}[/] symlinks", style="cyan")
-        for a_mapper in program_files:
-            config_file_default_path = PathExtended(a_mapper["config_file_default_path"])
-            self_managed_config_file_path = PathExtended(a_mapper["self_managed_config_file_path"].replace("CONFIG_ROOT", CONFIG_ROOT.as_posix()))
-            # Determine whether to use copy or symlink
-            use_copy = method == "copy" or a_mapper.get("copy", False)
-            if "contents" in a_mapper and a_mapper["contents"]:
-                targets = list(self_managed_config_file_path.expanduser().search("*"))
-                for a_target in targets:
-                    operation_type = "contents_copy" if use_copy else "contents_symlink"
-                    try:
-                        if use_copy:
-                            result = copy_map(config_file_default_path=config_file_default_path.joinpath(a_target.name), self_managed_config_file_path=a_target, on_conflict=on_conflict)
-                        else:
-                            result = symlink_map(config_file_default_path=config_file_default_path.joinpath(a_target.name), self_managed_config_file_path=a_target, on_conflict=on_conflict)
-                        operation_records.append({
-                            "program": program_name,
-                            "file_key": a_mapper["file_name"],
-                            "defaultPath": str(config_file_default_path.joinpath(a_target.name)),
-                            "selfManaged": str(a_target),
-                            "operation": operation_type,
-                            "action": result["action"],
-                            "details": result["details"],
-                            "status": "success"
-                        })
-                    except ValueError as ex:
-                        if "resolve to the same location" in str(ex):
-                            operation_records.append({
-                                "program": program_name,
-                                "file_key": a_mapper["file_name"],
-                                "defaultPath": str(config_file_default_path.joinpath(a_target.name)),
-                                "selfManaged": str(a_target),
-                                "operation": operation_type,
-                                "action": "already_linked",
-                                "details": "defaultPath and selfManaged resolve to same location - already correctly configured",
-                                "status": "success"
-                            })
-                        else:
-                            raise
-                    except Exception as ex:
-                        console.print(f"❌ [red]Config error[/red]: {program_name} | {a_mapper['file_name']} | {a_target.name}. {ex}")
-                        operation_records.append({
-                            "program": program_name,
-                            "file_key": a_mapper["file_name"],
-                            "defaultPath": str(config_file_default_path.joinpath(a_target.name)),
-                            "selfManaged": str(a_target),
-                            "operation": operation_type,
-                            "action": "error",
-                            "details": f"Failed to process contents: {str(ex)}",
-                            "status": f"error: {str(ex)}"
-                        })                    
-            else:
-                operation_type = "copy" if use_copy else "symlink"
-                try:
-                    if use_copy:
-                        result = copy_map(config_file_default_path=config_file_default_path, self_managed_config_file_path=self_managed_config_file_path, on_conflict=on_conflict)
-                    else:
-                        result = symlink_map(config_file_default_path=config_file_default_path, self_managed_config_file_path=self_managed_config_file_path, on_conflict=on_conflict)
-                    operation_records.append({
-                        "program": program_name,
-                        "file_key": a_mapper["file_name"],
-                        "defaultPath": str(config_file_default_path),
-                        "selfManaged": str(self_managed_config_file_path),
-                        "operation": operation_type,
-                        "action": result["action"],
-                        "details": result["details"],
-                        "status": "success"
-                    })
-                except ValueError as ex:
-                    if "resolve to the same location" in str(ex):
-                        operation_records.append({
-                            "program": program_name,
-                            "file_key": a_mapper["file_name"],
-                            "defaultPath": str(config_file_default_path),
-                            "selfManaged": str(self_managed_config_file_path),
-                            "operation": operation_type,
-                            "action": "already_linked",
-                            "details": "defaultPath and selfManaged resolve to same location - already correctly configured",
-                            "status": "success"
-                        })
-                    else:
-                        raise
-                except Exception as ex:
-                    console.print(f"❌ [red]Config error[/red]: {program_name} | {a_mapper['file_name']} | {ex}")
-                    operation_records.append({
-                        "program": program_name,
-                        "file_key": a_mapper["file_name"],
-                        "defaultPath": str(config_file_default_path),
-                        "selfManaged": str(self_managed_config_file_path),
-                        "operation": operation_type,
-                        "action": "error",
-                        "details": f"Failed to create {operation_type}: {str(ex)}",
-                        "status": f"error: {str(ex)}"
-                    })
+    operation_records: list[OperationRecord] = []
+    for (record, changes), (program_name, file_key, default_path, self_managed, use_copy, operation_type) in zip(plan, pairs):
+        if not changes:
+            operation_records.append(record)
+            continue
+        operation_records.append(_apply_one(program_name, file_key, default_path, self_managed, use_copy, operation_type, on_conflict=on_conflict))
 
-            if program_name == "ssh" and system == "Linux":  # permissions of ~/dotfiles/.ssh should be adjusted
-                try:
-                    console.print("\n[bold]🔒 Setting secure permissions for SSH files...[/bold]")
-                    subprocess.run("chmod 700 $HOME/.ssh/", shell=True, check=True)
-                    subprocess.run("chmod 700 $HOME/dotfiles/creds/.ssh/", shell=True, check=True)
-                    subprocess.run("chmod 600 $HOME/dotfiles/creds/.ssh/*", shell=True, check=True)
-                    subprocess.run("chmod 600 $HOME/.ssh/*", shell=True, check=True)
-                    console.print("[green]✅ SSH permissions set successfully[/green]")
-                except Exception as e:
-                    ERROR_LIST.append(e)
-                    console.print(f"❌ [red]Error setting SSH permissions[/red]: {e}")
+    if system == "Linux" and any(record["program"] == "ssh" for record in changed):  # permissions of ~/dotfiles/.ssh should be adjusted
+        try:
+            console.print("\n[bold]🔒 Setting secure permissions for SSH files...[/bold]")
+            subprocess.run("chmod 700 $HOME/.ssh/", shell=True, check=True)
+            subprocess.run("chmod 700 $HOME/dotfiles/creds/.ssh/", shell=True, check=True)
+            subprocess.run("chmod 600 $HOME/dotfiles/creds/.ssh/*", shell=True, check=True)
+            subprocess.run("chmod 600 $HOME/.ssh/*", shell=True, check=True)
+            console.print("[green]✅ SSH permissions set successfully[/green]")
+        except Exception as e:
+            ERROR_LIST.append(e)
+            console.print(f"❌ [red]Error setting SSH permissions[/red]: {e}")
 
     # Display operation summary table
     if operation_records:
@@ -281,6 +239,7 @@ def apply_mapper(mapper_data: dict[str, list[ConfigMapper]],
                 border_style="green",
             )
         )
+    return operation_records
 
 
 if __name__ == "__main__":
@@ -6,7 +6,8 @@ from typing import Optional, Literal, Annotated
 def main_public_from_parser(method: Annotated[Literal["symlink", "copy"], typer.Option(..., help="Method to use for setting up the config file.")],
                             on_conflict: Annotated[Literal["throwError", "overwriteDefaultPath", "backupDefaultPath"], typer.Option(..., help="Action to take on conflict")],
                             which: Annotated[Optional[str], typer.Option(..., help="Specific items to process")] = None,
-                            interactive: Annotated[bool, typer.Option(..., help="Run in interactive mode")] = False):
+                            interactive: Annotated[bool, typer.Option(..., help="Run in interactive mode")] = False,
+                            dry_run: Annotated[bool, typer.Option(..., help="Only show the planned changes")] = False):
     """Terminology:
     SOURCE = Self-Managed-Config-File-Path
     TARGET = Config-File-Default-Path
@@ -27,14 +28,15 @@ def main_public_from_parser(method: Annotated[Literal["symlink", "copy"], typer.
 
     from machineconfig.profile.create_links import apply_mapper
     from machineconfig.profile.create_helper import copy_assets_to_machine
-    copy_assets_to_machine(which="settings")  # config files live here and will be linked to.
-    apply_mapper(mapper_data=items_objections, on_conflict=on_conflict, method=method)
+    if not dry_run: copy_assets_to_machine(which="settings")  # config files live here and will be linked to.
+    apply_mapper(mapper_data=items_objections, on_conflict=on_conflict, method=method, dry_run=dry_run)
 
 
 def main_private_from_parser(method: Annotated[Literal["symlink", "copy"], typer.Option(..., help="Method to use for linking files")],
                              on_conflict: Annotated[Literal["throwError", "overwriteSelfManaged", "backupSelfManaged", "overwriteDefaultPath", "backupDefaultPath"], typer.Option(..., help="Action to take on conflict")] = "throwError",
                              which: Annotated[Optional[str], typer.Option(..., help="Specific items to process")] = None,
-                             interactive: Annotated[bool, typer.Option(..., help="Run in interactive mode")] = False):
+                             interactive: Annotated[bool, typer.Option(..., help="Run in interactive mode")] = False,
+                             dry_run: Annotated[bool, typer.Option(..., help="Only show the planned changes")] = False):
     from machineconfig.profile.create_links import ConfigMapper, read_mapper
 
     mapper_full = read_mapper()["private"]
@@ -51,4 +53,4 @@ def main_private_from_parser(method: Annotated[Literal["symlink", "copy"], typer
     items_objections: dict[str, list[ConfigMapper]] = {item: mapper_full[item] for item in items_chosen if item in mapper_full}
 
     from machineconfig.profile.create_links import apply_mapper
-    apply_mapper(mapper_data=items_objections, on_conflict=on_conflict, method=method)
+    apply_mapper(mapper_data=items_objections, on_conflict=on_conflict, method=method, dry_run=dry_run)
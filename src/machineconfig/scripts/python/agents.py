@@ -6,6 +6,7 @@ from pathlib import Path
 from typing import cast, Optional, get_args, Annotated
 import typer
 from machineconfig.scripts.python.helpers_fire.fire_agents_helper_types import AGENTS, HOST, MODEL, PROVIDER
+from machineconfig.scripts.python.helpers_fire.fire_agents_load_balancer import TOKENIZER
 
 
 def create(
@@ -15,7 +16,9 @@ def create(
     provider: Annotated[PROVIDER, typer.Option(..., "--provider", "-p", help=f"Provider to use (for crush agent). One of {', '.join(get_args(PROVIDER)[:3])}")],
     context_path: Annotated[Optional[Path], typer.Option(..., "--context-path", "-c", help="Path to the context file/folder, defaults to .ai/todo/")] = None,
     separator: Annotated[str, typer.Option(..., "--separator", "-s", help="Separator for context")] = "\n",
-    agent_load: Annotated[int, typer.Option(..., "--agent-load", "-al", help="Number of tasks per prompt")] = 13,
+    agent_load: Annotated[int, typer.Option(..., "--agent-load", "-al", help="Number of tasks per prompt, used when --max-tokens is not given. Agents are capped so no single task outweighs the mean load")] = 13,
+    max_tokens: Annotated[Optional[int], typer.Option(..., "--max-tokens", "-mt", help="Cap on the estimated tokens of material per agent, more agents are added to stay under it")] = None,
+    tokenizer: Annotated[TOKENIZER, typer.Option(..., "--tokenizer", "-tk", help=f"Token estimator used to balance agents. One of {', '.join(get_args(TOKENIZER))}")] = "bytes",
     prompt: Annotated[Optional[str], typer.Option(..., "--prompt", "-P", help="Prompt prefix as string")] = None,
     prompt_path: Annotated[Optional[Path], typer.Option(..., "--prompt-path", "-pp", help="Path to prompt file")] = None,
     job_name: Annotated[str, typer.Option(..., "--job-name", "-j", help="Job name")] = "AI_Agents",
@@ -25,9 +28,10 @@ def create(
 ):
 
     from machineconfig.scripts.python.helpers_fire.fire_agents_help_launch import prep_agent_launch, get_agents_launch_layout
-    from machineconfig.scripts.python.helpers_fire.fire_agents_load_balancer import chunk_prompts
+    from machineconfig.scripts.python.helpers_fire.fire_agents_load_balancer import chunk_prompts, get_tokenizer
     from machineconfig.utils.accessories import get_repo_root, randstr
     import json
+    import shutil
 
     # validate mutual exclusive
     prompt_options = [prompt, prompt_path]
@@ -48,27 +52,34 @@ def create(
     if not context_path_resolved.exists():
         raise typer.BadParameter(f"Path does not exist: {context_path_resolved}")
     
+    if agents_dir is None: agents_dir = repo_root / ".ai" / f"tmp_prompts/{job_name}_{randstr()}"
+    elif agents_dir.exists():
+        shutil.rmtree(agents_dir)
+
     if context_path_resolved.is_file():
-        prompt_material_re_splitted = chunk_prompts(context_path_resolved, tasks_per_prompt=agent_load, joiner=separator)
+        prompt_material_re_splitted = chunk_prompts(context_path_resolved, tasks_per_prompt=agent_load, joiner=separator, max_tokens_per_agent=max_tokens,
+                                                    tokenizer=get_tokenizer(tokenizer), output_dir=agents_dir / "prompts")
+        if not prompt_material_re_splitted:
+            raise typer.BadParameter(f"No prompts found in: {context_path_resolved}")
     elif context_path_resolved.is_dir():
         files = [f for f in context_path_resolved.rglob("*") if f.is_file()]
         if not files:
             raise typer.BadParameter(f"No files found in directory: {context_path_resolved}")
-        concatenated = separator.join(f.read_text(encoding="utf-8") for f in files)
-        prompt_material_re_splitted = [concatenated]
+        material_path = agents_dir / "prompts" / "agent_0" / "agent_0_material.txt"
+        material_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(material_path, "wb") as material_file:  # concatenated on disk, the folder can be large.
+            for idx, a_file in enumerate(files):
+                if idx > 0: material_file.write(separator.encode("utf-8"))
+                with open(a_file, "rb") as source: shutil.copyfileobj(source, material_file)
+        prompt_material_re_splitted = [material_path]
     else:
         raise typer.BadParameter(f"Path is neither file nor directory: {context_path_resolved}")
-    
+
     if prompt_path is not None:
         prompt_prefix = prompt_path.read_text(encoding="utf-8")
     else:
         prompt_prefix = cast(str, prompt)
     agent_selected = agent
-    if agents_dir is None: agents_dir = repo_root / ".ai" / f"tmp_prompts/{job_name}_{randstr()}"
-    else:
-        import shutil
-        if agents_dir.exists():
-            shutil.rmtree(agents_dir)
     prep_agent_launch(repo_root=repo_root, agents_dir=agents_dir, prompts_material=prompt_material_re_splitted,
                       keep_material_in_separate_file=separate,
                       prompt_prefix=prompt_prefix, machine=host, agent=agent_selected, model=model, provider=provider,
@@ -82,6 +93,7 @@ agents create "{context_path_resolved}" \\
     --host "{host}" \\
     --job-name "{job_name}" \\
     --agent_load {agent_load} \\
+    {f"--max-tokens {max_tokens}" if max_tokens is not None else ""} --tokenizer {tokenizer} \\
     --separator "{separator}" \\
     {"--separate" if separate else ""}
 """
@@ -29,6 +29,8 @@ def croshell(
     streamlit_viewer: Annotated[bool, typer.Option("--streamlit", "-s", help="view in streamlit app")] = False,
     visidata: Annotated[bool, typer.Option("--visidata", "-v", help="open data file in visidata")] = False,
     marimo: Annotated[bool, typer.Option("--marimo", "-m", help="open the notebook using marimo if available")] = False,
+    lazy: Annotated[bool, typer.Option("--lazy", "-l", help="scan tabular files lazily and memory-map arrays instead of loading them.")] = False,
+    pool: Annotated[bool, typer.Option("--pool", "-k", help="run in a pre-warmed kernel from the background kernel pool (started on first use).")] = False,
 ) -> None:
     # ==================================================================================
     # flags processing
@@ -61,7 +63,7 @@ def croshell(
             print("Streamlit viewer is not yet implemented in this version.")
             return None
         file_obj = PathExtended(str(path).lstrip()).expanduser().absolute()
-        program = lambda_to_defstring(lambda: get_read_data_pycode(path=str(file_obj)), in_global=True)
+        program = lambda_to_defstring(lambda: get_read_data_pycode(path=str(file_obj), lazy=lazy), in_global=True)
         text = f"📄 Reading data from: {file_obj.name}"
         console.print(Panel(text, title="[bold blue]Info[/bold blue]"))
     else:  # if nothing is specified, then run in interactive mode.
@@ -154,6 +156,14 @@ code --new-window {str(pyfile)}
         # ve_path_maybe, ipython_profile_maybe = get_ve_path_and_ipython_profile(Path.cwd())
         # --python 3.14
         fire_line = f"uv run {ve_line} {interpreter} {interactivity} {profile} {str(pyfile)}"
+        if pool and interpreter == "ipython":
+            import platform
+            if platform.system() == "Windows":
+                console.print("⚠️ the kernel pool relies on unix-domain sockets, falling back to a fresh ipython session.")
+            else:
+                from machineconfig.scripts.python.helpers_croshell.kernel_pool import acquire_kernel, DEFAULT_POOL_SIZE, DEFAULT_IDLE_TIMEOUT_SECONDS
+                connection_file = acquire_kernel(uv_args=ve_line.strip(), profile=ipython_profile, size=DEFAULT_POOL_SIZE, idle_timeout=DEFAULT_IDLE_TIMEOUT_SECONDS)
+                fire_line = f"""uv run {ve_line} --with jupyter-console python -m machineconfig.scripts.python.helpers_croshell.kernel_pool attach "{connection_file}" "{str(pyfile)}" --cwd "{str(Path.cwd())}" """
 
     from machineconfig.utils.code import run_shell_script
     run_shell_script(fire_line, clean_env=False)
@@ -1,14 +1,21 @@
 """devops with emojis"""
 
 import typer
+from dataclasses import replace
 from typing import Optional, Annotated
 
-import machineconfig.scripts.python.helpers_devops.cli_repos as cli_repos
-import machineconfig.scripts.python.helpers_devops.cli_config as cli_config
-import machineconfig.scripts.python.helpers_devops.cli_self as cli_self
-import machineconfig.scripts.python.helpers_devops.cli_data as cli_data
-import machineconfig.scripts.python.helpers_devops.cli_nw as cli_network
-from machineconfig.scripts.python.helpers_devops.cli_utils import get_app as get_app_utils
+from machineconfig.utils.lazy_cli import LazySubcommand, get_lazy_group_class
+
+
+_HELPERS = "machineconfig.scripts.python.helpers_devops"
+SUBGROUPS: dict[str, tuple[str, LazySubcommand]] = {  # name -> (short alias, spec), imported only when invoked.
+    "repos": ("r", LazySubcommand(import_path=f"{_HELPERS}.cli_repos:get_app", kind="app", help="📁 [r] Manage development repositories", hidden=False, no_args_is_help=True)),
+    "config": ("c", LazySubcommand(import_path=f"{_HELPERS}.cli_config:get_app", kind="app", help="⚙️ [c] configuration subcommands", hidden=False, no_args_is_help=True)),
+    "data": ("d", LazySubcommand(import_path=f"{_HELPERS}.cli_data:get_app", kind="app", help="💾 [d] Backup and Retrieve configuration files and directories to/from cloud storage using rclone.", hidden=False, no_args_is_help=True)),
+    "self": ("s", LazySubcommand(import_path=f"{_HELPERS}.cli_self:get_app", kind="app", help="🔄 [s] self operations subcommands", hidden=False, no_args_is_help=True)),
+    "network": ("n", LazySubcommand(import_path=f"{_HELPERS}.cli_nw:get_app", kind="app", help="🔐 [n] Network subcommands", hidden=False, no_args_is_help=True)),
+    "utils": ("u", LazySubcommand(import_path=f"{_HELPERS}.cli_utils:get_app", kind="app", help="🛠️ [u]  utilities operations", hidden=False, no_args_is_help=True)),
+}
 
 
 def install(which: Annotated[Optional[str], typer.Argument(..., help="Comma-separated list of program names to install, or group name if --group flag is set.")] = None,
@@ -21,29 +28,12 @@ def install(which: Annotated[Optional[str], typer.Argument(..., help="Comma-sepa
 
 
 def get_app():
+    subcommands = {**{name: spec for name, (_alias, spec) in SUBGROUPS.items()}, **{alias: replace(spec, hidden=True) for _name, (alias, spec) in SUBGROUPS.items()}}
     app = typer.Typer(help="🛠️ DevOps operations", no_args_is_help=True, add_help_option=False,
-                      add_completion=False)
+                      add_completion=False, cls=get_lazy_group_class(subcommands))
     _ = install
     app.command("install", no_args_is_help=True, help="🛠️ [i] Install essential packages")(install)
     app.command("i", no_args_is_help=True, help="Install essential packages", hidden=True)(install)
-    app_repos = cli_repos.get_app()
-    app.add_typer(app_repos, name="repos")
-    app.add_typer(app_repos, name="r", hidden=True)
-    app_config = cli_config.get_app()
-    app.add_typer(app_config, name="config")
-    app.add_typer(app_config, name="c", hidden=True)
-    app_data = cli_data.get_app()
-    app.add_typer(app_data, name="data")
-    app.add_typer(app_data, name="d", hidden=True)
-    app_self = cli_self.get_app()
-    app.add_typer(app_self, name="self")
-    app.add_typer(app_self, name="s", hidden=True)
-    app_nw = cli_network.get_app()
-    app.add_typer(app_nw, name="network")
-    app.add_typer(app_nw, name="n", hidden=True)
-    app_utils = get_app_utils()
-    app.add_typer(app_utils, name="utils")
-    app.add_typer(app_utils, name="u", hidden=True)
     return app
 
 
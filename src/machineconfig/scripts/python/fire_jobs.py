@@ -73,6 +73,14 @@ def route(args: FireJobArgs, fire_args: str = "") -> None:
     elif choice_file.suffix == "": exe = ""
     else: raise NotImplementedError(f"File type {choice_file.suffix} not supported, in the sense that I don't know how to fire it.")
 
+    if args.memo:
+        conflicting = [name for name in ("interactive", "debug", "module", "jupyter", "streamlit", "cmd", "submit_to_cloud", "zellij_tab", "watch", "loop") if getattr(args, name)]
+        if choice_file.suffix != ".py" or conflicting: raise ValueError(f"--memo only applies to python files run non-interactively in this shell, it cannot be combined with {conflicting or choice_file.suffix}.")
+        from machineconfig.scripts.python.helpers_fire_command.fire_jobs_memo import run_memoized
+        run_memoized(file_path=Path(choice_file), function=choice_function, fire_args=fire_args, kwargs=kwargs_dict if args.choose_function else {}, repo_root=repo_root,
+                     ve_root=args.ve or ve_root_from_file, activate_ve_line=activate_ve_line, optimized=args.optimized)
+        return
+
     if args.module or (args.debug and args.choose_function):  # because debugging tools do not support choosing functions and don't interplay with fire module. So the only way to have debugging and choose function options is to import the file as a module into a new script and run the function of interest there and debug the new script.
         assert choice_file.suffix == ".py", f"File must be a python file to be imported as a module. Got {choice_file}"
         from machineconfig.scripts.python.helpers_fire.helpers4 import get_import_module_code
@@ -218,6 +226,7 @@ def fire(
     optimized: Annotated[bool, typer.Option("--optimized", "-O", help="Run the optimized version of the function")] = False,
     zellij_tab: Annotated[Optional[str], typer.Option("--zellij_tab", "-z", help="Open in a new zellij tab")] = None,
     watch: Annotated[bool, typer.Option("--watch", "-w", help="Watch the file for changes")] = False,
+    memo: Annotated[bool, typer.Option("--memo", "-M", help="Replay the recorded output when the source (and its local imports), arguments and environment are unchanged since the last successful run")] = False,
 ) -> None:
     """Main function to process fire jobs arguments."""
 
@@ -245,6 +254,7 @@ def fire(
         optimized=optimized,
         zellij_tab=zellij_tab,
         watch=watch,
+        memo=memo,
     )
     try:
         route(args, fire_args)
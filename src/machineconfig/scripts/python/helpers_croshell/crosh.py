@@ -16,7 +16,7 @@ def code(path: str, title: str):
     except Exception: print(pycode)
 
 
-def get_read_data_pycode(path: str):
+def get_read_data_pycode(path: str, lazy: bool):
     from rich.panel import Panel
     from rich.text import Text
     from rich.console import Console
@@ -26,8 +26,18 @@ def get_read_data_pycode(path: str):
     try:
         from machineconfig.utils.files.read import Read
         from machineconfig.utils.accessories import pprint
-        dat = Read.read(p)
-        if isinstance(dat, dict):
+        dat = Read.read(p, lazy=lazy)
+        if lazy and type(dat).__name__ == "LazyFrame":
+            schema = dat.collect_schema()
+            schema_text = "\n".join(f"{name}: {dtype}" for name, dtype in schema.items())
+            console.print(Panel(Text(schema_text, justify="left"), title=f"🧬 Schema of {p.name} ({len(schema)} columns)", expand=False))
+            console.print(Panel(Text(str(dat.head(5).collect()), justify="left"), title=f"👀 Head of {p.name}", expand=False))
+            console.print("💡 `dat` is lazy: use `dat.describe()` for statistics or `dat.collect()` to load it fully.")
+        elif lazy and type(dat).__name__ == "memmap":
+            preview = f"shape: {dat.shape}\ndtype: {dat.dtype}\n\n{dat[:5]}"
+            console.print(Panel(Text(preview, justify="left"), title=f"🗺️ Memory-mapped array: {p.name}", expand=False))
+            console.print("💡 `dat` is memory-mapped read-only: slices are paged in on access, use `np.array(dat)` to load it fully.")
+        elif isinstance(dat, dict):
             panel_title = f"📄 File Data: {p.name}"
             console.print(Panel(Text(str(dat), justify="left"), title=panel_title, expand=False))
             pprint(dat, p.name)
@@ -0,0 +1,335 @@
+"""Opt-in pool of pre-warmed IPython kernels for `croshell --pool`.
+
+A background daemon (started on first use) listens on a unix-domain socket and keeps `size` warm kernels per environment, an environment being the `uv run`
+arguments croshell would use plus the ipython profile. Kernels are jupyter_client local kernels on the `ipc` transport, warmed by importing polars, numpy and the machineconfig utils.
+A croshell session leases one, runs its script in it and attaches `jupyter console`; the daemon starts a replacement in the background. A reaper shuts down
+kernels that stayed unclaimed for `idle_timeout` and leased kernels whose croshell process is gone, and the daemon exits once it has been idle that long.
+
+    python -m machineconfig.scripts.python.helpers_croshell.kernel_pool benchmark   # time to first executed cell, cold vs warm
+"""
+
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Annotated, Any, Optional
+import hashlib
+import json
+import os
+import socket
+import subprocess
+import threading
+import time
+import uuid
+
+import typer
+
+
+POOL_DIR = Path.home().joinpath("tmp_results", "cache", "croshell_pool")
+POOL_SOCKET = POOL_DIR.joinpath("pool.sock")
+DEFAULT_POOL_SIZE = 1
+DEFAULT_IDLE_TIMEOUT_SECONDS = 30 * 60
+REAP_INTERVAL_SECONDS = 10.0
+DAEMON_START_TIMEOUT_SECONDS = 60.0
+KERNEL_READY_TIMEOUT_SECONDS = 120.0
+WARMUP_CODE = """
+import importlib
+for _name in ("numpy", "polars", "rich", "machineconfig.utils.path_extended", "machineconfig.utils.files.read", "machineconfig.utils.files.headers"):
+    try: importlib.import_module(_name)
+    except ImportError: pass
+del _name
+"""
+
+
+@dataclass
+class PooledKernel:
+    env: str
+    profile: str
+    manager: Any  # jupyter_client.KernelManager
+    connection_file: str
+    ready_since: float
+    owner_pid: Optional[int] = None
+
+
+# ----------------------------------------------------------------- client side (stdlib only, croshell itself does not depend on jupyter_client)
+
+
+def send_request(payload: dict[str, Any], timeout: float) -> dict[str, Any]:
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.settimeout(timeout)
+        sock.connect(str(POOL_SOCKET))
+        sock.sendall((json.dumps(payload) + "\n").encode("utf-8"))
+        with sock.makefile("r", encoding="utf-8") as reader: response = json.loads(reader.readline())
+    if "error" in response: raise RuntimeError(f"💥 kernel pool: {response['error']}")
+    return response
+
+
+def env_key(env: str, profile: str) -> str:
+    """Pool key of an environment: the `uv run` arguments and the ipython profile the kernel is started with."""
+    return f"{env} --profile={profile}"
+
+
+def ensure_daemon(uv_args: str, size: int, idle_timeout: float) -> None:
+    """Starts the daemon (detached, inside the `uv run` environment so it has jupyter_client) unless one already answers on the socket."""
+    try:
+        send_request({"op": "ping"}, timeout=2.0)
+        return
+    except (OSError, json.JSONDecodeError):
+        pass
+    POOL_DIR.mkdir(parents=True, exist_ok=True)
+    command = f"uv run {uv_args} python -m machineconfig.scripts.python.helpers_croshell.kernel_pool serve --size {size} --idle-timeout {idle_timeout}"
+    with open(POOL_DIR.joinpath("daemon.log"), "a", encoding="utf-8") as log:  # the daemon holds its own copy of the descriptor.
+        subprocess.Popen(command, shell=True, start_new_session=True, stdin=subprocess.DEVNULL, stdout=log, stderr=log, cwd=str(POOL_DIR))
+    deadline = time.monotonic() + DAEMON_START_TIMEOUT_SECONDS
+    while time.monotonic() < deadline:
+        time.sleep(0.1)
+        try:
+            send_request({"op": "ping"}, timeout=2.0)
+            return
+        except (OSError, json.JSONDecodeError):
+            continue
+    raise RuntimeError(f"💥 kernel pool daemon did not start within {DAEMON_START_TIMEOUT_SECONDS:.0f}s, see {POOL_DIR.joinpath('daemon.log')}")
+
+
+def acquire_kernel(uv_args: str, profile: str, size: int, idle_timeout: float) -> str:
+    """Leases a warm kernel for `uv_args` and the ipython `profile` to the calling process and returns its connection file. The first call for an environment waits for a cold start."""
+    ensure_daemon(uv_args=uv_args, size=size, idle_timeout=idle_timeout)
+    return send_request({"op": "acquire", "env": uv_args, "profile": profile, "pid": os.getpid()}, timeout=KERNEL_READY_TIMEOUT_SECONDS + 30)["connection_file"]
+
+
+# ----------------------------------------------------------------- daemon side
+
+
+class KernelPool:
+    def __init__(self, size: int, idle_timeout: float):
+        self.size = size
+        self.idle_timeout = idle_timeout
+        self.lock = threading.Lock()
+        self.ready: dict[str, list[PooledKernel]] = {}
+        self.leased: dict[str, PooledKernel] = {}  # connection file -> kernel
+        self.starting: dict[str, int] = {}
+        self.pythons: dict[str, str] = {}
+        self.last_activity = time.monotonic()
+
+    def python_for(self, env: str) -> str:
+        if env not in self.pythons:
+            result = subprocess.run(f"uv run {env} python -c \"import sys; print(sys.executable)\"", shell=True, capture_output=True, text=True, check=True, cwd=str(POOL_DIR))
+            self.pythons[env] = result.stdout.strip().splitlines()[-1]
+        return self.pythons[env]
+
+    def start_kernel(self, env: str, profile: str) -> PooledKernel:
+        from jupyter_client.manager import KernelManager
+        from jupyter_client.kernelspec import KernelSpecManager
+        key = hashlib.sha1(env_key(env, profile).encode("utf-8")).hexdigest()[:12]
+        spec_dir = POOL_DIR.joinpath("kernels", f"croshell-{key}")
+        spec_dir.mkdir(parents=True, exist_ok=True)
+        spec_dir.joinpath("kernel.json").write_text(json.dumps({"argv": [self.python_for(env), "-m", "ipykernel_launcher", f"--profile={profile}", "-f", "{connection_file}"],
+                                                                  "display_name": f"croshell {key}", "language": "python"}), encoding="utf-8")
+        kernel_id = uuid.uuid4().hex[:12]
+        POOL_DIR.joinpath("ipc").mkdir(exist_ok=True)
+        POOL_DIR.joinpath("connections").mkdir(exist_ok=True)
+        manager = KernelManager(kernel_name=f"croshell-{key}", kernel_spec_manager=KernelSpecManager(kernel_dirs=[str(spec_dir.parent)]), transport="ipc",
+                                ip=str(POOL_DIR.joinpath("ipc", kernel_id)), connection_file=str(POOL_DIR.joinpath("connections", f"kernel-{kernel_id}.json")))
+        manager.start_kernel(cwd=str(Path.home()))
+        client = manager.client()
+        client.start_channels()
+        try:
+            client.wait_for_ready(timeout=KERNEL_READY_TIMEOUT_SECONDS)
+            client.execute_interactive(WARMUP_CODE, timeout=KERNEL_READY_TIMEOUT_SECONDS, output_hook=lambda _msg: None)
+        finally:
+            client.stop_channels()
+        return PooledKernel(env=env, profile=profile, manager=manager, connection_file=manager.connection_file, ready_since=time.monotonic())
+
+    def refill(self, env: str, profile: str) -> None:
+        key = env_key(env, profile)
+        with self.lock:
+            missing = self.size - len(self.ready.get(key, [])) - self.starting.get(key, 0)
+            if missing <= 0: return
+            self.starting[key] = self.starting.get(key, 0) + missing
+        for _ in range(missing):
+            try: kernel: Optional[PooledKernel] = self.start_kernel(env, profile)
+            except Exception as error:
+                print(f"💥 failed to start a kernel for `{key}`: {error}", flush=True)
+                kernel = None
+            with self.lock:
+                self.starting[key] -= 1
+                if kernel is not None: self.ready.setdefault(key, []).append(kernel)
+
+    def acquire(self, env: str, profile: str, pid: int) -> PooledKernel:
+        key = env_key(env, profile)
+        with self.lock:
+            self.last_activity = time.monotonic()
+            alive = [kernel for kernel in self.ready.get(key, []) if kernel.manager.is_alive()]
+            kernel = alive.pop(0) if alive else None
+            self.ready[key] = alive
+        if kernel is None: kernel = self.start_kernel(env, profile)  # cold start, only the first session of an environment pays for it.
+        kernel.owner_pid = pid
+        with self.lock: self.leased[kernel.connection_file] = kernel
+        threading.Thread(target=self.refill, args=(env, profile), daemon=True).start()
+        return kernel
+
+    def release(self, connection_file: str) -> None:
+        with self.lock:
+            self.last_activity = time.monotonic()
+            kernel = self.leased.pop(connection_file, None)
+        if kernel is not None: self.shutdown(kernel)
+
+    @staticmethod
+    def shutdown(kernel: PooledKernel) -> None:
+        try:
+            if kernel.manager.is_alive(): kernel.manager.shutdown_kernel(now=True)
+            kernel.manager.cleanup_resources()
+        except Exception as error:
+            print(f"⚠️ failed to shut down kernel {kernel.connection_file}: {error}", flush=True)
+
+    def reap(self) -> bool:
+        """Shuts down stale kernels. Returns False once the daemon has nothing left to do and has been idle for `idle_timeout`."""
+        now = time.monotonic()
+        doomed: list[PooledKernel] = []
+        with self.lock:
+            for connection_file, kernel in list(self.leased.items()):
+                if (kernel.owner_pid is not None and not _pid_alive(kernel.owner_pid)) or not kernel.manager.is_alive(): doomed.append(self.leased.pop(connection_file))
+            for env, kernels in self.ready.items():
+                stale = [kernel for kernel in kernels if now - max(kernel.ready_since, self.last_activity) > self.idle_timeout or not kernel.manager.is_alive()]
+                doomed.extend(stale)
+                self.ready[env] = [kernel for kernel in kernels if kernel not in stale]
+            keep_running = bool(self.leased) or any(self.starting.values()) or now - self.last_activity <= self.idle_timeout
+        for kernel in doomed: self.shutdown(kernel)
+        return keep_running
+
+    def status(self) -> dict[str, Any]:
+        with self.lock:
+            return {"ready": {env: len(kernels) for env, kernels in self.ready.items()}, "starting": dict(self.starting), "leased": len(self.leased)}
+
+
+def _pid_alive(pid: int) -> bool:
+    try: os.kill(pid, 0)
+    except ProcessLookupError: return False
+    except PermissionError: return True
+    return True
+
+
+def serve(size: int, idle_timeout: float) -> None:
+    import socketserver
+    POOL_DIR.mkdir(parents=True, exist_ok=True)
+    if POOL_SOCKET.exists(): POOL_SOCKET.unlink()  # stale socket of a daemon that died, `ensure_daemon` only starts us when nothing answered on it.
+    pool = KernelPool(size=size, idle_timeout=idle_timeout)
+
+    class Handler(socketserver.StreamRequestHandler):
+        def handle(self) -> None:
+            try:
+                request = json.loads(self.rfile.readline())
+                match request.get("op"):
+                    case "ping": response: dict[str, Any] = {"ok": True}
+                    case "status": response = pool.status()
+                    case "acquire": response = {"connection_file": pool.acquire(env=request["env"], profile=request.get("profile", "default"), pid=int(request["pid"])).connection_file}
+                    case "release":
+                        pool.release(request["connection_file"])
+                        response = {"ok": True}
+                    case other: response = {"error": f"unknown op {other!r}"}
+            except Exception as error:
+                response = {"error": repr(error)}
+            self.wfile.write((json.dumps(response) + "\n").encode("utf-8"))
+
+    server = socketserver.ThreadingUnixStreamServer(str(POOL_SOCKET), Handler)
+    server.daemon_threads = True
+    os.chmod(POOL_SOCKET, 0o600)
+
+    def reaper() -> None:
+        while True:
+            time.sleep(REAP_INTERVAL_SECONDS)
+            if not pool.reap(): break
+        server.shutdown()
+
+    threading.Thread(target=reaper, daemon=True).start()
+    import signal
+    signal.signal(signal.SIGTERM, lambda _signum, _frame: threading.Thread(target=server.shutdown, daemon=True).start())  # `shutdown` blocks until `serve_forever` returns.
+    print(f"🐊 croshell kernel pool listening on {POOL_SOCKET} (size={size}, idle timeout={idle_timeout:.0f}s)", flush=True)
+    try: server.serve_forever()
+    finally:
+        server.server_close()
+        if POOL_SOCKET.exists(): POOL_SOCKET.unlink()
+        with pool.lock: kernels = [kernel for kernels in pool.ready.values() for kernel in kernels] + list(pool.leased.values())
+        for kernel in kernels: pool.shutdown(kernel)
+
+
+def attach(connection_file: str, script: str, cwd: str) -> None:
+    """Runs `script` in the leased kernel (in the caller's working directory), hands the terminal to `jupyter console` and shuts the kernel down on exit."""
+    from jupyter_client.blocking.client import BlockingKernelClient
+    client = BlockingKernelClient(connection_file=connection_file)
+    client.load_connection_file()
+    client.start_channels()
+    try:
+        client.wait_for_ready(timeout=KERNEL_READY_TIMEOUT_SECONDS)
+        client.execute_interactive(f"import os; os.chdir({cwd!r}); del os\n%run -i {json.dumps(script)}", timeout=None)
+        from jupyter_console.app import ZMQTerminalIPythonApp
+        ZMQTerminalIPythonApp.launch_instance(argv=["--existing", connection_file, "--no-confirm-exit"])
+    finally:
+        try: client.shutdown()
+        finally: client.stop_channels()
+        try: send_request({"op": "release", "connection_file": connection_file}, timeout=10.0)
+        except (OSError, RuntimeError, json.JSONDecodeError): pass
+
+
+def _time_first_cell(connection_file: str) -> float:
+    from jupyter_client.blocking.client import BlockingKernelClient
+    start = time.perf_counter()
+    client = BlockingKernelClient(connection_file=connection_file)
+    client.load_connection_file()
+    client.start_channels()
+    try:
+        client.wait_for_ready(timeout=KERNEL_READY_TIMEOUT_SECONDS)
+        client.execute_interactive(WARMUP_CODE + "\n1 + 1", timeout=KERNEL_READY_TIMEOUT_SECONDS, output_hook=lambda _msg: None)
+    finally:
+        client.stop_channels()
+    return time.perf_counter() - start
+
+
+def benchmark(uv_args: str, profile: str, repeats: int) -> None:
+    """Time to first executed cell (the imports croshell needs, then `1 + 1`). Cold: a fresh kernel started in-process. Warm: a kernel leased from the pool."""
+    from rich.console import Console
+    from rich.table import Table
+    pool = KernelPool(size=0, idle_timeout=DEFAULT_IDLE_TIMEOUT_SECONDS)
+    cold: list[float] = []
+    warm: list[float] = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        kernel = pool.start_kernel(uv_args, profile)
+        cold.append(time.perf_counter() - start + _time_first_cell(kernel.connection_file))
+        pool.shutdown(kernel)
+    for index in range(repeats + 1):
+        if index > 0:
+            while send_request({"op": "status"}, timeout=10.0)["ready"].get(env_key(uv_args, profile), 0) == 0: time.sleep(0.2)  # wait for the background refill.
+        start = time.perf_counter()
+        connection_file = acquire_kernel(uv_args=uv_args, profile=profile, size=DEFAULT_POOL_SIZE, idle_timeout=DEFAULT_IDLE_TIMEOUT_SECONDS)
+        elapsed = time.perf_counter() - start + _time_first_cell(connection_file)
+        if index > 0: warm.append(elapsed)  # the very first lease may be a cold start of the pool itself.
+        send_request({"op": "release", "connection_file": connection_file}, timeout=30.0)
+    table = Table(title=f"⏱️ croshell time to first executed cell ({repeats} runs)")
+    for column in ("Mode", "Min (s)", "Median (s)", "Max (s)"): table.add_column(column)
+    import statistics
+    for mode, samples in (("cold kernel", cold), ("warm pooled kernel", warm)): table.add_row(mode, f"{min(samples):.3f}", f"{statistics.median(samples):.3f}", f"{max(samples):.3f}")
+    Console().print(table)
+
+
+def get_app() -> typer.Typer:
+    app = typer.Typer(add_completion=False, no_args_is_help=True, help="🐊 pool of pre-warmed kernels for `croshell --pool`")
+
+    @app.command("serve", help="Run the pool daemon (normally started on demand by croshell).")
+    def serve_cli(size: Annotated[int, typer.Option("--size", "-s", help="warm kernels kept per environment")] = DEFAULT_POOL_SIZE,
+                  idle_timeout: Annotated[float, typer.Option("--idle-timeout", "-t", help="seconds before idle kernels, and then the daemon, are shut down")] = DEFAULT_IDLE_TIMEOUT_SECONDS) -> None:
+        serve(size=size, idle_timeout=idle_timeout)
+
+    @app.command("attach", help="Run a script in a leased kernel and open a console on it.")
+    def attach_cli(connection_file: str, script: str, cwd: Annotated[str, typer.Option("--cwd", help="working directory for the kernel")] = ".") -> None:
+        attach(connection_file=connection_file, script=script, cwd=str(Path(cwd).absolute()))
+
+    @app.command("benchmark", help="Time to first executed cell, cold kernel vs warm pooled kernel.")
+    def benchmark_cli(uv_args: Annotated[str, typer.Option("--uv-args", "-u", help="arguments of `uv run` selecting the environment")] = """--with "machineconfig[plot]" """,
+                      profile: Annotated[str, typer.Option("--profile", "-P", help="ipython profile of the kernels")] = "default",
+                      repeats: Annotated[int, typer.Option("--repeats", "-r")] = 3) -> None:
+        benchmark(uv_args=uv_args, profile=profile, repeats=repeats)
+
+    return app
+
+
+if __name__ == "__main__":
+    get_app()()
@@ -9,18 +9,20 @@ import typer
 def private(method: Annotated[Literal["symlink", "copy"], typer.Option(..., "--method", "-m", help="Method to use for linking files")],
                              on_conflict: Annotated[Literal["throwError", "overwriteSelfManaged", "backupSelfManaged", "overwriteDefaultPath", "backupDefaultPath"], typer.Option(..., "--on-conflict", "-o", help="Action to take on conflict")] = "throwError",
                              which: Annotated[Optional[str], typer.Option(..., "--which", "-w", help="Specific items to process")] = None,
-                             interactive: Annotated[bool, typer.Option(..., "--interactive", "-ia", help="Run in interactive mode")] = False):
+                             interactive: Annotated[bool, typer.Option(..., "--interactive", "-ia", help="Run in interactive mode")] = False,
+                             dry_run: Annotated[bool, typer.Option(..., "--dry-run", "-d", help="Only show the planned changes, touch nothing")] = False):
     """🔗 Manage private configuration files."""
     import machineconfig.profile.create_links_export as create_links_export
-    create_links_export.main_private_from_parser(method=method, on_conflict=on_conflict, which=which, interactive=interactive)
+    create_links_export.main_private_from_parser(method=method, on_conflict=on_conflict, which=which, interactive=interactive, dry_run=dry_run)
 
 def public(method: Annotated[Literal["symlink", "copy"], typer.Option(..., "--method", "-m", help="Method to use for setting up the config file.")],
                             on_conflict: Annotated[Literal["throwError", "overwriteDefaultPath", "backupDefaultPath"], typer.Option(..., "--on-conflict", "-o", help="Action to take on conflict")] = "throwError",
                             which: Annotated[Optional[str], typer.Option(..., "--which", "-w", help="Specific items to process")] = None,
-                            interactive: Annotated[bool, typer.Option(..., "--interactive", "-ia", help="Run in interactive mode")] = False):
+                            interactive: Annotated[bool, typer.Option(..., "--interactive", "-ia", help="Run in interactive mode")] = False,
+                            dry_run: Annotated[bool, typer.Option(..., "--dry-run", "-d", help="Only show the planned changes, touch nothing")] = False):
     """🔗 Manage public configuration files."""
     import machineconfig.profile.create_links_export as create_links_export
-    create_links_export.main_public_from_parser(method=method, on_conflict=on_conflict, which=which, interactive=interactive)
+    create_links_export.main_public_from_parser(method=method, on_conflict=on_conflict, which=which, interactive=interactive, dry_run=dry_run)
 
 def dotfile(file: Annotated[str, typer.Argument(help="file/folder path.")],
     overwrite: Annotated[bool, typer.Option("--overwrite", "-o", help="Overwrite.")] = False,
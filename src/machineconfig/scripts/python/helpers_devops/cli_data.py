@@ -3,17 +3,22 @@ import typer
 from typing import Annotated, Optional
 
 def backup(cloud: Annotated[Optional[str], typer.Option("--cloud", "-c", help="☁️  Cloud configuration name (rclone config name)")] = None,
-           which: Annotated[Optional[str], typer.Option("--which", "-w", help="📝 Comma-separated list of items to BACKUP (from backup.toml), or 'all' for all items")] = None):
+           which: Annotated[Optional[str], typer.Option("--which", "-w", help="📝 Comma-separated list of items to BACKUP (from backup.toml), or 'all' for all items")] = None,
+           jobs: Annotated[int, typer.Option("--jobs", "-j", help="🧵 Number of items zipped, encrypted and uploaded concurrently")] = 4,
+           bwlimit: Annotated[Optional[str], typer.Option("--bwlimit", "-b", help="🚦 Total upload bandwidth cap in rclone syntax, e.g. 10M")] = None,
+           force: Annotated[bool, typer.Option("--force", "-f", help="🔁 Upload every item even if unchanged since the last backup")] = False):
     """💾 BACKUP"""
     from machineconfig.scripts.python.helpers_devops.devops_backup_retrieve import main_backup_retrieve
-    main_backup_retrieve(direction="BACKUP", which=which, cloud=cloud)
+    main_backup_retrieve(direction="BACKUP", which=which, cloud=cloud, jobs=jobs, bwlimit=bwlimit, force=force)
 
 
 def retrieve(cloud: Annotated[Optional[str], typer.Option("--cloud", "-c", help="☁️  Cloud configuration name (rclone config name)")] = None,
-             which: Annotated[Optional[str], typer.Option("--which", "-w", help="📝 Comma-separated list of items to RETRIEVE (from backup.toml), or 'all' for all items")] = None):
+             which: Annotated[Optional[str], typer.Option("--which", "-w", help="📝 Comma-separated list of items to RETRIEVE (from backup.toml), or 'all' for all items")] = None,
+             jobs: Annotated[int, typer.Option("--jobs", "-j", help="🧵 Number of items downloaded concurrently")] = 4,
+             bwlimit: Annotated[Optional[str], typer.Option("--bwlimit", "-b", help="🚦 Total download bandwidth cap in rclone syntax, e.g. 10M")] = None):
     """📥 RETRIEVE"""
     from machineconfig.scripts.python.helpers_devops.devops_backup_retrieve import main_backup_retrieve
-    main_backup_retrieve(direction="RETRIEVE", which=which, cloud=cloud)
+    main_backup_retrieve(direction="RETRIEVE", which=which, cloud=cloud, jobs=jobs, bwlimit=bwlimit)
 
 
 def get_app() -> typer.Typer:
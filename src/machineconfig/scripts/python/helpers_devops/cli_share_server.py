@@ -38,9 +38,9 @@ def main(
     password: Annotated[Optional[str], typer.Option("--password", "-w", help="Password for share access (default: from ~/dotfiles/creds/passwords/quick_password)")] = None,
     over_internet: Annotated[bool, typer.Option("--over-internet", "-i", help="Expose the share server over the internet using ngrok")] = False
 ) -> None:
-    from machineconfig.utils.installer_utils.installer import install_if_missing
-    install_if_missing(which="easy-sharing")
-    if over_internet: install_if_missing(which="ngrok", )
+    if over_internet:
+        from machineconfig.utils.installer_utils.installer import install_if_missing
+        install_if_missing(which="ngrok", )
     if username is None:
         import getpass
         username = getpass.getuser()
@@ -51,10 +51,14 @@ def main(
         else:
             # raise ValueError("Password not provided and default password file does not exist.")
             typer.echo(f"⚠️  WARNING: Password not provided and default password file does not exist.\nPath: {pwd_path}\nUsing default password: 'quick_password' (insecure!)", err=True)
-            typer.Exit(code=1)
+            password = "quick_password"
+    root = Path(path).expanduser().resolve()
+    if not root.exists():
+        typer.echo(f"❌ Error: Path does not exist: {root}", err=True)
+        raise typer.Exit(code=1)
 
     if port is None:
-        port = 8080  # Default port for ezshare
+        port = 8080
 
     import socket
     s = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
@@ -65,14 +69,12 @@ def main(
     # Display the flashy share announcement  
     protocol = "http"
     display_share_url(local_ip_v4, port, protocol)
+    import asyncio
     import subprocess
-    import time
-    # Build ezshare command
-    ezshare_cmd = f"""easy-sharing --port {port} --username {username} --password "{password}" {path}"""
-    ezshare_process = subprocess.Popen(ezshare_cmd, shell=True)
-    processes = [ezshare_process]
-    
+    from machineconfig.scripts.python.helpers_devops.share_server import ShareConfig, serve
+    processes: list[subprocess.Popen[bytes]] = []
     if over_internet:
+        import time
         ngrok_process = subprocess.Popen(f"ngrok http {port}", shell=True)
         processes.append(ngrok_process)
         time.sleep(3)
@@ -84,13 +86,13 @@ def main(
             print(f"🌐 Ngrok tunnel ready: {public_url}")
         except Exception as e:
             print(f"Could not retrieve ngrok URL: {e}")
-    
+
+    print("Share server is running. Press Ctrl+C to stop.")
     try:
-        while True:
-            print("Share server is running. Press Ctrl+C to stop.")
-            time.sleep(2)
+        asyncio.run(serve(ShareConfig(root=root, username=username, password=password), host="0.0.0.0", port=port))
     except KeyboardInterrupt:
         print("\nTerminating processes...")
+    finally:
         for p in processes:
             p.terminate()
             p.wait()
@@ -0,0 +1,163 @@
+"""Incremental, concurrent backup of `profile/backup.toml` items: unchanged items are skipped using a local content manifest,
+the rest go through zip -> encrypt -> upload pipelines in parallel over one shared rclone daemon. Retrieval queues every download on one daemon too."""
+
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from datetime import datetime
+from platform import system
+from pathlib import Path
+from typing import Any, Literal, Optional, TypeAlias
+import hashlib
+import json
+import os
+import time
+
+from machineconfig.utils.cloud.rclone_rc import RcloneDaemon, TransferQueue
+from machineconfig.utils.path_extended import PathExtended
+from machineconfig.utils.source_of_truth import CONFIG_ROOT
+
+
+BACKUP_MANIFEST_PATH = CONFIG_ROOT.joinpath("backup_manifest.json")
+ITEM_STATUS: TypeAlias = Literal["uploaded", "retrieved", "unchanged", "missing", "failed"]
+
+
+@dataclass
+class BackupItemReport:
+    name: str
+    path: str
+    status: ITEM_STATUS
+    bytes: int
+    seconds: float
+    error: str
+
+
+def _hash_file(path: str) -> str:
+    digest = hashlib.blake2b(digest_size=16)
+    with open(path, "rb") as handle:
+        while chunk := handle.read(1024 ** 2): digest.update(chunk)
+    return digest.hexdigest()
+
+
+def fingerprint_item(path: Path, file_hashes: dict[str, list[Any]]) -> tuple[str, dict[str, list[Any]]]:
+    """Content fingerprint of a file or folder. `file_hashes` maps file -> [size, mtime_ns, hash] from the previous run;
+    a file is only re-read when its size or mtime moved, so an untouched tree costs one stat per file."""
+    files: list[str] = []
+    if path.is_file():
+        files.append(str(path))
+    else:
+        for dirpath, _dirnames, filenames in os.walk(path):
+            files.extend(os.path.join(dirpath, a_name) for a_name in filenames)
+    new_hashes: dict[str, list[Any]] = {}
+    item_digest = hashlib.blake2b(digest_size=16)
+    for a_file in sorted(files):
+        try: stat = os.stat(a_file, follow_symlinks=False)
+        except OSError: continue
+        previous = file_hashes.get(a_file)
+        if previous is not None and previous[0] == stat.st_size and previous[1] == stat.st_mtime_ns:
+            content_hash = previous[2]
+        else:
+            try: content_hash = _hash_file(a_file)
+            except OSError: continue
+        new_hashes[a_file] = [stat.st_size, stat.st_mtime_ns, content_hash]
+        item_digest.update(os.path.relpath(a_file, path).encode() + b"\0" + content_hash.encode())
+    return item_digest.hexdigest(), new_hashes
+
+
+def get_remote_target(item: dict[str, Any]) -> str:
+    """The remote path RETRIEVE reads the item back from: `cloud_copy $cloud:^ <path> -r...` roots `--relative2home` paths at `myhome`, leaves others unrooted,
+    and never uses the os-specific folder (its `-o` flag is `--overwrite`)."""
+    rel2home = item["rel2home"] == "True"
+    remote = PathExtended(item["path"]).expanduser().absolute().get_remote_path(root="myhome" if rel2home else None, os_specific=False, rel2home=rel2home, strict=False)
+    return remote.as_posix() + (".zip" if item["zip"] == "True" else "") + (".enc" if item["encrypt"] == "True" else "")
+
+
+def _backup_one(item_name: str, item: dict[str, Any], cloud: str, manifest_entry: dict[str, Any], force: bool, rcd: RcloneDaemon) -> tuple[BackupItemReport, Optional[dict[str, Any]]]:
+    start = time.perf_counter()
+    local = PathExtended(item["path"]).expanduser().absolute()
+    if not local.exists():
+        return BackupItemReport(name=item_name, path=str(local), status="missing", bytes=0, seconds=0.0, error=""), None
+    fingerprint, file_hashes = fingerprint_item(local, manifest_entry.get("files", {}))
+    remote = get_remote_target(item)
+    if not force and manifest_entry.get("fingerprint") == fingerprint and manifest_entry.get("remote") == remote:
+        return BackupItemReport(name=item_name, path=str(local), status="unchanged", bytes=0, seconds=time.perf_counter() - start, error=""), None
+    to_del: list[PathExtended] = []
+    try:
+        payload = local
+        if item["zip"] == "True":
+            payload = payload.zip(inplace=False, verbose=False, name=f"{local.name}_{fingerprint[:8]}.zip")  # unique name, items may share a parent.
+            to_del.append(payload)
+        if item["encrypt"] == "True":
+            payload = payload.encrypt(inplace=False, verbose=False)
+            to_del.append(payload)
+        job = rcd.copyto(source=payload.as_posix(), target=f"{cloud}:{remote}")
+    except Exception as err:  # one failing item must not take the others down.
+        return BackupItemReport(name=item_name, path=str(local), status="failed", bytes=0, seconds=time.perf_counter() - start, error=str(err)), None
+    finally:
+        for a_tmp in to_del: a_tmp.delete(sure=True, verbose=False)
+    new_entry = {"fingerprint": fingerprint, "remote": remote, "files": file_hashes, "time": datetime.now().isoformat()}
+    return BackupItemReport(name=item_name, path=str(local), status="uploaded", bytes=job.bytes, seconds=time.perf_counter() - start, error=""), new_entry
+
+
+def run_backup(items: dict[str, dict[str, Any]], cloud: str, jobs: int, bwlimit: Optional[str], force: bool) -> list[BackupItemReport]:
+    """`jobs` bounds how many items are zipped/encrypted/uploaded at once, `bwlimit` (rclone syntax, e.g. `10M`) caps total upload bandwidth."""
+    manifest: dict[str, Any] = json.loads(BACKUP_MANIFEST_PATH.read_text(encoding="utf-8")) if BACKUP_MANIFEST_PATH.exists() else {}
+    with RcloneDaemon() as rcd:
+        if bwlimit is not None: rcd.call("core/bwlimit", rate=bwlimit)
+        with ThreadPoolExecutor(max_workers=max(1, jobs)) as pool:
+            futures = {name: pool.submit(_backup_one, name, item, cloud, manifest.get(f"{cloud}:{name}", {}), force, rcd) for name, item in items.items()}
+            results = {name: future.result() for name, future in futures.items()}
+    for name, (_report, new_entry) in results.items():
+        if new_entry is not None: manifest[f"{cloud}:{name}"] = new_entry
+    BACKUP_MANIFEST_PATH.parent.mkdir(parents=True, exist_ok=True)
+    BACKUP_MANIFEST_PATH.write_text(json.dumps(manifest), encoding="utf-8")
+    return [report for report, _new_entry in results.values()]
+
+
+def _local_download_path(item: dict[str, Any]) -> PathExtended:
+    """Where the archive lands before decrypt/unzip, same naming as `PathExtended.from_cloud`."""
+    local = PathExtended(item["path"]).expanduser().absolute()
+    return PathExtended(str(local) + (".zip" if item["zip"] == "True" else "") + (".enc" if item["encrypt"] == "True" else ""))
+
+
+def _unpack_one(item_name: str, item: dict[str, Any], downloaded: PathExtended) -> PathExtended:
+    result = downloaded
+    if item["encrypt"] == "True": result = result.decrypt(key=None, pwd=None, inplace=True, verbose=False)
+    if item["zip"] == "True": result = result.unzip(inplace=True, verbose=False, overwrite=system().lower() in item_name, content=True, merge=False)
+    return result
+
+
+def run_retrieve(items: dict[str, dict[str, Any]], cloud: str, jobs: int, bwlimit: Optional[str]) -> list[BackupItemReport]:
+    """Downloads all items as jobs on one rclone daemon (at most `jobs` in flight), then decrypts/unzips each one like `cloud_copy` would."""
+    from rich.console import Console
+    console = Console()
+    start = time.perf_counter()
+    reports: dict[str, BackupItemReport] = {}
+    with RcloneDaemon() as rcd:
+        if bwlimit is not None: rcd.call("core/bwlimit", rate=bwlimit)
+        queue = TransferQueue(daemon=rcd, max_concurrent=max(1, jobs))
+        queued = {name: queue.put("copy", f"{cloud}:{get_remote_target(item)}", _local_download_path(item).as_posix()) for name, item in items.items()}
+        def on_progress(stats: dict[str, Any]) -> None:
+            console.print(f"⬇️  {stats.get('bytes', 0) / 1024 ** 2:.1f} MB @ {stats.get('speed', 0.0) / 1024 ** 2:.1f} MB/s, {stats.get('transfers', 0)} files done", end="\r")
+        queue.run(poll_interval=0.2, on_progress=on_progress)
+    for name, job in queued.items():
+        local = PathExtended(items[name]["path"]).expanduser().absolute()
+        if not job.success:
+            reports[name] = BackupItemReport(name=name, path=str(local), status="failed", bytes=0, seconds=job.duration, error=job.error)
+            continue
+        try: _unpack_one(name, items[name], _local_download_path(items[name]))
+        except Exception as err:  # one corrupt archive must not take the others down.
+            reports[name] = BackupItemReport(name=name, path=str(local), status="failed", bytes=job.bytes, seconds=time.perf_counter() - start, error=str(err))
+            continue
+        reports[name] = BackupItemReport(name=name, path=str(local), status="retrieved", bytes=job.bytes, seconds=job.duration, error="")
+    return list(reports.values())
+
+
+def print_backup_report(reports: list[BackupItemReport], title: str = "💾 Backup report") -> None:
+    from rich.console import Console
+    from rich.table import Table
+    table = Table(title=title)
+    for column in ("Item", "Status", "Transferred (MB)", "Seconds", "Error"): table.add_column(column)
+    icons = {"uploaded": "⬆️ uploaded", "retrieved": "⬇️ retrieved", "unchanged": "✅ unchanged", "missing": "👻 missing", "failed": "❌ failed"}
+    for report in reports:
+        table.add_row(report.name, icons[report.status], f"{report.bytes / 1024 ** 2:.2f}", f"{report.seconds:.2f}", report.error)
+    Console().print(table)
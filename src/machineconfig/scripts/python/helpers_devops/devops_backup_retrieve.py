@@ -4,9 +4,7 @@
 from machineconfig.utils.io import read_ini
 from machineconfig.utils.path_extended import PathExtended
 from machineconfig.utils.source_of_truth import LIBRARY_ROOT, DEFAULTS_PATH
-from machineconfig.utils.code import print_code
 from machineconfig.utils.options import choose_cloud_interactively, choose_from_options
-from machineconfig.scripts.python.helpers_cloud.helpers2 import ES
 from platform import system
 from typing import Any, Literal, Optional
 from rich.console import Console
@@ -17,7 +15,7 @@ import tomllib
 OPTIONS = Literal["BACKUP", "RETRIEVE"]
 
 
-def main_backup_retrieve(direction: OPTIONS, which: Optional[str], cloud: Optional[str]) -> None:
+def main_backup_retrieve(direction: OPTIONS, which: Optional[str], cloud: Optional[str], jobs: int = 4, bwlimit: Optional[str] = None, force: bool = False) -> None:
     console = Console()
     try:
         cloud = read_ini(DEFAULTS_PATH)["general"]["rclone_config_name"]
@@ -48,32 +46,21 @@ def main_backup_retrieve(direction: OPTIONS, which: Optional[str], cloud: Option
     else:
         items = {key: val for key, val in bu_file.items() if key in choices}
         console.print(Panel(f"📋 PROCESSING SELECTED ENTRIES\n🔢 Total entries to process: {len(items)}", title="[bold blue]Process Selected Entries[/bold blue]", border_style="blue"))
-    program = f"""$cloud = "{cloud}:{ES}" \n """ if system() == "Windows" else f"""cloud="{cloud}:{ES}" \n """
-    console.print(Panel(f"🚀 GENERATING {direction} SCRIPT\n🌥️  Cloud: {cloud}\n🗂️  Items: {len(items)}", title="[bold blue]Script Generation[/bold blue]", border_style="blue"))
-    for item_name, item in items.items():
-        flags = ""
-        flags += "z" if item["zip"] == "True" else ""
-        flags += "e" if item["encrypt"] == "True" else ""
-        flags += "r" if item["rel2home"] == "True" else ""
-        flags += "o" if system().lower() in item_name else ""
-        console.print(Panel(f"📦 PROCESSING: {item_name}\n📂 Path: {PathExtended(item['path']).as_posix()}\n🏳️  Flags: {flags or 'None'}", title=f"[bold blue]Processing Item: {item_name}[/bold blue]", border_style="blue"))
-        if flags:
-            flags = "-" + flags
-        if direction == "BACKUP":
-            program += f"""\ncloud_copy "{PathExtended(item["path"]).as_posix()}" $cloud {flags}\n"""
-        elif direction == "RETRIEVE":
-            program += f"""\ncloud_copy $cloud "{PathExtended(item["path"]).as_posix()}" {flags}\n"""
-        else:
-            console.print(Panel('❌ ERROR: INVALID DIRECTION\n⚠️  Direction must be either "BACKUP" or "RETRIEVE"', title="[bold red]Error: Invalid Direction[/bold red]", border_style="red"))
-            raise RuntimeError(f"Unknown direction: {direction}")
-        if item_name == "dotfiles" and system() == "Linux":
-            program += """\nchmod 700 ~/.ssh/*\n"""
-            console.print(Panel("🔒 SPECIAL HANDLING: SSH PERMISSIONS\n🛠️  Setting secure permissions for SSH files\n📝 Command: chmod 700 ~/.ssh/*", title="[bold blue]Special Handling: SSH Permissions[/bold blue]", border_style="blue"))
-    print_code(program, lexer="shell", desc=f"{direction} script")
-    console.print(Panel(f"✅ {direction} SCRIPT GENERATION COMPLETE\n🚀 Ready to execute the operations", title="[bold green]Script Generation Complete[/bold green]", border_style="green"))
-    import subprocess
-
-    subprocess.run(program, shell=True, check=True)
+    if direction == "BACKUP":
+        from machineconfig.scripts.python.helpers_devops.devops_backup_engine import run_backup, print_backup_report
+        console.print(Panel(f"🚀 RUNNING INCREMENTAL BACKUP\n🌥️  Cloud: {cloud}\n🗂️  Items: {len(items)}\n🧵 Parallel items: {jobs}", title="[bold blue]Backup[/bold blue]", border_style="blue"))
+        reports = run_backup(items=items, cloud=cloud, jobs=jobs, bwlimit=bwlimit, force=force)
+        print_backup_report(reports)
+        if any(report.status == "failed" for report in reports): raise RuntimeError("Some items failed to back up, see the report above.")
+        return None
+    from machineconfig.scripts.python.helpers_devops.devops_backup_engine import run_retrieve, print_backup_report
+    console.print(Panel(f"🚀 RETRIEVING ITEMS\n🌥️  Cloud: {cloud}\n🗂️  Items: {len(items)}\n🧵 Parallel downloads: {jobs}", title="[bold blue]Retrieve[/bold blue]", border_style="blue"))
+    reports = run_retrieve(items=items, cloud=cloud, jobs=jobs, bwlimit=bwlimit)
+    print_backup_report(reports, title="📥 Retrieve report")
+    if system() == "Linux" and any(report.name == "dotfiles" and report.status == "retrieved" for report in reports):
+        console.print(Panel("🔒 SPECIAL HANDLING: SSH PERMISSIONS\n🛠️  Setting secure permissions for SSH files\n📝 Command: chmod 700 ~/.ssh/*", title="[bold blue]Special Handling: SSH Permissions[/bold blue]", border_style="blue"))
+        for a_file in PathExtended.home().joinpath(".ssh").glob("*"): a_file.chmod(0o700)
+    if any(report.status == "failed" for report in reports): raise RuntimeError("Some items failed to retrieve, see the report above.")
 
 
 if __name__ == "__main__":
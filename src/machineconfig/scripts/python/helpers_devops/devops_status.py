@@ -1,9 +1,14 @@
 """Machine Status Display - Comprehensive system and configuration overview"""
 
+import functools
+import json
+import os
 import platform
-import shutil
+import threading
+import time
+from concurrent.futures import Future
 from pathlib import Path
-from typing import Any
+from typing import Any, Callable
 
 from rich.console import Console
 from rich.panel import Panel
@@ -15,6 +20,9 @@ from machineconfig.utils.source_of_truth import CONFIG_ROOT, DEFAULTS_PATH, LIBR
 
 
 console = Console()
+REPOS_STATUS_CACHE_PATH = Path.home().joinpath("tmp_results", "cache", "devops_status_repos.json")
+REPOS_STATUS_TTL_SECONDS = 30.0
+CHECK_TIMEOUT_SECONDS: dict[str, float] = {"system": 2.0, "shell": 2.0, "repos": 5.0, "ssh": 2.0, "config": 3.0, "tools": 2.0, "backup": 2.0}
 
 
 def _check_system_info() -> dict[str, str]:
@@ -79,41 +87,57 @@ def _check_shell_profile_status() -> dict[str, Any]:
         }
 
 
+def _in_daemon_thread(name: str, check: Callable[[], Any]) -> "Future[Any]":
+    """Runs `check` on a daemon thread: unlike `ThreadPoolExecutor` workers, those are not joined at interpreter exit, so a hung check cannot keep the process alive."""
+    future: Future[Any] = Future()
+    def target() -> None:
+        try: future.set_result(check())
+        except BaseException as ex: future.set_exception(ex)
+    threading.Thread(target=target, name=f"status-{name}", daemon=True).start()
+    return future
+
+
+def _repo_status(repo_path: Path) -> dict[str, Any]:
+    if not repo_path.exists():
+        return {"path": str(repo_path), "name": repo_path.name, "exists": False, "is_repo": False}
+    try:
+        import git
+
+        repo = git.Repo(str(repo_path))
+        return {
+            "path": str(repo_path),
+            "name": repo_path.name,
+            "exists": True,
+            "is_repo": True,
+            "clean": not repo.is_dirty(untracked_files=True),
+            "branch": repo.active_branch.name if not repo.head.is_detached else "DETACHED",
+        }
+    except Exception:
+        return {"path": str(repo_path), "name": repo_path.name, "exists": True, "is_repo": False}
+
+
 def _check_repos_status() -> dict[str, Any]:
-    """Check configured repositories status."""
+    """Check configured repositories status. Repos are inspected in parallel and results younger than REPOS_STATUS_TTL_SECONDS are reused."""
     from machineconfig.utils.io import read_ini
 
     try:
         repos_str = read_ini(DEFAULTS_PATH)["general"]["repos"]
         repo_paths = [Path(p.strip()).expanduser() for p in repos_str.split(",") if p.strip()]
-
-        repos_info = []
-        for repo_path in repo_paths:
-            if not repo_path.exists():
-                repos_info.append({"path": str(repo_path), "name": repo_path.name, "exists": False, "is_repo": False})
-                continue
-
-            try:
-                import git
-
-                repo = git.Repo(str(repo_path))
-                repos_info.append(
-                    {
-                        "path": str(repo_path),
-                        "name": repo_path.name,
-                        "exists": True,
-                        "is_repo": True,
-                        "clean": not repo.is_dirty(untracked_files=True),
-                        "branch": repo.active_branch.name if not repo.head.is_detached else "DETACHED",
-                    }
-                )
-            except Exception:
-                repos_info.append({"path": str(repo_path), "name": repo_path.name, "exists": True, "is_repo": False})
-
-        return {"configured": True, "count": len(repos_info), "repos": repos_info}
     except (FileNotFoundError, KeyError, IndexError):
         return {"configured": False, "count": 0, "repos": []}
 
+    try: cache: dict[str, Any] = json.loads(REPOS_STATUS_CACHE_PATH.read_text(encoding="utf-8"))
+    except (FileNotFoundError, json.JSONDecodeError): cache = {}
+    now = time.time()
+    stale = [a_path for a_path in repo_paths if str(a_path) not in cache or now - cache[str(a_path)]["time"] > REPOS_STATUS_TTL_SECONDS]
+    if stale:
+        futures = [_in_daemon_thread(f"repo-{a_path.name}", functools.partial(_repo_status, a_path)) for a_path in stale]
+        for a_path, future in zip(stale, futures): cache[str(a_path)] = {"time": now, "info": future.result()}
+        REPOS_STATUS_CACHE_PATH.parent.mkdir(parents=True, exist_ok=True)
+        REPOS_STATUS_CACHE_PATH.write_text(json.dumps(cache), encoding="utf-8")
+    repos_info = [cache[str(a_path)]["info"] for a_path in repo_paths]
+    return {"configured": True, "count": len(repos_info), "repos": repos_info}
+
 
 def _check_ssh_status() -> dict[str, Any]:
     """Check SSH configuration status."""
@@ -196,15 +220,37 @@ def _check_config_files_status() -> dict[str, Any]:
         }
 
 
+def get_path_executables() -> set[str]:
+    """Names of every executable on PATH, from one scan of each PATH directory (instead of one full PATH walk per `shutil.which` call).
+    On Windows names are lower-cased and PATHEXT suffixes are dropped, so `git` matches `git.exe`."""
+    is_windows = platform.system() == "Windows"
+    path_exts = [ext.lower() for ext in os.environ.get("PATHEXT", ".COM;.EXE;.BAT;.CMD").split(";") if ext] if is_windows else []
+    executables: set[str] = set()
+    for a_dir in dict.fromkeys(os.environ.get("PATH", "").split(os.pathsep)):
+        try:
+            with os.scandir(a_dir or ".") as entries:
+                for entry in entries:
+                    if is_windows:
+                        stem, ext = os.path.splitext(entry.name.lower())
+                        if ext in path_exts: executables.add(stem)
+                    elif entry.is_file() and os.access(entry.path, os.X_OK):
+                        executables.add(entry.name)
+        except OSError:
+            continue
+    return executables
+
+
 def _check_important_tools() -> dict[str, dict[str, bool]]:
     """Check if important CLI tools are installed, organized by groups."""
     from machineconfig.jobs.installer.package_groups import PACKAGE_GROUP2NAMES
 
+    executables = get_path_executables()
+    normalize: Callable[[str], str] = str.lower if platform.system() == "Windows" else str
     group_status = {}
     for group_name, tools in PACKAGE_GROUP2NAMES.items():
         tool_status = {}
         for tool in tools:
-            tool_status[tool] = shutil.which(tool) is not None
+            tool_status[tool] = normalize(tool) in executables
         group_status[group_name] = tool_status
 
     return group_status
@@ -475,32 +521,38 @@ def _display_backup_status(status: dict[str, Any]) -> None:
     console.print(Panel(table, title="Backup Configuration", border_style=border_style, padding=(1, 2), expand=False))
 
 
+def _display_timeout(name: str, problem: str) -> None:
+    console.print(Panel(f"⏱️  `{name}` check did not finish: {problem}", title=name.title(), border_style="red", padding=(1, 2), expand=False))
+
+
 def main() -> None:
-    """Main function to display comprehensive machine status."""
+    """Main function to display comprehensive machine status. All checks run concurrently, each bounded by CHECK_TIMEOUT_SECONDS."""
+    checks: dict[str, tuple[Callable[[], Any], Callable[[Any], None]]] = {
+        "system": (_check_system_info, _display_system_info),
+        "shell": (_check_shell_profile_status, _display_shell_status),
+        "repos": (_check_repos_status, _display_repos_status),
+        "ssh": (_check_ssh_status, _display_ssh_status),
+        "config": (_check_config_files_status, _display_config_files_status),
+        "tools": (_check_important_tools, _display_tools_status),
+        "backup": (_check_backup_config, _display_backup_status),
+    }
+    started = time.monotonic()
+    futures = {name: _in_daemon_thread(name, check) for name, (check, _display) in checks.items()}
+
     console.print("\n")
     console.print(Panel(Text("📊 Machine Status Report", justify="center", style="bold white"), style="bold blue", padding=(1, 2)))
     console.print("\n")
 
-    system_info = _check_system_info()
-    _display_system_info(system_info)
-
-    shell_status = _check_shell_profile_status()
-    _display_shell_status(shell_status)
-
-    repos_status = _check_repos_status()
-    _display_repos_status(repos_status)
-
-    ssh_status = _check_ssh_status()
-    _display_ssh_status(ssh_status)
-
-    config_status = _check_config_files_status()
-    _display_config_files_status(config_status)
-
-    tools_status = _check_important_tools()
-    _display_tools_status(tools_status)
-
-    backup_status = _check_backup_config()
-    _display_backup_status(backup_status)
+    for name, (_check, display) in checks.items():
+        try:
+            result = futures[name].result(timeout=max(0.0, started + CHECK_TIMEOUT_SECONDS[name] - time.monotonic()))
+        except TimeoutError:
+            _display_timeout(name, f"timed out after {CHECK_TIMEOUT_SECONDS[name]:.0f}s")
+            continue
+        except Exception as ex:
+            _display_timeout(name, str(ex))
+            continue
+        display(result)
 
     console.print("\n")
     console.print(Panel(Text("✨ Status report complete!", justify="center", style="bold green"), style="green", padding=(1, 2)))
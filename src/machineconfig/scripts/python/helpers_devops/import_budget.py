@@ -0,0 +1,68 @@
+"""Startup budget for the console scripts in `pyproject.toml`. Every entry module is imported in a fresh `python -X importtime` process and
+its cumulative import time is checked against a budget, since these commands are launched hundreds of times a day from shells and zellij tabs.
+Budgets are for a machine that imports `typer` in `REFERENCE_MS`, on slower machines they are scaled by the measured `typer` import so the check tracks the code, not the host.
+Also run as `tests/test_import_budget.py`.
+
+    python -m machineconfig.scripts.python.helpers_devops.import_budget   # exits with 1 when any entry point is over budget
+"""
+
+import statistics
+import subprocess
+import sys
+
+
+ENTRY_POINT_BUDGETS_MS: dict[str, float] = {
+    "machineconfig.scripts.python.entry": 100.0,
+    "machineconfig.scripts.python.devops": 100.0,
+    "machineconfig.scripts.python.cloud": 250.0,
+    "machineconfig.scripts.python.fire_jobs": 200.0,
+    "machineconfig.scripts.python.agents": 100.0,
+    "machineconfig.scripts.python.sessions": 100.0,
+    "machineconfig.scripts.python.croshell": 200.0,
+    "machineconfig.scripts.python.ftpx": 250.0,
+}
+REFERENCE_MODULE = "typer"  # every entry point pays for it, so it is the floor the budgets sit on.
+REFERENCE_MS = 50.0
+
+
+def parse_importtime(stderr: str, module: str) -> float:
+    """Cumulative import time of `module` in milliseconds, from `-X importtime` lines like `import time: self [us] | cumulative | imported package`."""
+    for line in stderr.splitlines():
+        if not line.startswith("import time:"): continue
+        parts = line.removeprefix("import time:").split("|")
+        if len(parts) == 3 and parts[2].strip() == module: return int(parts[1]) / 1000
+    raise ValueError(f"`{module}` does not appear in the importtime output:\n{stderr[-2000:]}")
+
+
+def measure_import_ms(module: str, repeats: int) -> float:
+    samples: list[float] = []
+    for _ in range(repeats):
+        result = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module}"], capture_output=True, text=True, check=False)
+        if result.returncode != 0: raise RuntimeError(f"💥 importing `{module}` failed:\n{result.stderr[-2000:]}")
+        samples.append(parse_importtime(result.stderr, module))
+    return statistics.median(samples)
+
+
+def machine_factor(repeats: int) -> float:
+    """How much slower than the reference machine this one imports `REFERENCE_MODULE`, never below 1."""
+    return max(1.0, measure_import_ms(REFERENCE_MODULE, repeats=repeats) / REFERENCE_MS)
+
+
+def main(repeats: int = 5) -> None:
+    from rich.console import Console
+    from rich.table import Table
+    factor = machine_factor(repeats=repeats)
+    table = Table(title=f"⏱️ Import-time budget (median of {repeats} runs, budgets scaled x{factor:.2f} for this machine)")
+    for column in ("Entry point", "Import (ms)", "Budget (ms)", "Status"): table.add_column(column)
+    over_budget: list[str] = []
+    for module, base_budget in ENTRY_POINT_BUDGETS_MS.items():
+        budget = base_budget * factor
+        elapsed = measure_import_ms(module, repeats=repeats)
+        if elapsed > budget: over_budget.append(module)
+        table.add_row(module, f"{elapsed:.1f}", f"{budget:.0f}", "❌ over budget" if elapsed > budget else "✅")
+    Console().print(table)
+    if over_budget: sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
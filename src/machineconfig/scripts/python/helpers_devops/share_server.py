@@ -0,0 +1,266 @@
+"""In-process HTTP file share behind basic auth, used by `devops network share-server`.
+
+Files go out through `loop.sendfile` (zero-copy `os.sendfile` on plain sockets) with `Range`, `If-Range` and `If-None-Match` support, the ETag being
+built from inode, mtime and size. Directory listings and `?zip` archives of folders are streamed as they are produced, nothing is staged on disk."""
+
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Optional
+import asyncio
+import base64
+import hmac
+import html
+import mimetypes
+import os
+import urllib.parse
+import zipfile
+from email.utils import formatdate
+
+
+MAX_HEADER_BYTES = 64 * 1024
+IDLE_TIMEOUT_SECONDS = 60.0
+STREAM_CHUNK_BYTES = 256 * 1024
+LISTING_BATCH = 256  # directory entries per write of a streamed listing.
+REASONS: dict[int, str] = {200: "OK", 206: "Partial Content", 304: "Not Modified", 400: "Bad Request", 401: "Unauthorized", 403: "Forbidden", 404: "Not Found",
+                           405: "Method Not Allowed", 416: "Range Not Satisfiable"}
+
+
+@dataclass(frozen=True)
+class ShareConfig:
+    root: Path  # file or directory being shared.
+    username: str
+    password: str
+
+
+@dataclass(frozen=True)
+class Request:
+    method: str
+    target: str
+    version: str
+    headers: dict[str, str]  # lowercase names.
+
+
+def make_etag(stat: os.stat_result) -> str:
+    return f'"{stat.st_ino:x}-{stat.st_mtime_ns:x}-{stat.st_size:x}"'
+
+
+def parse_range(header: str, size: int) -> Optional[tuple[int, int]]:
+    """Inclusive (start, end) of a single `bytes=` range, None when it cannot be satisfied. Multi-range requests are not supported and are treated the same."""
+    unit, _, spec = header.partition("=")
+    if unit.strip() != "bytes" or "," in spec: return None
+    first, _, last = spec.strip().partition("-")
+    try:
+        if first == "":  # suffix range: the last N bytes.
+            length = int(last)
+            if length <= 0 or size == 0: return None
+            return max(size - length, 0), size - 1
+        start = int(first)
+        end = min(int(last), size - 1) if last != "" else size - 1
+    except ValueError:
+        return None
+    if start >= size or end < start: return None
+    return start, end
+
+
+def share_base(config: ShareConfig) -> Path:
+    """Folder that request paths are relative to: the shared folder itself, or the parent of a shared file."""
+    return config.root if config.root.is_dir() else config.root.parent
+
+
+def resolve_target(config: ShareConfig, target: str) -> Optional[Path]:
+    """Maps a request path to a file under the shared root, None for anything outside of it (`..`, absolute symlinks, other files next to a shared file)."""
+    rel = urllib.parse.unquote(urllib.parse.urlsplit(target).path).lstrip("/")
+    base = share_base(config)
+    candidate = base.joinpath(rel).resolve()
+    if not candidate.is_relative_to(base): return None
+    if not config.root.is_dir() and candidate != config.root and candidate != base: return None
+    return candidate
+
+
+async def read_request(reader: asyncio.StreamReader) -> Optional[Request]:
+    try: raw = await asyncio.wait_for(reader.readuntil(b"\r\n\r\n"), timeout=IDLE_TIMEOUT_SECONDS)
+    except (asyncio.IncompleteReadError, asyncio.LimitOverrunError, asyncio.TimeoutError, ConnectionError): return None
+    lines = raw.decode("latin-1").split("\r\n")
+    parts = lines[0].split(" ")
+    if len(parts) != 3: return None
+    headers: dict[str, str] = {}
+    for line in lines[1:]:
+        name, sep, value = line.partition(":")
+        if sep: headers[name.strip().lower()] = value.strip()
+    return Request(method=parts[0], target=parts[1], version=parts[2], headers=headers)
+
+
+def head_bytes(status: int, headers: dict[str, str]) -> bytes:
+    lines = [f"HTTP/1.1 {status} {REASONS[status]}", f"Date: {formatdate(usegmt=True)}", "Server: machineconfig-share", *[f"{name}: {value}" for name, value in headers.items()]]
+    return ("\r\n".join(lines) + "\r\n\r\n").encode("latin-1")
+
+
+async def send_simple(writer: asyncio.StreamWriter, status: int, extra_headers: dict[str, str], body: bytes, method: str) -> None:
+    writer.write(head_bytes(status, {**extra_headers, "Content-Length": str(len(body)), "Content-Type": "text/plain; charset=utf-8"}) + (body if method != "HEAD" else b""))
+    await writer.drain()
+
+
+def is_authorized(config: ShareConfig, request: Request) -> bool:
+    scheme, _, token = request.headers.get("authorization", "").partition(" ")
+    if scheme.lower() != "basic": return False
+    expected = base64.b64encode(f"{config.username}:{config.password}".encode("utf-8"))
+    return hmac.compare_digest(token.strip().encode("latin-1"), expected)  # bytes: `compare_digest` rejects non-ascii str, headers are decoded as latin-1.
+
+
+async def send_file(writer: asyncio.StreamWriter, request: Request, path: Path) -> None:
+    loop = asyncio.get_running_loop()
+    with open(path, "rb") as f:
+        stat = os.fstat(f.fileno())
+        etag = make_etag(stat)
+        headers = {"ETag": etag, "Last-Modified": formatdate(stat.st_mtime, usegmt=True), "Accept-Ranges": "bytes",
+                   "Content-Type": mimetypes.guess_type(path.name)[0] or "application/octet-stream"}
+        if_none_match = request.headers.get("if-none-match")
+        if if_none_match is not None and (if_none_match.strip() == "*" or etag in [tag.strip() for tag in if_none_match.split(",")]):
+            writer.write(head_bytes(304, {"ETag": etag}))
+            await writer.drain()
+            return
+        status, start, end = 200, 0, stat.st_size - 1
+        range_header = request.headers.get("range")
+        if range_header is not None and request.headers.get("if-range", etag) == etag:  # a stale `If-Range` falls back to the full body.
+            byte_range = parse_range(range_header, stat.st_size)
+            if byte_range is None:
+                await send_simple(writer, 416, {"Content-Range": f"bytes */{stat.st_size}"}, b"", request.method)
+                return
+            status, (start, end) = 206, byte_range
+            headers["Content-Range"] = f"bytes {start}-{end}/{stat.st_size}"
+        headers["Content-Length"] = str(end - start + 1)
+        writer.write(head_bytes(status, headers))
+        await writer.drain()
+        if request.method == "HEAD" or end < start: return
+        await loop.sendfile(writer.transport, f, offset=start, count=end - start + 1)
+
+
+def href(url: str) -> str:
+    return html.escape(url, quote=True)
+
+
+async def stream_listing(writer: asyncio.StreamWriter, request: Request, directory: Path, base: Path, only: Optional[str]) -> None:
+    """`only` restricts the listing to one entry, for shares of a single file. Links are built from the resolved `directory` relative to the share `base`,
+    never from the request path, and are percent-encoded then html-escaped."""
+    writer.write(head_bytes(200, {"Content-Type": "text/html; charset=utf-8", "Connection": "close"}))
+    if request.method == "HEAD": return
+    rel_parts = directory.relative_to(base).parts
+    base_url = "/" + "".join(urllib.parse.quote(part) + "/" for part in rel_parts)
+    title = html.escape("/" + "".join(part + "/" for part in rel_parts))
+    zip_link = f"<p><a href='{href(base_url + '?zip')}'>⬇️ download folder as zip</a></p>" if only is None else ""
+    writer.write(f"<!DOCTYPE html><html><head><meta charset='utf-8'><title>{title}</title></head><body><h2>📂 {title}</h2>{zip_link}<ul>".encode("utf-8"))
+    batch: list[str] = []
+    with os.scandir(directory) as it:
+        for entry in it:
+            if only is not None and entry.name != only: continue
+            url = base_url + urllib.parse.quote(entry.name)
+            if entry.is_dir(): batch.append(f"<li><a href='{href(url + '/')}'>{html.escape(entry.name)}/</a> <a href='{href(url + '/?zip')}'>[zip]</a></li>")
+            else: batch.append(f"<li><a href='{href(url)}'>{html.escape(entry.name)}</a></li>")
+            if len(batch) >= LISTING_BATCH:
+                writer.write("".join(batch).encode("utf-8"))
+                batch.clear()
+                await writer.drain()
+    writer.write(("".join(batch) + "</ul></body></html>").encode("utf-8"))
+    await writer.drain()
+
+
+class _QueueWriter:
+    """Unseekable file object handed to `zipfile` in a worker thread. Full chunks are passed to the event loop through a bounded queue (backpressure)."""
+    def __init__(self, queue: "asyncio.Queue[Optional[bytes]]", loop: asyncio.AbstractEventLoop):
+        self.queue = queue
+        self.loop = loop
+        self.buffer = bytearray()
+        self.aborted = False
+
+    def write(self, data: bytes) -> int:
+        if self.aborted: raise ConnectionAbortedError("client went away")
+        self.buffer += data
+        if len(self.buffer) >= STREAM_CHUNK_BYTES: self.put(bytes(self.buffer)); self.buffer.clear()
+        return len(data)
+
+    def flush(self) -> None:
+        if self.buffer: self.put(bytes(self.buffer)); self.buffer.clear()
+
+    def put(self, chunk: Optional[bytes]) -> None:
+        asyncio.run_coroutine_threadsafe(self.queue.put(chunk), self.loop).result()
+
+    def close(self) -> None:
+        """Tells the event loop side that the archive is complete."""
+        if not self.aborted: self.put(None)
+
+
+def _write_zip(directory: Path, base: Path, sink: _QueueWriter) -> None:
+    """Files whose resolved path leaves the share `base` (symlinks pointing outside of it) are skipped, as `resolve_target` would refuse them."""
+    try:
+        with zipfile.ZipFile(sink, mode="w", compression=zipfile.ZIP_STORED, allowZip64=True) as archive:  # type: ignore[arg-type]
+            for dirpath, dirnames, filenames in os.walk(directory):
+                dirnames.sort()
+                for name in sorted(filenames):
+                    a_file = Path(dirpath, name)
+                    if a_file.is_file() and a_file.resolve().is_relative_to(base): archive.write(a_file, arcname=a_file.relative_to(directory.parent).as_posix())
+        sink.flush()
+    finally:
+        sink.close()
+
+
+async def stream_zip(writer: asyncio.StreamWriter, request: Request, directory: Path, base: Path) -> None:
+    """Stored (uncompressed) zip built by a worker thread while it is being sent, using data descriptors so no size has to be known upfront."""
+    headers = {"Content-Type": "application/zip", "Content-Disposition": f"attachment; filename*=UTF-8''{urllib.parse.quote(directory.name or 'share')}.zip", "Connection": "close"}
+    writer.write(head_bytes(200, headers))
+    if request.method == "HEAD": return
+    loop = asyncio.get_running_loop()
+    queue: asyncio.Queue[Optional[bytes]] = asyncio.Queue(maxsize=8)
+    sink = _QueueWriter(queue=queue, loop=loop)
+    producer = loop.run_in_executor(None, _write_zip, directory, base, sink)
+    try:
+        while (chunk := await queue.get()) is not None:
+            writer.write(chunk)
+            await writer.drain()
+    except (ConnectionError, asyncio.CancelledError):
+        sink.aborted = True
+        while not queue.empty(): queue.get_nowait()  # unblocks a pending put so the worker sees `aborted` and stops.
+        raise
+    finally:
+        try: await producer
+        except ConnectionAbortedError: pass
+
+
+async def handle_connection(config: ShareConfig, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+    try:
+        while (request := await read_request(reader)) is not None:
+            keep_alive = request.headers.get("connection", "").lower() != "close" and request.version == "HTTP/1.1"
+            if request.method not in ("GET", "HEAD"):
+                await send_simple(writer, 405, {"Allow": "GET, HEAD"}, b"Method Not Allowed\n", request.method)
+            elif not is_authorized(config, request):
+                await send_simple(writer, 401, {"WWW-Authenticate": 'Basic realm="machineconfig share", charset="UTF-8"'}, b"Unauthorized\n", request.method)
+            else:
+                target = resolve_target(config, request.target)
+                only = None if config.root.is_dir() else config.root.name
+                wants_zip = urllib.parse.urlsplit(request.target).query == "zip"
+                if target is None or (target.is_dir() and wants_zip and only is not None): await send_simple(writer, 403, {}, b"Forbidden\n", request.method)
+                elif target.is_dir() and wants_zip:
+                    await stream_zip(writer, request, target, share_base(config))
+                    break
+                elif target.is_dir():
+                    await stream_listing(writer, request, target, share_base(config), only=only)
+                    break
+                elif target.is_file(): await send_file(writer, request, target)
+                else: await send_simple(writer, 404, {}, b"Not Found\n", request.method)
+            if not keep_alive: break
+    except (ConnectionError, OSError):
+        pass
+    finally:
+        writer.close()
+        try: await writer.wait_closed()
+        except (ConnectionError, OSError): pass
+
+
+async def serve(config: ShareConfig, host: str, port: int, ready: Optional[asyncio.Event] = None) -> None:
+    server = await asyncio.start_server(lambda reader, writer: handle_connection(config, reader, writer), host=host, port=port, limit=MAX_HEADER_BYTES)
+    if ready is not None: ready.set()
+    async with server:
+        await server.serve_forever()
+
+
+if __name__ == "__main__":
+    pass
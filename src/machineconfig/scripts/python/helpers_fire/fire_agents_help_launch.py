@@ -1,6 +1,7 @@
 
 import random
 import shlex
+import shutil
 from pathlib import Path
 from machineconfig.scripts.python.helpers_fire.fire_agents_helper_types import AGENTS, AGENT_NAME_FORMATTER, HOST, PROVIDER, MODEL
 
@@ -19,8 +20,9 @@ def get_api_keys(provider: PROVIDER) -> list[str]:
     return res
 
 
-def prep_agent_launch(repo_root: Path, agents_dir: Path, prompts_material: list[str], prompt_prefix: str, keep_material_in_separate_file: bool,
+def prep_agent_launch(repo_root: Path, agents_dir: Path, prompts_material: list[Path], prompt_prefix: str, keep_material_in_separate_file: bool,
                       machine: HOST, model: MODEL, provider: PROVIDER, agent: AGENTS, *, job_name: str) -> None:
+    """`prompts_material` are the per-agent material files, already written to `agents_dir/prompts/agent_{idx}/agent_{idx}_material.txt` (see `chunk_prompts`)."""
     agents_dir.mkdir(parents=True, exist_ok=True)
     prompt_folder = agents_dir / "prompts"
     prompt_folder.mkdir(parents=True, exist_ok=True)
@@ -30,12 +32,14 @@ def prep_agent_launch(repo_root: Path, agents_dir: Path, prompts_material: list[
         prompt_root.mkdir(parents=True, exist_ok=True)
         prompt_path = prompt_root / f"agent_{idx}_prompt.txt"
         if keep_material_in_separate_file:
-            prompt_material_path = prompt_root / f"agent_{idx}_material.txt"
-            prompt_material_path.write_text(a_prompt_material, encoding="utf-8")
+            prompt_material_path = a_prompt_material
             prompt_path.write_text(prompt_prefix + f"""\nPlease only look @ {prompt_material_path.relative_to(repo_root)}. You don't need to do any other work beside the content of this material file.""", encoding="utf-8")
         else:
             prompt_material_path = prompt_path
-            prompt_path.write_text(prompt_prefix + """\nPlease only look @ the following:\n""" + a_prompt_material, encoding="utf-8")
+            with open(prompt_path, "wb") as prompt_file, open(a_prompt_material, "rb") as material_file:  # streamed, the material can be large.
+                prompt_file.write((prompt_prefix + """\nPlease only look @ the following:\n""").encode("utf-8"))
+                shutil.copyfileobj(material_file, prompt_file)
+            a_prompt_material.unlink()
 
         agent_cmd_launch_path = prompt_root / AGENT_NAME_FORMATTER.format(idx=idx)  # e.g., agent_0_cmd.sh
         random_sleep_time = random.uniform(0, 5)
@@ -1,22 +1,98 @@
-# from math import ceil
+from array import array
+from math import ceil
 from pathlib import Path
+from typing import Callable, Iterator, Literal, Optional, TypeAlias
+import heapq
 
 
-def chunk_prompts(prompt_material_path: Path, joiner: str, *, tasks_per_prompt: int) -> list[str]:
-    """Chunk prompts based on splitting strategy.
-
-    Args:
-        prompts: List of prompts to chunk
-        strategy: Either 'agent_cap' or 'task_rows'
-        agent_cap: Maximum number of agents (used with 'agent_cap' strategy)
-        task_rows: Number of rows/tasks per agent (used with 'task_rows' strategy)
-    """
-    prompts = [p for p in prompt_material_path.read_text(encoding="utf-8", errors="ignore").split(joiner) if p.strip() != ""]  # drop blank entries
-    if tasks_per_prompt >= len(prompts):
-        print("No need to chunk prompts, as tasks_per_prompt >= total prompts.", f"({tasks_per_prompt} >= {len(prompts)})")
-        return prompts
-    print(f"Chunking {len(prompts)} prompts into groups of {tasks_per_prompt} rows/tasks each.")
-    grouped: list[str] = []
-    for i in range(0, len(prompts), tasks_per_prompt):
-        grouped.append(joiner.join(prompts[i : i + tasks_per_prompt]))
-    return grouped
+Tokenizer: TypeAlias = Callable[[str], int]
+TOKENIZER = Literal["bytes", "tiktoken"]
+READ_CHUNK_BYTES = 1024 ** 2
+
+
+def bytes_tokenizer(text: str) -> int:
+    """Rough estimate of ~4 bytes of utf-8 per token, which holds well enough for english prose and code."""
+    return max(1, ceil(len(text.encode("utf-8")) / 4))
+
+
+def get_tokenizer(name: TOKENIZER) -> Tokenizer:
+    """Local tokenizer by name. tiktoken is optional, without it the bytes/4 estimate is used."""
+    if name == "tiktoken":
+        try:
+            import tiktoken  # type: ignore
+        except ImportError:
+            print("⚠️ tiktoken is not installed, falling back to the bytes/4 token estimate.")
+            return bytes_tokenizer
+        encoding = tiktoken.get_encoding("o200k_base")
+        return lambda text: max(1, len(encoding.encode(text, disallowed_special=())))
+    return bytes_tokenizer
+
+
+def iter_prompts(prompt_material_path: Path, joiner: str) -> Iterator[bytes]:
+    """Non-blank entries of the file split on `joiner`, read in chunks so the file is never held in memory."""
+    separator = joiner.encode("utf-8")
+    tail = b""
+    with open(prompt_material_path, "rb") as f:
+        while chunk := f.read(READ_CHUNK_BYTES):
+            parts = (tail + chunk).split(separator)
+            tail = parts.pop()
+            for part in parts:
+                if part.strip(): yield part
+    if tail.strip(): yield tail
+
+
+def assign_lpt(weights: array[int], n_bins: int, max_tokens_per_agent: Optional[int]) -> tuple[array[int], list[int]]:
+    """Longest processing time first: heaviest items go to the currently lightest bin. When that would push the lightest bin over the cap, a new bin is opened.
+    Returns the bin of each item and the total weight per bin."""
+    assignment = array("I", bytes(4 * len(weights)))
+    loads: list[int] = [0] * n_bins
+    heap = [(0, idx) for idx in range(n_bins)]
+    for item in sorted(range(len(weights)), key=weights.__getitem__, reverse=True):
+        weight = weights[item]
+        load, idx = heap[0]
+        if max_tokens_per_agent is not None and load > 0 and load + weight > max_tokens_per_agent:
+            idx = len(loads)
+            loads.append(weight)
+            heapq.heappush(heap, (weight, idx))
+        else:
+            loads[idx] = load + weight
+            heapq.heapreplace(heap, (loads[idx], idx))
+        assignment[item] = idx
+    return assignment, loads
+
+
+def chunk_prompts(prompt_material_path: Path, joiner: str, *, tasks_per_prompt: int, max_tokens_per_agent: Optional[int], tokenizer: Tokenizer,
+                  output_dir: Path) -> list[Path]:
+    """Split the prompt material into per-agent files balanced by token weight rather than by count.
+
+    The number of agents comes from the token weight: enough for the mean load to fit `max_tokens_per_agent` and, without a cap, one per `tasks_per_prompt` entries.
+    It never exceeds total/heaviest entry, beyond which the heaviest entry alone would be above the mean load.
+    Entries are bin-packed longest-first and then streamed from the source into `output_dir/agent_{idx}/agent_{idx}_material.txt`, keeping their original
+    order within each agent. Only one weight and one assignment per entry is held in memory."""
+    weights = array("Q", (tokenizer(item.decode("utf-8", errors="ignore")) for item in iter_prompts(prompt_material_path, joiner)))
+    if len(weights) == 0: return []
+    total = sum(weights)
+    if max_tokens_per_agent is not None: n_bins = ceil(total / max_tokens_per_agent)
+    else: n_bins = ceil(len(weights) / tasks_per_prompt)
+    n_bins = max(1, min(n_bins, total // max(weights)))  # entries over the cap still open bins of their own in `assign_lpt`.
+    assignment, loads = assign_lpt(weights, n_bins=n_bins, max_tokens_per_agent=max_tokens_per_agent)
+    oversized = sum(1 for weight in weights if max_tokens_per_agent is not None and weight > max_tokens_per_agent)
+    print(f"Chunking {len(weights)} prompts (~{total} tokens) into {len(loads)} agents: min {min(loads)}, mean {total / len(loads):.0f}, max {max(loads)} tokens per agent"
+          f" (max/mean = {max(loads) / (total / len(loads)):.2f}).")
+    if oversized: print(f"⚠️ {oversized} prompt(s) exceed the cap of {max_tokens_per_agent} tokens on their own, each got an agent to itself.")
+    paths = [output_dir / f"agent_{idx}" / f"agent_{idx}_material.txt" for idx in range(len(loads))]
+    separator = joiner.encode("utf-8")
+    handles = []
+    try:
+        for path in paths:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            handles.append(open(path, "wb"))
+        started = [False] * len(paths)
+        for item, content in enumerate(iter_prompts(prompt_material_path, joiner)):
+            idx = assignment[item]
+            if started[idx]: handles[idx].write(separator)
+            handles[idx].write(content)
+            started[idx] = True
+    finally:
+        for handle in handles: handle.close()
+    return paths
@@ -1,36 +1,131 @@
 
-from typing import Optional
+from typing import Any, NamedTuple, Optional
+from pathlib import Path
+import hashlib
+import json
 import os
+import time
 from machineconfig.utils.path_extended import PathExtended
 
 
-def search_for_files_of_interest(path_obj: PathExtended):
-    if path_obj.joinpath(".venv").exists():
-        path_objects = path_obj.search("*", not_in=[".venv"])
-        files: list[PathExtended] = []
-        for a_path_obj in path_objects:
-            files += search_for_files_of_interest(path_obj=a_path_obj)
+FIRE_INDEX_DIR = Path.home().joinpath("tmp_results", "cache", "fire_index")
+SCRIPT_SUFFIXES: tuple[str, ...] = (".py", ".ps1", ".sh")  # also the display order of `search_for_files_of_interest`.
+RACY_WINDOW_NS = 2 * 10 ** 9  # folder mtimes this close to the walk may hide a later change in the same timestamp tick, such folders are rescanned.
+
+
+class args_spec(NamedTuple):
+    name: str
+    type: str
+    default: Any  # the literal's value for constant defaults, the raw `ast` node's `value` for anything else (e.g. `x=mod.CONST`).
+
+
+class ScriptIndex:
+    """Per-project index of scripts and their top-level functions, persisted under `FIRE_INDEX_DIR`. All paths are keyed by `os.path.realpath`.
+    `entries` are `path -> [size, mtime_ns, options | None, func_args | None]`, validated per file; only python files that were actually chosen get parsed.
+    `listings` are `root -> {"walked_ns", "dirs": {folder: mtime_ns}, "files"}`: adding, removing or renaming a script bumps its folder's mtime,
+    so an unchanged tree is listed with one stat per folder instead of a full walk."""
+    def __init__(self, project_root: str):
+        self.path = FIRE_INDEX_DIR.joinpath(hashlib.sha256(project_root.encode("utf-8")).hexdigest()[:16] + ".json")
+        self.entries: dict[str, list[Any]] = {}
+        self.listings: dict[str, dict[str, Any]] = {}
+        self.dirty = False
+        if self.path.exists():
+            try:
+                data = json.loads(self.path.read_text(encoding="utf-8"))
+                self.entries, self.listings = data["entries"], data.get("listings", {})
+            except (json.JSONDecodeError, KeyError, OSError): self.entries, self.listings = {}, {}
+
+    @staticmethod
+    def for_path(path: str) -> "ScriptIndex":
+        path = os.path.realpath(path)
+        directory = path if os.path.isdir(path) else os.path.dirname(path)
+        return ScriptIndex(project_root=find_repo_root_path(directory) or directory)
+
+    def listing(self, root: str) -> list[str]:
+        root = os.path.realpath(root)
+        cached = self.listings.get(root)
+        if cached is not None and _dirs_unchanged(cached["dirs"], walked_ns=cached["walked_ns"]): return cached["files"]
+        walked_ns = time.time_ns()
+        files, dirs = _walk_scripts(root)
+        self.listings[root] = {"walked_ns": walked_ns, "dirs": dirs, "files": files}
+        prefix, seen = root.rstrip(os.sep) + os.sep, {os.path.realpath(a_file) for a_file in files}
+        for stale in [key for key in self.entries if key.startswith(prefix) and key not in seen]: del self.entries[stale]
+        self.dirty = True
         return files
+
+    def functions(self, file_path: str) -> tuple[list[str], list[list[args_spec]]]:
+        key = os.path.realpath(file_path)
+        stat = os.stat(key)
+        cached = self.entries.get(key)
+        if cached is not None and cached[0] == stat.st_size and cached[1] == stat.st_mtime_ns and cached[2] is not None:
+            return cached[2], [[args_spec(*an_arg) for an_arg in args] for args in cached[3]]
+        print(f"🔍 Loading {file_path} ...")
+        options, func_args = _parse_functions(PathExtended(key).read_text(encoding="utf-8"))
+        cacheable = all(an_arg.default is None or isinstance(an_arg.default, (str, int, float, bool)) for args in func_args for an_arg in args)
+        self.entries[key] = [stat.st_size, stat.st_mtime_ns, options, [[list(an_arg) for an_arg in args] for args in func_args]] if cacheable else [stat.st_size, stat.st_mtime_ns, None, None]
+        self.dirty = True
+        return options, func_args
+
+    def save(self) -> None:
+        if not self.dirty: return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_suffix(f".{os.getpid()}.tmp")
+        tmp_path.write_text(json.dumps({"entries": self.entries, "listings": self.listings}), encoding="utf-8")
+        os.replace(tmp_path, self.path)
+        self.dirty = False
+
+
+def _dirs_unchanged(dirs: dict[str, int], walked_ns: int) -> bool:
+    for a_dir, mtime_ns in dirs.items():
+        if mtime_ns >= walked_ns - RACY_WINDOW_NS: return False
+        try:
+            if os.stat(a_dir).st_mtime_ns != mtime_ns: return False
+        except OSError: return False
+    return True
+
+
+def _walk_scripts(root: str) -> tuple[list[str], dict[str, int]]:
+    """Python (except `__init__.py`), PowerShell and Shell scripts under `root`, plus the mtime of every folder visited.
+    Hidden entries (e.g. `.venv`) are pruned and symlinked folders are not followed, same as `PathExtended.search_iter`."""
+    found: list[str] = []
+    dirs: dict[str, int] = {}
+    stack = [root]
+    while stack:
+        directory = stack.pop()
+        sub_dirs: list[str] = []
+        try:
+            dirs[directory] = os.stat(directory).st_mtime_ns
+            with os.scandir(directory) as it:
+                for entry in it:
+                    if entry.name.startswith("."): continue
+                    try: is_dir = entry.is_dir()
+                    except OSError: is_dir = False
+                    if is_dir:
+                        if not entry.is_symlink(): sub_dirs.append(entry.path)
+                    elif os.path.splitext(entry.name)[1] in SCRIPT_SUFFIXES and entry.name != "__init__.py": found.append(entry.path)
+        except (PermissionError, FileNotFoundError, NotADirectoryError):
+            continue
+        stack.extend(reversed(sub_dirs))
+    found.sort(key=lambda a_file: SCRIPT_SUFFIXES.index(os.path.splitext(a_file)[1]))  # stable: keeps the walk order within each suffix.
+    return found, dirs
+
+
+def search_for_files_of_interest(path_obj: PathExtended):
+    """Scripts under `path_obj`, served from the `ScriptIndex` while no folder in the tree changed since the last walk."""
     if path_obj.is_file():
         return [path_obj]
-    py_files = path_obj.search(pattern="*.py", not_in=["__init__.py"], r=True)
-    ps_files = path_obj.search(pattern="*.ps1", r=True)
-    sh_files = path_obj.search(pattern="*.sh", r=True)
-    files = py_files + ps_files + sh_files
+    root = str(path_obj.expanduser().resolve())
+    index = ScriptIndex.for_path(root)
+    files = [PathExtended(a_file) for a_file in index.listing(root)]
+    index.save()
     return files
 
 
-
-def parse_pyfile(file_path: str):
-    print(f"🔍 Loading {file_path} ...")
-    from typing import NamedTuple
-
-    args_spec = NamedTuple("args_spec", [("name", str), ("type", str), ("default", Optional[str])])
-    func_args: list[list[args_spec]] = [[]]  # this firt prepopulated dict is for the option 'RUN AS MAIN' which has no args
+def _parse_functions(source: str) -> tuple[list[str], list[list[args_spec]]]:
     import ast
-
-    parsed_ast = ast.parse(PathExtended(file_path).read_text(encoding="utf-8"))
-    functions = [node for node in ast.walk(parsed_ast) if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef))]
+    func_args: list[list[args_spec]] = [[]]  # this firt prepopulated dict is for the option 'RUN AS MAIN' which has no args
+    parsed_ast = ast.parse(source)
+    functions = [node for node in parsed_ast.body if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef))]  # only top-level functions are reachable with `fire`.
     module__doc__ = ast.get_docstring(parsed_ast)
     main_option = f"RUN AS MAIN -- {module__doc__ if module__doc__ is not None else 'NoDocs'}"
     options = [main_option]
@@ -39,8 +134,6 @@ def parse_pyfile(file_path: str):
             continue
         if any(arg.arg == "self" for arg in function.args.args):
             continue
-        if any(arg.arg == "self" for arg in function.args.args):
-            continue
         doc_string_tmp: str | None = ast.get_docstring(function)
         if doc_string_tmp is None:
             doc_string = "NoDocs"
@@ -70,6 +163,14 @@ def parse_pyfile(file_path: str):
     return options, func_args
 
 
+def parse_pyfile(file_path: str):
+    """Options and argument specs of `file_path`, served from the `ScriptIndex` unless the file changed since it was last parsed.
+    Only top-level functions are offered: nested functions and methods (static ones included) are not reachable through `fire` and are no longer listed."""
+    index = ScriptIndex.for_path(file_path)
+    options, func_args = index.functions(file_path)
+    index.save()
+    return options, func_args
+
 
 def find_repo_root_path(start_path: str) -> Optional[str]:
     root_files = ["setup.py", "pyproject.toml", ".git"]
@@ -26,6 +26,7 @@ class FireJobArgs:
     optimized: bool = False
     zellij_tab: Optional[str] = None
     watch: bool = False
+    memo: bool = False
 
 
 def extract_kwargs(args: FireJobArgs) -> dict[str, object]:
@@ -0,0 +1,187 @@
+"""
+`fire --memo`: replays the recorded output of a job whose inputs did not change since its last successful run.
+
+The key hashes the target file and its transitive local imports (resolved from the AST against the file's directory and the repo root), the function and its
+arguments, and the interpreter identity (venv `pyvenv.cfg` and python binary, plus the project lockfile). Each entry holds the pickled return value and the
+captured stdout. Hits touch the entry, and misses evict the least recently used entries beyond `MEMO_MAX_BYTES`.
+"""
+
+from pathlib import Path
+from typing import Any, Optional
+import ast
+import hashlib
+import json
+import os
+import shutil
+import time
+
+
+MEMO_ROOT = Path.home().joinpath("tmp_results", "cache", "fire_memo")
+MEMO_MAX_BYTES = 1024 ** 3
+LOCKFILES = ("uv.lock", "poetry.lock", "pdm.lock", "requirements.txt", "pyproject.toml")
+SKIPPED_PARTS = {".venv", "venv", "site-packages", "__pycache__"}
+
+RUNNER_TEMPLATE = '''
+import importlib.util, io, json, os, pickle, shlex, shutil, sys, time
+file_path, function_name, fire_args, kwargs, entry_dir = {file_path!r}, {function!r}, {fire_args!r}, {kwargs!r}, {entry_dir!r}
+sys.path[:0] = {sys_path!r}
+
+class _Tee(io.TextIOBase):
+    def __init__(self, stream):
+        self.stream, self.parts = stream, []
+    def write(self, text):
+        self.parts.append(text)
+        return self.stream.write(text)
+    def flush(self):
+        self.stream.flush()
+
+tee = _Tee(sys.stdout)
+sys.stdout = tee
+start = time.time()
+try:
+    if function_name is None:
+        import runpy
+        runpy.run_path(file_path, run_name="__main__")
+        result = None
+    else:
+        spec = importlib.util.spec_from_file_location(os.path.splitext(os.path.basename(file_path))[0], file_path)
+        module = importlib.util.module_from_spec(spec)
+        sys.modules[spec.name] = module
+        spec.loader.exec_module(module)
+        if kwargs: result = getattr(module, function_name)(**kwargs)
+        else:
+            import fire
+            result = fire.Fire(getattr(module, function_name), command=shlex.split(fire_args), name=function_name)
+finally:
+    sys.stdout = tee.stream
+tmp_dir = entry_dir + f".{{os.getpid()}}.tmp"
+os.makedirs(tmp_dir, exist_ok=True)
+with open(os.path.join(tmp_dir, "stdout.txt"), "w", encoding="utf-8") as f: f.write("".join(tee.parts))
+try:
+    with open(os.path.join(tmp_dir, "result.pkl"), "wb") as f: pickle.dump(result, f)
+    pickled = True
+except Exception as ex:
+    os.remove(os.path.join(tmp_dir, "result.pkl"))
+    print(f"⚠️ return value is not picklable ({{ex}}), only stdout is memoized.")
+    pickled = False
+with open(os.path.join(tmp_dir, "meta.json"), "w", encoding="utf-8") as f:
+    json.dump({{"file": file_path, "function": function_name, "fire_args": fire_args, "created": start, "seconds": time.time() - start, "pickled": pickled,
+               "result_repr": repr(result)[:500]}}, f)
+shutil.rmtree(entry_dir, ignore_errors=True)
+os.replace(tmp_dir, entry_dir)
+'''
+
+
+def _module_file(module: str, roots: list[Path]) -> Optional[Path]:
+    for root in roots:
+        candidate = root.joinpath(*module.split("."))
+        for path in (candidate.with_suffix(".py"), candidate.joinpath("__init__.py")):
+            if path.is_file() and not SKIPPED_PARTS.intersection(path.parts): return path.resolve()
+    return None
+
+
+def local_import_closure(file_path: Path, roots: list[Path]) -> list[Path]:
+    """`file_path` and every module it imports transitively that resolves to a file under `roots`. Third party imports resolve to nothing and are ignored."""
+    seen: set[Path] = set()
+    pending = [file_path.resolve()]
+    while pending:
+        current = pending.pop()
+        if current in seen: continue
+        seen.add(current)
+        try: tree = ast.parse(current.read_text(encoding="utf-8"), filename=str(current))
+        except (SyntaxError, UnicodeDecodeError, OSError): continue
+        for node in ast.walk(tree):
+            if isinstance(node, ast.Import): candidates = [(alias.name, roots) for alias in node.names]
+            elif isinstance(node, ast.ImportFrom):
+                if node.level > 0:  # relative import, resolved against the importing file's package.
+                    base = current.parent
+                    for _ in range(node.level - 1): base = base.parent
+                    search_roots = [base]
+                else: search_roots = roots
+                module = node.module or ""
+                candidates = [(module, search_roots)] if module else []
+                candidates += [(f"{module}.{alias.name}" if module else alias.name, search_roots) for alias in node.names if alias.name != "*"]  # `from pkg import submodule`.
+            else: continue
+            for module_name, search_roots in candidates:
+                resolved = _module_file(module_name, search_roots)
+                if resolved is not None and resolved not in seen: pending.append(resolved)
+    return sorted(seen)
+
+
+def _digest(path: Path) -> str:
+    return hashlib.sha256(path.read_bytes()).hexdigest()
+
+
+def compute_memo_key(file_path: Path, function: Optional[str], fire_args: str, kwargs: dict[str, object], repo_root: Optional[Path], ve_root: Optional[str]) -> tuple[str, dict[str, Any]]:
+    roots = [file_path.resolve().parent] + ([repo_root.resolve()] if repo_root is not None else [])
+    sources = {str(path): _digest(path) for path in local_import_closure(file_path, roots)}
+    interpreter: dict[str, str] = {}
+    if ve_root is not None:
+        ve_path = Path(ve_root).expanduser()
+        if ve_path.joinpath("pyvenv.cfg").is_file(): interpreter["pyvenv.cfg"] = ve_path.joinpath("pyvenv.cfg").read_text(encoding="utf-8")
+        for python in (ve_path.joinpath("bin", "python"), ve_path.joinpath("Scripts", "python.exe")):
+            if python.exists(): interpreter["python"] = str(python.resolve())
+    for lockfile in LOCKFILES:
+        path = (repo_root or file_path.parent).joinpath(lockfile)
+        if path.is_file(): interpreter[lockfile] = _digest(path)
+    manifest: dict[str, Any] = {"sources": sources, "function": function, "fire_args": fire_args, "kwargs": {key: repr(value) for key, value in sorted(kwargs.items())},
+                                "interpreter": interpreter}
+    return hashlib.sha256(json.dumps(manifest, sort_keys=True).encode("utf-8")).hexdigest(), manifest
+
+
+def entry_dir(key: str) -> Path:
+    return MEMO_ROOT.joinpath(key[:2], key)
+
+
+def replay(key: str) -> bool:
+    """Prints the recorded stdout of a hit and marks the entry as recently used. False on a miss."""
+    entry = entry_dir(key)
+    meta_path = entry.joinpath("meta.json")
+    if not meta_path.is_file(): return False
+    meta = json.loads(meta_path.read_text(encoding="utf-8"))
+    from rich.console import Console
+    from rich.panel import Panel
+    console = Console()
+    console.print(Panel(f"♻️ memo hit {key[:12]}: recorded {time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(meta['created']))}, saved {meta['seconds']:.2f}s\n"
+                        f"📦 return value: {entry.joinpath('result.pkl') if meta['pickled'] else 'not picklable'}\n{meta['result_repr']}", title="[bold green]fire --memo[/bold green]"))
+    print(entry.joinpath("stdout.txt").read_text(encoding="utf-8"), end="")
+    os.utime(meta_path)
+    return True
+
+
+def make_runner_script(file_path: Path, function: Optional[str], fire_args: str, kwargs: dict[str, object], key: str, repo_root: Optional[Path]) -> str:
+    sys_path = [str(file_path.resolve().parent)] + ([str(repo_root)] if repo_root is not None else [])
+    return RUNNER_TEMPLATE.format(file_path=str(file_path.resolve()), function=function, fire_args=fire_args, kwargs=kwargs, entry_dir=str(entry_dir(key)), sys_path=sys_path)
+
+
+def evict_lru(max_bytes: int = MEMO_MAX_BYTES) -> list[str]:
+    """Deletes least recently used entries (by `meta.json` mtime) until the store fits in `max_bytes`. Returns the evicted keys."""
+    entries: list[tuple[float, int, Path]] = []
+    for meta_path in MEMO_ROOT.glob("*/*/meta.json"):
+        entry = meta_path.parent
+        size = sum(item.stat().st_size for item in entry.iterdir() if item.is_file())
+        entries.append((meta_path.stat().st_mtime, size, entry))
+    total = sum(size for _mtime, size, _entry in entries)
+    evicted: list[str] = []
+    for _mtime, size, entry in sorted(entries):
+        if total <= max_bytes: break
+        shutil.rmtree(entry, ignore_errors=True)
+        total -= size
+        evicted.append(entry.name)
+    return evicted
+
+
+def run_memoized(file_path: Path, function: Optional[str], fire_args: str, kwargs: dict[str, object], repo_root: Optional[Path], ve_root: Optional[str],
+                 activate_ve_line: str, optimized: bool) -> None:
+    key, manifest = compute_memo_key(file_path=file_path, function=function, fire_args=fire_args, kwargs=kwargs, repo_root=repo_root, ve_root=ve_root)
+    if replay(key): return
+    print(f"💾 memo miss {key[:12]} ({len(manifest['sources'])} local source file(s) hashed), running the job.")
+    from machineconfig.utils.accessories import randstr
+    from machineconfig.utils.path_extended import PathExtended
+    runner = PathExtended.tmp().joinpath(f"tmp_scripts/python/fire_memo_{file_path.stem}_{randstr()}.py")
+    runner.parent.mkdir(parents=True, exist_ok=True)
+    runner.write_text(make_runner_script(file_path=file_path, function=function, fire_args=fire_args, kwargs=kwargs, key=key, repo_root=repo_root), encoding="utf-8")
+    from machineconfig.utils.code import run_shell_script
+    run_shell_script(f"{activate_ve_line}\n{'python -OO' if optimized else 'python'} {runner}")
+    evicted = evict_lru()
+    if evicted: print(f"🧹 evicted {len(evicted)} least recently used memo entr{'y' if len(evicted) == 1 else 'ies'}.")
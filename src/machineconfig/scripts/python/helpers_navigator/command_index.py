@@ -0,0 +1,155 @@
+"""
+Command index for the navigator: the tree is introspected from the typer apps registered in `entry.COMMANDS` and cached on disk, search is served from a trigram index.
+"""
+
+from dataclasses import asdict
+from pathlib import Path
+from typing import Any
+import hashlib
+import heapq
+import json
+import os
+
+from machineconfig.scripts.python.helpers_navigator.data_models import CommandInfo
+from machineconfig.utils.source_of_truth import LIBRARY_ROOT
+
+
+NAVIGATOR_CACHE_PATH = Path.home().joinpath("tmp_results", "cache", "navigator_tree.json")
+SEARCH_LIMIT = 200
+
+
+def _cache_key() -> str:
+    """Installed package version plus mtimes of every module under `scripts/python`, which is where all command signatures live."""
+    from importlib.metadata import PackageNotFoundError, version
+    try: package_version = version("machineconfig")
+    except PackageNotFoundError: package_version = "unknown"
+    hasher = hashlib.sha1(package_version.encode("utf-8"))
+    scripts_root = LIBRARY_ROOT.joinpath("scripts", "python")
+    for dirpath, dirnames, filenames in os.walk(scripts_root):
+        dirnames[:] = sorted(d for d in dirnames if d != "__pycache__")
+        for name in sorted(filenames):
+            if name.endswith(".py"): hasher.update(f"{os.path.relpath(os.path.join(dirpath, name), scripts_root)}:{os.stat(os.path.join(dirpath, name)).st_mtime_ns}".encode("utf-8"))
+    hasher.update(str(LIBRARY_ROOT.joinpath("utils", "lazy_cli.py").stat().st_mtime_ns).encode("utf-8"))
+    return hasher.hexdigest()
+
+
+def _usage(path: str, command: Any) -> str:
+    """Usage line in the `<positional> --option <value> --flag` form parsed by `CommandBuilderScreen`."""
+    import click
+    parts = [path]
+    for param in command.params:
+        if isinstance(param, click.Argument): parts.append(f"<{param.name}>")
+        elif isinstance(param, click.Option) and not param.hidden:
+            long_opts = [opt for opt in param.opts if opt.startswith("--")] or param.opts
+            name = max(long_opts, key=len)
+            parts.append(name if param.is_flag else f"{name} <{param.name}>")
+    return " ".join(parts)
+
+
+def _walk(command: Any, name: str, path: str, parent: int, module_path: str, entries: list[CommandInfo], parents: list[int]) -> None:
+    import click
+    is_group = isinstance(command, click.Group)
+    callback = getattr(command.callback, "__wrapped__", command.callback)
+    entries.append(CommandInfo(name=name, description=command.get_short_help_str(limit=120), command=path, parent=entries[parent].name if parent >= 0 else None,
+                               is_group=is_group, help_text="" if is_group else _usage(path, command),
+                               module_path=module_path if is_group else getattr(callback, "__module__", module_path)))
+    parents.append(parent)
+    if not is_group: return
+    index = len(entries) - 1
+    ctx = click.Context(command, info_name=name)
+    for sub_name in command.list_commands(ctx):
+        try: sub = command.get_command(ctx, sub_name)
+        except Exception as error:  # a subgroup whose optional dependencies are missing should not take the whole tree down.
+            entries.append(CommandInfo(name=sub_name, description=f"⚠️ failed to load: {error}", command=f"{path} {sub_name}", parent=name, is_group=True))
+            parents.append(index)
+            continue
+        if sub is None or sub.hidden: continue  # hidden commands are the short aliases.
+        _walk(sub, sub_name, f"{path} {sub_name}", index, module_path, entries, parents)
+
+
+def build_command_entries() -> tuple[list[CommandInfo], list[int]]:
+    """Walks the click commands behind `entry.COMMANDS` depth first. Only modules that declare commands are imported, command bodies import their dependencies lazily.
+    Returns the entries and, for each, the index of its parent (-1 for top level commands)."""
+    from machineconfig.scripts.python.entry import COMMANDS
+    from machineconfig.utils.lazy_cli import load_subcommand
+    entries: list[CommandInfo] = []
+    parents: list[int] = []
+    for name, (_alias, spec) in COMMANDS.items():
+        module_path = spec.import_path.split(":")[0]
+        try: command = load_subcommand(name, spec)
+        except Exception as error:
+            entries.append(CommandInfo(name=name, description=f"⚠️ failed to load: {error}", command=name, is_group=True, module_path=module_path))
+            parents.append(-1)
+            continue
+        _walk(command, name, name, -1, module_path, entries, parents)
+    return entries, parents
+
+
+def load_command_entries(cache_path: Path = NAVIGATOR_CACHE_PATH) -> tuple[list[CommandInfo], list[int]]:
+    key = _cache_key()
+    if cache_path.exists():
+        try:
+            content = json.loads(cache_path.read_text(encoding="utf-8"))
+            if content.get("key") == key: return [CommandInfo(**item) for item in content["entries"]], content["parents"]
+        except (json.JSONDecodeError, KeyError, TypeError, OSError): pass
+    entries, parents = build_command_entries()
+    cache_path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = cache_path.with_suffix(f".{os.getpid()}.tmp")
+    tmp_path.write_text(json.dumps({"key": key, "entries": [asdict(entry) for entry in entries], "parents": parents}), encoding="utf-8")
+    os.replace(tmp_path, cache_path)
+    return entries, parents
+
+
+class CommandSearchIndex:
+    """Trigram postings over `command + description`. Queries of three characters or more intersect posting lists (rarest first) and verify the
+    substring on the survivors, shorter queries scan every entry. Without substring hits it falls back to a fuzzy subsequence match over the command paths."""
+
+    def __init__(self, entries: list[CommandInfo]):
+        self.texts = [f"{entry.command} {entry.description}".lower() for entry in entries]
+        self.names = [entry.name.lower() for entry in entries]
+        self.commands = [entry.command.lower() for entry in entries]
+        self.postings: dict[str, list[int]] = {}
+        for idx, text in enumerate(self.texts):
+            for gram in {text[i:i + 3] for i in range(len(text) - 2)}: self.postings.setdefault(gram, []).append(idx)
+
+    def _rank(self, query: str, idx: int) -> tuple[int, int, int]:
+        name = self.names[idx]
+        if name == query: tier = 0
+        elif name.startswith(query): tier = 1
+        elif query in name: tier = 2
+        elif query in self.commands[idx]: tier = 3
+        else: tier = 4
+        return tier, len(self.commands[idx]), idx
+
+    def search(self, query: str, limit: int = SEARCH_LIMIT) -> list[int]:
+        query = query.strip().lower()
+        if not query: return []
+        if len(query) < 3: candidates = range(len(self.texts))
+        else:
+            grams = sorted({query[i:i + 3] for i in range(len(query) - 2)}, key=lambda gram: len(self.postings.get(gram, ())))
+            if any(gram not in self.postings for gram in grams): return self.fuzzy(query, limit)
+            survivors = set(self.postings[grams[0]])
+            for gram in grams[1:]:
+                survivors.intersection_update(self.postings[gram])
+                if not survivors: break
+            candidates = survivors  # type: ignore[assignment]
+        hits = [idx for idx in candidates if query in self.texts[idx]]
+        if not hits: return self.fuzzy(query, limit)
+        return heapq.nsmallest(limit, hits, key=lambda idx: self._rank(query, idx))
+
+    def fuzzy(self, query: str, limit: int = SEARCH_LIMIT) -> list[int]:
+        """Entries whose command path contains the query characters in order, shortest (greedy) span first."""
+        query = query.replace(" ", "")
+        scored: list[tuple[int, int, int]] = []
+        for idx, command in enumerate(self.commands):
+            start = pos = command.find(query[0]) if query else -1
+            if start < 0: continue
+            for char in query[1:]:
+                pos = command.find(char, pos + 1)
+                if pos < 0: break
+            else: scored.append((pos - start, len(command), idx))
+        return [idx for *_score, idx in sorted(scored)[:limit]]
+
+
+if __name__ == "__main__":
+    pass
@@ -6,6 +6,7 @@ import subprocess
 from textual.app import App, ComposeResult
 from textual.widgets import Header, Footer, Input, Tree
 from textual.binding import Binding
+from textual.timer import Timer
 from machineconfig.scripts.python.helpers_navigator.command_builder import CommandBuilderScreen
 from machineconfig.scripts.python.helpers_navigator.command_tree import CommandTree
 from machineconfig.scripts.python.helpers_navigator.command_detail import CommandDetail
@@ -13,6 +14,9 @@ from machineconfig.scripts.python.helpers_navigator.search_bar import SearchBar
 from machineconfig.scripts.python.helpers_navigator.data_models import CommandInfo
 
 
+SEARCH_DEBOUNCE_SECONDS = 0.05
+
+
 class CommandNavigatorApp(App[None]):
     """TUI application for navigating machineconfig commands."""
 
@@ -130,6 +134,7 @@ class CommandNavigatorApp(App[None]):
         """Actions when app is mounted."""
         self.title = "machineconfig Command Navigator"
         self.sub_title = "Navigate and explore all available commands"
+        self._search_timer: Timer | None = None
         tree = self.query_one(CommandTree)
         tree.focus()
 
@@ -140,41 +145,35 @@ class CommandNavigatorApp(App[None]):
         detail_widget.update_command(command_info)
 
     def on_input_changed(self, event: Input.Changed) -> None:
-        """Handle search input changes."""
+        """Handle search input changes. Searching is debounced so fast typing only searches once it pauses."""
         if event.input.id != "search-input":
             return
-
-        search_term = event.value.lower()
+        if self._search_timer is not None:
+            self._search_timer.stop()
+        value = event.value
+        self._search_timer = self.set_timer(SEARCH_DEBOUNCE_SECONDS, lambda: self._apply_search(value))
+
+    def _apply_search(self, search_term: str) -> None:
+        """Expand the parents of matching nodes and move the cursor to the best match."""
+        self._search_timer = None
         tree = self.query_one(CommandTree)
-
-        if not search_term:
+        if not search_term.strip():
             # Show all nodes - expand all root children
             for node in tree.root.children:
                 node.expand()
+            self.sub_title = "Navigate and explore all available commands"
             return
 
-        # Filter nodes based on search term
-        def filter_tree(node):  # type: ignore
-            if node.data and not node.data.is_group:
-                match = (search_term in node.data.name.lower() or
-                        search_term in node.data.description.lower() or
-                        search_term in node.data.command.lower())
-                return match
-            return False
-
-        # Expand parents of matching nodes by walking through all nodes
-        def walk_nodes(node):  # type: ignore
-            """Recursively walk through tree nodes."""
-            yield node
-            for child in node.children:
-                yield from walk_nodes(child)
-
-        for node in walk_nodes(tree.root):
-            if filter_tree(node):
-                parent = node.parent
-                while parent and parent != tree.root:
+        matches = tree.search(search_term)
+        self.sub_title = f"{len(matches)} match{'es' if len(matches) != 1 else ''} for '{search_term}'"
+        for node in matches:
+            parent = node.parent
+            while parent is not None and parent is not tree.root:
+                if not parent.is_expanded:
                     parent.expand()
-                    parent = parent.parent  # type: ignore
+                parent = parent.parent
+        if matches:
+            tree.move_cursor(matches[0])
 
     def action_copy_command(self) -> None:
         """Copy the selected command to clipboard."""
@@ -130,7 +130,18 @@ def run(ctx: typer.Context,
         print(f"❌ Unsupported platform: {platform.system()}")
 
 
-def kill_process():
+def kill_process(holding: Annotated[Optional[list[str]], typer.Option(..., "--holding", "-H", help="Only report the processes holding these files (or anything under these folders) open. Repeat for many paths, answered from one scan.")] = None,
+                 substring: Annotated[bool, typer.Option("--substring", "-s", help="Match --holding as a substring of the open paths instead of as a file or folder.")] = False):
+    if holding:
+        from machineconfig.utils.procs import get_processes_accessing_files
+        from rich.console import Console
+        from rich.table import Table
+        table = Table(title="📂 Processes holding the files open")
+        for column in ("Query", "PID", "Open files"): table.add_column(column)
+        for path, infos in get_processes_accessing_files(paths=holding, substring=substring).items():
+            for info in infos: table.add_row(path, str(info["pid"]), "\n".join(info["files"]))
+        Console().print(table)
+        return
     from machineconfig.utils.procs import main
     main()
 
@@ -10,6 +10,8 @@ Key Features:
 - Direct OAuth2 setup without rclone dependency
 - Upload/download files with progress tracking
 - Support for both small and large file uploads
+- One pooled HTTP session, cached access token, adaptive chunk sizes and concurrent multi-file transfers
+- Resumable upload sessions persisted to disk so an interrupted upload continues where it stopped
 
 Requirements:
     pip install requests
@@ -30,17 +32,49 @@ Environment Variables (for OAuth2):
     ONEDRIVE_CLIENT_ID: Your Azure App Registration Client ID
     ONEDRIVE_CLIENT_SECRET: Your Client Secret (optional for public clients)
     ONEDRIVE_REDIRECT_URI: Redirect URI (default: http://localhost:8080/callback)
+    ONEDRIVE_GRAPH_API_BASE: Graph endpoint (default: https://graph.microsoft.com/v1.0), point it at a local stub for testing.
+    ONEDRIVE_OAUTH_TOKEN_ENDPOINT: Token endpoint (default: https://login.microsoftonline.com/common/oauth2/v2.0/token), likewise.
 """
 
 import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 from pathlib import Path
 from typing import Optional, Any
 import requests
+from requests.adapters import HTTPAdapter
 from urllib.parse import quote
 import json
 
 
+CHUNK_UNIT = 320 * 1024  # Graph requires upload chunks to be multiples of 320 KiB.
+MIN_CHUNK_SIZE = CHUNK_UNIT
+MAX_CHUNK_SIZE = 192 * CHUNK_UNIT  # 60 MiB, the Graph per-request ceiling.
+TARGET_CHUNK_SECONDS = 4.0
+UPLOAD_SESSIONS_PATH = Path.home().joinpath("tmp_results", "cache", "onedrive_upload_sessions.json")
+
+_session: Optional[requests.Session] = None
+_session_lock = threading.Lock()
+_token_lock = threading.Lock()
+_upload_sessions_lock = threading.Lock()
+_token_file_loaded = False
+_known_remote_dirs: set[str] = set()
+
+
+def get_session() -> requests.Session:
+    """One pooled session shared by every call (and thread), so TLS connections to Graph are reused."""
+    global _session
+    with _session_lock:
+        if _session is None:
+            _session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=4, pool_maxsize=32, max_retries=3)
+            _session.mount("https://", adapter)
+            _session.mount("http://", adapter)
+        return _session
+
+
 def get_rclone_token(section: str):
     import platform
 
@@ -119,8 +153,8 @@ CLIENT_SECRET = os.getenv("ONEDRIVE_CLIENT_SECRET", "your_client_secret_here")
 REDIRECT_URI = os.getenv("ONEDRIVE_REDIRECT_URI", "http://localhost:8080/callback")
 
 # Microsoft Graph API endpoints
-GRAPH_API_BASE = "https://graph.microsoft.com/v1.0"
-OAUTH_TOKEN_ENDPOINT = "https://login.microsoftonline.com/common/oauth2/v2.0/token"
+GRAPH_API_BASE = os.getenv("ONEDRIVE_GRAPH_API_BASE", "https://graph.microsoft.com/v1.0")
+OAUTH_TOKEN_ENDPOINT = os.getenv("ONEDRIVE_OAUTH_TOKEN_ENDPOINT", "https://login.microsoftonline.com/common/oauth2/v2.0/token")
 
 
 def is_token_valid() -> bool:
@@ -157,28 +191,28 @@ def get_access_token() -> Optional[str]:
     """
     Get access token, automatically refreshing if expired.
 
+    The saved token file is read once per process and validity is only re-checked against the cached expiry,
+    so repeated calls cost nothing until the token is about to expire.
+
     Returns:
         Access token string or None if token cannot be obtained/refreshed
     """
-    # First try to load token from file if it exists
-    load_token_from_file()
-
-    if not is_token_valid():
+    global _token_file_loaded
+    with _token_lock:
+        if not _token_file_loaded:
+            load_token_from_file()
+            _token_file_loaded = True
+        if is_token_valid():
+            return get_token().get("access_token")
         print("🔄 Access token has expired, attempting to refresh...")
-
-        # Try to refresh the token
         refreshed_token = refresh_access_token()
         if refreshed_token:
             return refreshed_token["access_token"]
-        else:
-            print("❌ Failed to refresh token automatically!")
-            print("\n🔧 You have two options:")
-            print("1. Run setup_oauth_authentication() to set up OAuth")
-            print("2. Update your rclone token by running: rclone config reconnect odp")
-            return None
-
-    token = get_token()
-    return token.get("access_token")
+        print("❌ Failed to refresh token automatically!")
+        print("\n🔧 You have two options:")
+        print("1. Run setup_oauth_authentication() to set up OAuth")
+        print("2. Update your rclone token by running: rclone config reconnect odp")
+        return None
 
 
 def make_graph_request(method: str, endpoint: str, **kwargs: Any) -> requests.Response:
@@ -205,7 +239,7 @@ def make_graph_request(method: str, endpoint: str, **kwargs: Any) -> requests.Re
     kwargs["headers"] = headers
 
     url = f"{GRAPH_API_BASE}/{endpoint.lstrip('/')}"
-    response = requests.request(method, url, **kwargs)
+    response = get_session().request(method, url, **kwargs)
 
     return response
 
@@ -280,48 +314,85 @@ def simple_upload(local_file: Path, remote_path: str) -> bool:
         return False
 
 
-def resumable_upload(local_file: Path, remote_path: str) -> bool:
-    """Upload large files using resumable upload."""
-    try:
-        # Create upload session using specific drive
-        encoded_path = quote(remote_path, safe="/")
-        drive_id = get_drive_id()
-        endpoint = f"drives/{drive_id}/root:{encoded_path}:/createUploadSession"
+def next_chunk_size(current: int, seconds: float) -> int:
+    """Grow or shrink the chunk so each PUT takes about TARGET_CHUNK_SECONDS, staying a multiple of 320 KiB within Graph's limits."""
+    if seconds <= 0: return MAX_CHUNK_SIZE
+    scaled = int(current * min(2.0, max(0.5, TARGET_CHUNK_SECONDS / seconds)))
+    return max(MIN_CHUNK_SIZE, min(MAX_CHUNK_SIZE, scaled // CHUNK_UNIT * CHUNK_UNIT))
 
-        item_data = {"item": {"@microsoft.graph.conflictBehavior": "replace", "name": local_file.name}}
 
-        response = make_graph_request("POST", endpoint, json=item_data)
+def _load_upload_sessions() -> dict[str, Any]:
+    if not UPLOAD_SESSIONS_PATH.exists(): return {}
+    try: return json.loads(UPLOAD_SESSIONS_PATH.read_text(encoding="utf-8"))
+    except (json.JSONDecodeError, OSError): return {}
 
-        if response.status_code != 200:
-            print(f"Failed to create upload session: {response.status_code} - {response.text}")
-            return False
 
-        upload_url = response.json()["uploadUrl"]
-        file_size = local_file.stat().st_size
-        chunk_size = 320 * 1024  # 320KB chunks
+def _save_upload_session(key: str, value: Optional[dict[str, Any]]) -> None:
+    with _upload_sessions_lock:
+        sessions = _load_upload_sessions()
+        if value is None: sessions.pop(key, None)
+        else: sessions[key] = value
+        UPLOAD_SESSIONS_PATH.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = UPLOAD_SESSIONS_PATH.with_suffix(f".{os.getpid()}.tmp")
+        fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)  # upload urls are pre-authenticated, the file is never readable by others.
+        with os.fdopen(fd, "w", encoding="utf-8") as handle: json.dump(sessions, handle, indent=2)
+        os.replace(tmp_path, UPLOAD_SESSIONS_PATH)
+
+
+def _resume_offset(upload_url: str) -> Optional[int]:
+    """Ask Graph where an existing session stopped; None means the session is gone and a new one is needed."""
+    response = get_session().get(upload_url)
+    if response.status_code != 200: return None
+    ranges = response.json().get("nextExpectedRanges", [])
+    return int(ranges[0].split("-")[0]) if ranges else None
 
-        with open(local_file, "rb") as f:
-            bytes_uploaded = 0
 
+def resumable_upload(local_file: Path, remote_path: str) -> bool:
+    """Upload large files using resumable upload. Sessions are recorded on disk and picked up again after a restart."""
+    try:
+        stat = local_file.stat()
+        file_size = stat.st_size
+        session_key = f"{local_file.absolute()}|{remote_path}"
+        saved = _load_upload_sessions().get(session_key)
+        upload_url: Optional[str] = None
+        bytes_uploaded = 0
+        if saved is not None and saved["size"] == file_size and saved["mtime_ns"] == stat.st_mtime_ns:
+            offset = _resume_offset(saved["uploadUrl"])
+            if offset is not None:
+                upload_url, bytes_uploaded = saved["uploadUrl"], offset
+                print(f"⏯️  Resuming upload of {local_file} at {bytes_uploaded / file_size * 100:.1f}%")
+        if upload_url is None:
+            encoded_path = quote(remote_path, safe="/")
+            drive_id = get_drive_id()
+            endpoint = f"drives/{drive_id}/root:{encoded_path}:/createUploadSession"
+            item_data = {"item": {"@microsoft.graph.conflictBehavior": "replace", "name": local_file.name}}
+            response = make_graph_request("POST", endpoint, json=item_data)
+            if response.status_code != 200:
+                print(f"Failed to create upload session: {response.status_code} - {response.text}")
+                return False
+            upload_url = str(response.json()["uploadUrl"])
+            _save_upload_session(session_key, {"uploadUrl": upload_url, "size": file_size, "mtime_ns": stat.st_mtime_ns})
+
+        chunk_size = 16 * CHUNK_UNIT  # 5 MiB to start with, adapted to the observed throughput afterwards.
+        with open(local_file, "rb") as f:
+            f.seek(bytes_uploaded)
             while bytes_uploaded < file_size:
                 chunk_data = f.read(chunk_size)
                 if not chunk_data:
                     break
-
-                chunk_end = min(bytes_uploaded + len(chunk_data) - 1, file_size - 1)
-
+                chunk_end = bytes_uploaded + len(chunk_data) - 1
                 headers = {"Content-Range": f"bytes {bytes_uploaded}-{chunk_end}/{file_size}", "Content-Length": str(len(chunk_data))}
-
-                chunk_response = requests.put(upload_url, data=chunk_data, headers=headers)
-
+                started = time.perf_counter()
+                chunk_response = get_session().put(upload_url, data=chunk_data, headers=headers)  # upload urls are pre-authenticated, no bearer token.
                 if chunk_response.status_code in [202, 200, 201]:
                     bytes_uploaded += len(chunk_data)
-                    progress = (bytes_uploaded / file_size) * 100
-                    print(f"Upload progress: {progress:.1f}%")
+                    chunk_size = next_chunk_size(chunk_size, time.perf_counter() - started)
+                    print(f"Upload progress: {(bytes_uploaded / file_size) * 100:.1f}%")
                 else:
                     print(f"Chunk upload failed: {chunk_response.status_code} - {chunk_response.text}")
                     return False
 
+        _save_upload_session(session_key, None)
         print(f"Successfully uploaded: {local_file} -> {remote_path}")
         return True
 
@@ -378,14 +449,14 @@ def pull_from_onedrive(remote_path: str, local_path: str) -> bool:
         local_file.parent.mkdir(parents=True, exist_ok=True)
 
         # Download the file
-        download_response = requests.get(download_url, stream=True)
+        download_response = get_session().get(download_url, stream=True)
         download_response.raise_for_status()
 
         file_size = int(file_info.get("size", 0))
         bytes_downloaded = 0
 
         with open(local_file, "wb") as f:
-            for chunk in download_response.iter_content(chunk_size=8192):
+            for chunk in download_response.iter_content(chunk_size=1024 * 1024):
                 if chunk:
                     f.write(chunk)
                     bytes_downloaded += len(chunk)
@@ -402,6 +473,30 @@ def pull_from_onedrive(remote_path: str, local_path: str) -> bool:
         return False
 
 
+def push_many_to_onedrive(pairs: list[tuple[str, str]], max_workers: int = 4) -> dict[str, bool]:
+    """
+    Upload many (local_path, remote_path) pairs concurrently over the shared session.
+
+    Returns:
+        Mapping of local path to success flag
+    """
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        results = list(pool.map(lambda pair: push_to_onedrive(pair[0], pair[1]), pairs))
+    return {local_path: ok for (local_path, _remote_path), ok in zip(pairs, results)}
+
+
+def pull_many_from_onedrive(pairs: list[tuple[str, str]], max_workers: int = 4) -> dict[str, bool]:
+    """
+    Download many (remote_path, local_path) pairs concurrently over the shared session.
+
+    Returns:
+        Mapping of remote path to success flag
+    """
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        results = list(pool.map(lambda pair: pull_from_onedrive(pair[0], pair[1]), pairs))
+    return {remote_path: ok for (remote_path, _local_path), ok in zip(pairs, results)}
+
+
 def create_remote_directory(remote_path: str) -> bool:
     """
     Create a directory in OneDrive if it doesn't exist.
@@ -418,6 +513,8 @@ def create_remote_directory(remote_path: str) -> bool:
     # Ensure remote path starts with /
     if not remote_path.startswith("/"):
         remote_path = "/" + remote_path
+    if remote_path in _known_remote_dirs:
+        return True
 
     try:
         # Check if directory already exists using specific drive
@@ -429,6 +526,7 @@ def create_remote_directory(remote_path: str) -> bool:
 
         if response.status_code == 200:
             # Directory already exists
+            _known_remote_dirs.add(remote_path)
             return True
         elif response.status_code != 404:
             print(f"Error checking directory: {response.status_code} - {response.text}")
@@ -454,6 +552,7 @@ def create_remote_directory(remote_path: str) -> bool:
         response = make_graph_request("POST", endpoint, json=folder_data)
 
         if response.status_code in [200, 201]:
+            _known_remote_dirs.add(remote_path)
             return True
         else:
             print(f"Failed to create directory: {response.status_code} - {response.text}")
@@ -489,7 +588,7 @@ def refresh_access_token() -> Optional[dict[str, Any]]:
     headers = {"Content-Type": "application/x-www-form-urlencoded"}
 
     try:
-        response = requests.post(OAUTH_TOKEN_ENDPOINT, data=data, headers=headers)
+        response = get_session().post(OAUTH_TOKEN_ENDPOINT, data=data, headers=headers)
 
         if response.status_code == 200:
             token_data = response.json()
@@ -748,6 +847,7 @@ if __name__ == "__main__":
     print("\n📚 Available Functions:")
     print("• push_to_onedrive(local_path, remote_path)")
     print("• pull_from_onedrive(remote_path, local_path)")
+    print("• push_many_to_onedrive(pairs, max_workers) / pull_many_from_onedrive(pairs, max_workers)")
     print("• refresh_access_token() - Refresh expired tokens")
     print("• setup_oauth_authentication() - First-time OAuth setup")
     print("• save_token_to_file(token_data) - Save tokens for persistence")
@@ -0,0 +1,198 @@
+"""One long-lived `rclone rcd` daemon driven through rclone's remote-control API, plus a bounded queue of concurrent transfer jobs.
+Works against any configured remote as well as rclone's local paths and `:memory:` backend, so it can be exercised without network."""
+
+from collections import deque
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import IO, Any, Callable, Literal, Optional, TypeAlias
+import re
+import secrets
+import socket
+import subprocess
+import tempfile
+import time
+
+import requests
+
+
+JOB_KIND: TypeAlias = Literal["copy", "sync", "bisync", "link"]
+
+
+@dataclass
+class TransferJob:
+    kind: JOB_KIND
+    source: str
+    target: Optional[str]
+    job_id: Optional[int] = None
+    finished: bool = False
+    success: bool = False
+    error: str = ""
+    bytes: int = 0
+    transfers: int = 0
+    duration: float = 0.0
+    output: dict[str, Any] = field(default_factory=dict)
+    options: dict[str, Any] = field(default_factory=dict)  # extra rc parameters, e.g. `_config` overrides.
+
+
+def _is_local(path: str) -> bool:
+    if re.match(r"^[A-Za-z]:[\\/]", path): return True  # windows drive letter, not a remote name.
+    head = path.split("/", 1)[0]
+    return ":" not in head
+
+
+def split_fs_remote(path: str) -> tuple[str, str]:
+    """`remote:dir/file.txt` -> (`remote:dir`, `file.txt`), `:memory:bucket/a` -> (`:memory:bucket`, `a`), `/home/x/a` -> (`/home/x`, `a`)."""
+    if _is_local(path):
+        as_path = Path(path).expanduser().absolute()
+        return str(as_path.parent), as_path.name
+    name_end = path.index(":", 1) + 1  # skips the leading colon of on-the-fly backends such as `:memory:`.
+    remote_name, rest = path[:name_end], path[name_end:].rstrip("/")
+    parent, _, leaf = rest.rpartition("/")
+    return remote_name + parent, leaf
+
+
+class RcloneDaemon:
+    def __init__(self, config_path: Optional[str] = None, startup_timeout: float = 15.0):
+        self.config_path = config_path
+        self.startup_timeout = startup_timeout
+        self.user = "machineconfig"
+        self.password = secrets.token_urlsafe(16)  # the rc endpoint can move files around, keep other local users off it.
+        self.port: Optional[int] = None
+        self.process: Optional[subprocess.Popen[bytes]] = None
+        self.stderr: Optional[IO[bytes]] = None  # spooled to a temp file rather than a pipe nobody drains, read back only when startup fails.
+        self.session = requests.Session()
+        self.session.auth = (self.user, self.password)
+
+    def __repr__(self) -> str: return f"RcloneDaemon @ 127.0.0.1:{self.port} ({'running' if self.is_running() else 'stopped'})"
+    def __enter__(self) -> "RcloneDaemon": return self.start()
+    def __exit__(self, *args: Any) -> None: self.stop()
+
+    @property
+    def url(self) -> str: return f"http://127.0.0.1:{self.port}"
+    def is_running(self) -> bool: return self.process is not None and self.process.poll() is None
+
+    def start(self) -> "RcloneDaemon":
+        if self.is_running(): return self
+        with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+            sock.bind(("127.0.0.1", 0))
+            self.port = sock.getsockname()[1]
+        cmd = ["rclone", "rcd", f"--rc-addr=127.0.0.1:{self.port}", f"--rc-user={self.user}", f"--rc-pass={self.password}"]
+        if self.config_path is not None: cmd.append(f"--config={self.config_path}")
+        self.stderr = tempfile.TemporaryFile()
+        self.process = subprocess.Popen(cmd, stdout=subprocess.DEVNULL, stderr=self.stderr)
+        deadline = time.monotonic() + self.startup_timeout
+        while time.monotonic() < deadline:
+            if self.process.poll() is not None:
+                self.stderr.seek(0)
+                stderr = self.stderr.read().decode(errors="replace")
+                self.stop()
+                raise RuntimeError(f"💥 rclone rcd exited during startup with code {self.process.returncode}:\n{stderr}")
+            try:
+                self.call("rc/noop")
+                return self
+            except requests.ConnectionError:
+                time.sleep(0.05)
+        self.stop()
+        raise TimeoutError(f"rclone rcd did not answer on {self.url} within {self.startup_timeout} seconds.")
+
+    def stop(self) -> None:
+        if self.is_running():
+            assert self.process is not None
+            try: self.call("core/quit")
+            except requests.RequestException: pass
+            try: self.process.wait(timeout=5)
+            except subprocess.TimeoutExpired:
+                self.process.kill()
+                self.process.wait()
+        if self.stderr is not None:
+            self.stderr.close()
+            self.stderr = None
+
+    def call(self, command: str, **params: Any) -> dict[str, Any]:
+        response = self.session.post(f"{self.url}/{command}", json=params, timeout=60)
+        if response.status_code != 200:
+            raise RuntimeError(f"💥 rclone rc `{command}` failed with HTTP {response.status_code}: {response.text}")
+        return response.json()
+
+    # ============================== operations ==============================
+    def _job_params(self, job: TransferJob) -> tuple[str, dict[str, Any]]:
+        match job.kind:
+            case "link":
+                fs, remote = split_fs_remote(job.source)
+                return "operations/publiclink", {"fs": fs, "remote": remote}
+            case "sync":
+                assert job.target is not None, "sync needs a target"
+                return "sync/sync", {"srcFs": job.source, "dstFs": job.target, **job.options}
+            case "bisync":
+                assert job.target is not None, "bisync needs a second path"
+                return "sync/bisync", {"path1": job.source, "path2": job.target, **job.options}
+            case "copy":
+                assert job.target is not None, "copy needs a target"
+                if self.is_dir(job.source): return "sync/copy", {"srcFs": job.source, "dstFs": job.target}
+                src_fs, src_remote = split_fs_remote(job.source)
+                dst_fs, dst_remote = split_fs_remote(job.target)
+                return "operations/copyfile", {"srcFs": src_fs, "srcRemote": src_remote, "dstFs": dst_fs, "dstRemote": dst_remote}
+
+    def is_dir(self, path: str) -> bool:
+        if _is_local(path): return Path(path).expanduser().is_dir()
+        fs, remote = split_fs_remote(path)
+        if remote == "": return True
+        item = self.call("operations/stat", fs=fs, remote=remote).get("item")
+        return bool(item is not None and item.get("IsDir", False))
+
+    def submit(self, job: TransferJob) -> TransferJob:
+        command, params = self._job_params(job)
+        job.job_id = int(self.call(command, _async=True, **params)["jobid"])
+        return job
+
+    def refresh(self, job: TransferJob) -> TransferJob:
+        assert job.job_id is not None, "job was never submitted"
+        status = self.call("job/status", jobid=job.job_id)
+        job.finished, job.success = bool(status["finished"]), bool(status["success"])
+        job.error, job.duration, job.output = status.get("error", ""), float(status.get("duration", 0.0)), status.get("output") or {}
+        stats = self.call("core/stats", group=f"job/{job.job_id}")
+        job.bytes, job.transfers = int(stats.get("bytes", 0)), int(stats.get("transfers", 0))
+        return job
+
+    def run(self, job: TransferJob, poll_interval: float = 0.1) -> TransferJob:
+        self.submit(job)
+        while not self.refresh(job).finished: time.sleep(poll_interval)
+        if not job.success: raise RuntimeError(f"💥 rclone {job.kind} `{job.source}` -> `{job.target}` failed: {job.error}")
+        return job
+
+    def copyto(self, source: str, target: str) -> TransferJob: return self.run(TransferJob(kind="copy", source=source, target=target))
+    def sync(self, source: str, target: str, options: Optional[dict[str, Any]] = None) -> TransferJob: return self.run(TransferJob(kind="sync", source=source, target=target, options=options or {}))
+    def bisync(self, path1: str, path2: str, options: Optional[dict[str, Any]] = None) -> TransferJob: return self.run(TransferJob(kind="bisync", source=path1, target=path2, options=options or {}))
+    def link(self, path: str) -> str: return str(self.run(TransferJob(kind="link", source=path, target=None)).output["url"])
+    def stats(self) -> dict[str, Any]: return self.call("core/stats")
+
+
+class TransferQueue:
+    """Runs submitted jobs on a shared daemon with at most `max_concurrent` in flight; `on_progress` gets the daemon-wide stats every poll."""
+    def __init__(self, daemon: RcloneDaemon, max_concurrent: int):
+        self.daemon = daemon
+        self.max_concurrent = max_concurrent
+        self.pending: deque[TransferJob] = deque()
+        self.jobs: list[TransferJob] = []
+
+    def put(self, kind: JOB_KIND, source: str, target: Optional[str]) -> TransferJob:
+        job = TransferJob(kind=kind, source=source, target=target)
+        self.pending.append(job)
+        self.jobs.append(job)
+        return job
+
+    def run(self, poll_interval: float, on_progress: Optional[Callable[[dict[str, Any]], None]]) -> list[TransferJob]:
+        running: list[TransferJob] = []
+        while self.pending or running:
+            while self.pending and len(running) < self.max_concurrent:
+                job = self.pending.popleft()
+                try: running.append(self.daemon.submit(job))
+                except RuntimeError as err: job.finished, job.success, job.error = True, False, str(err)
+            time.sleep(poll_interval)
+            running = [job for job in running if not self.daemon.refresh(job).finished]
+            if on_progress is not None: on_progress(self.daemon.stats())
+        return self.jobs
+
+
+if __name__ == "__main__":
+    pass
@@ -1,3 +1,6 @@
+import io
+import os
+import sqlite3
 import time
 from typing import Optional, Any, Callable
 
@@ -177,35 +180,81 @@ class DBMS:
         return create_engine(url, echo=echo, pool_size=pool_size, connect_args=connect_args, **kwargs)
 
 DB_TMP_PATH = P.home().joinpath(".tmp").joinpath("tmp_dbs").joinpath("results").joinpath("data.sqlite")
+_RESULT_CONNECTIONS: dict[tuple[int, str], sqlite3.Connection] = {}
+_PREPARED_TABLES: set[tuple[int, str, str]] = set()  # (pid, db file, table) whose schema was already created or migrated by this process.
 
 
-def to_db(table: str, idx: int, idx_max: int, data: Any):
+def _get_results_connection(path: P) -> sqlite3.Connection:
+    # one connection per (process, db file): workers reuse it across calls instead of building and disposing an engine per write.
+    key = (os.getpid(), str(path))
+    conn = _RESULT_CONNECTIONS.get(key)
+    if conn is None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(str(path), timeout=60, isolation_level=None, check_same_thread=False)
+        conn.execute("PRAGMA journal_mode=WAL")  # readers never block writers, writers only hold the lock for the append itself.
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute("PRAGMA busy_timeout=60000")
+        _RESULT_CONNECTIONS[key] = conn
+    return conn
+
+
+def _prepare_results_table(conn: sqlite3.Connection, path: P, table: str, create: bool) -> None:
+    """Runs the DDL once per connection and table. Tables written before payloads were tagged lack `kind`, their rows are all pickles."""
+    key = (os.getpid(), str(path), table)
+    if key in _PREPARED_TABLES: return
+    if create: conn.execute(f"""CREATE TABLE IF NOT EXISTS "{table}" (time INT, idx INT, idx_max INT, kind TEXT, data BLOB)""")
+    columns = [row[1] for row in conn.execute(f"""PRAGMA table_info("{table}")""").fetchall()]
+    if len(columns) == 0: return  # reading a table that does not exist, let the query raise.
+    if "kind" not in columns: conn.execute(f"""ALTER TABLE "{table}" ADD COLUMN kind TEXT DEFAULT 'pickle'""")
+    conn.execute(f"""CREATE INDEX IF NOT EXISTS "{table}_idx" ON "{table}" (idx, time)""")
+    _PREPARED_TABLES.add(key)
+
+
+def _encode_payload(data: Any) -> tuple[str, bytes]:
+    if isinstance(data, pl.DataFrame):
+        buffer = io.BytesIO()
+        data.write_ipc(buffer, compression="lz4")
+        return "arrow", buffer.getvalue()
     import pickle
-    DB_TMP_PATH.parent.mkdir(parents=True, exist_ok=True)
-    db = DBMS.from_local_db(DB_TMP_PATH)
-    time_now = time.time_ns()
-    data_blob = pickle.dumps(data)
-    create_table = f"""CREATE TABLE IF NOT EXISTS "{table}" (time INT PRIMARY KEY, idx INT, idx_max INT, data BLOB)"""
-    insert_row = f"""INSERT INTO "{table}" (time, idx, idx_max, data) VALUES (:time, :idx, :idx_max, :data)"""
-    with db.eng.begin() as conn:
-        conn.execute(text(create_table))
-        conn.execute(
-            text(insert_row),
-            {'time': time_now, 'idx': idx, 'idx_max': idx_max, 'data': data_blob}
-        )
-    db.close()
-
-
-def from_db(table: str):
+    return "pickle", pickle.dumps(data, protocol=pickle.HIGHEST_PROTOCOL)
+
+
+def _decode_payload(kind: str, blob: bytes) -> Any:
+    if kind == "arrow": return pl.read_ipc(io.BytesIO(blob))
     import pickle
-    DB_TMP_PATH.parent.mkdir(parents=True, exist_ok=True)
-    db = DBMS.from_local_db(DB_TMP_PATH)
-    with db.eng.connect() as conn:
-        res = conn.execute(text(f"""SELECT * FROM "{table}" """))
-        records = res.fetchall()
-        df = pl.DataFrame(records, schema=['time', 'idx', 'idx_max', 'data'])
-        df = df.with_columns(pl.col('data').map_elements(pickle.loads))
-        return df
+    return pickle.loads(blob)
+
+
+def to_db(table: str, idx: int, idx_max: int, data: Any, path: P = DB_TMP_PATH) -> None:
+    """Append the result of shard `idx` (out of `idx_max`). polars DataFrames are stored as Arrow IPC, anything else is pickled."""
+    conn = _get_results_connection(path)
+    kind, blob = _encode_payload(data)
+    _prepare_results_table(conn, path, table, create=True)
+    conn.execute(f"""INSERT INTO "{table}" (time, idx, idx_max, kind, data) VALUES (?, ?, ?, ?, ?)""", (time.time_ns(), idx, idx_max, kind, blob))
+
+
+def from_db(table: str, path: P = DB_TMP_PATH) -> pl.DataFrame:
+    """All results of `table` ordered by shard index then write time, with `data` decoded back to python objects."""
+    conn = _get_results_connection(path)
+    _prepare_results_table(conn, path, table, create=False)
+    records = conn.execute(f"""SELECT time, idx, idx_max, kind, data FROM "{table}" ORDER BY idx, time""").fetchall()
+    # built column by column: payloads of different shapes (a list next to a dict) have no common polars supertype.
+    return pl.DataFrame([pl.Series("time", [record[0] for record in records], dtype=pl.Int64), pl.Series("idx", [record[1] for record in records], dtype=pl.Int64),
+                         pl.Series("idx_max", [record[2] for record in records], dtype=pl.Int64),
+                         pl.Series("data", [_decode_payload(kind, blob) for *_rest, kind, blob in records], dtype=pl.Object)])
+
+
+def from_db_concat(table: str, path: P = DB_TMP_PATH) -> pl.DataFrame:
+    """Reassemble DataFrame shards of `table` into one frame in shard order, keeping only the latest write per shard."""
+    conn = _get_results_connection(path)
+    _prepare_results_table(conn, path, table, create=False)
+    query = f"""SELECT t.kind, t.data FROM "{table}" t JOIN (SELECT idx, MAX(time) AS time FROM "{table}" GROUP BY idx) latest
+    ON t.idx = latest.idx AND t.time = latest.time ORDER BY t.idx"""
+    frames: list[pl.DataFrame] = []
+    for kind, blob in conn.execute(query).fetchall():
+        if kind != "arrow": raise TypeError(f"Shard in table `{table}` holds a `{kind}` payload, only DataFrame shards can be concatenated.")
+        frames.append(_decode_payload(kind, blob))
+    return pl.concat(frames, how="vertical_relaxed") if len(frames) > 0 else pl.DataFrame()
 
 
 def get_table_specs(engine: Engine, table_name: str) -> pl.DataFrame:
@@ -5,9 +5,13 @@ from pathlib import Path
 from typing import Any, Optional
 
 
+LAZY_SUFFIXES = ("parquet", "csv", "npy", "arrow", "feather", "ipc")
+
+
 class Read:
     @staticmethod
-    def read(path: 'Path', **kwargs: Any) -> Any:
+    def read(path: 'Path', lazy: bool = False, **kwargs: Any) -> Any:
+        """When `lazy`, tabular files come back as polars LazyFrames and npy files as read-only memory maps, nothing is loaded upfront."""
         if Path(path).is_dir(): raise IsADirectoryError(f"Path is a directory, not a file: {path}")
         suffix = Path(path).suffix[1:]
         if suffix == "": raise ValueError(f"File type could not be inferred from suffix. Suffix is empty. Path: {path}")
@@ -16,18 +20,13 @@ class Read:
             res = DBMS.from_local_db(path=path)
             print(res.describe_db())
             return res
+        if suffix in LAZY_SUFFIXES: kwargs["lazy"] = lazy
         try: return getattr(Read, suffix)(str(path), **kwargs)
         except AttributeError as err:
             if "type object 'Read' has no attribute" not in str(err): raise AttributeError(err) from err
             if suffix in ('eps', 'jpg', 'jpeg', 'pdf', 'pgf', 'png', 'ps', 'raw', 'rgba', 'svg', 'svgz', 'tif', 'tiff'):
                 import matplotlib.pyplot as pyplot
                 return pyplot.imread(str(path), **kwargs)  # from: plt.gcf().canvas.get_supported_filetypes().keys():
-            if suffix == "parquet":
-                import polars as pl
-                return pl.read_parquet(path, **kwargs)
-            elif suffix == "csv":
-                import polars as pl
-                return pl.read_csv(path, **kwargs)
             try:
                 # guess = install_n_import('magic', 'python-magic').from_file(path)
                 guess = "IDKm"
@@ -58,8 +57,11 @@ class Read:
         import tomllib
         return tomllib.loads(Path(path).read_text(encoding='utf-8'))
     @staticmethod
-    def npy(path: 'Path', **kwargs: Any):
+    def npy(path: 'Path', lazy: bool = False, **kwargs: Any):
         import numpy as np
+        if lazy:
+            try: return np.load(str(path), mmap_mode="r", allow_pickle=False, **kwargs)
+            except ValueError: print(f"⚠️ `{path}` holds pickled objects and cannot be memory-mapped, loading it eagerly.")
         data = np.load(str(path), allow_pickle=True, **kwargs)
         # data = data.item() if data.dtype == np.object else data
         return data
@@ -85,9 +87,24 @@ class Read:
     @staticmethod
     def txt(path: 'Path', encoding: str = 'utf-8') -> str: return Path(path).read_text(encoding=encoding)
     @staticmethod
-    def parquet(path: 'Path', **kwargs: Any):
+    def parquet(path: 'Path', lazy: bool = False, **kwargs: Any):
         import polars as pl
+        if lazy: return pl.scan_parquet(path, **kwargs)
         return pl.read_parquet(path, **kwargs)
+    @staticmethod
+    def csv(path: 'Path', lazy: bool = False, **kwargs: Any):
+        import polars as pl
+        if lazy: return pl.scan_csv(path, **kwargs)
+        return pl.read_csv(path, **kwargs)
+    @staticmethod
+    def arrow(path: 'Path', lazy: bool = False, **kwargs: Any):
+        import polars as pl
+        if lazy: return pl.scan_ipc(path, **kwargs)  # memory-maps the file, columns are only paged in when collected.
+        return pl.read_ipc(path, **kwargs)
+    @staticmethod
+    def feather(path: 'Path', lazy: bool = False, **kwargs: Any): return Read.arrow(path, lazy=lazy, **kwargs)
+    @staticmethod
+    def ipc(path: 'Path', lazy: bool = False, **kwargs: Any): return Read.arrow(path, lazy=lazy, **kwargs)
 
 
 
@@ -199,7 +199,7 @@ class Installer:
             print(f"🔗 Download URL: {download_link}")
         assert download_link is not None, "download_link must be set"
         assert version_to_be_installed is not None, "version_to_be_installed must be set"
-        downloaded = PathExtended(download_link).download(folder=INSTALL_TMP_DIR).decompress()
+        downloaded = PathExtended(download_link).download(folder=INSTALL_TMP_DIR, extract=True)  # archives are unpacked while they stream in.
         return downloaded, version_to_be_installed
 
     # --------------------------- Arch / template helpers ---------------------------
@@ -0,0 +1,62 @@
+"""Typer groups whose subcommands are imported only when they are invoked, so `mcfg devops ...` never pays for importing `cloud`, `croshell`, etc.
+Help listings are rendered from the declared help strings without importing anything."""
+
+from dataclasses import dataclass
+from typing import Any, Literal
+import importlib
+
+import click
+import typer
+from typer.core import TyperGroup
+
+
+@dataclass(frozen=True)
+class LazySubcommand:
+    import_path: str  # "package.module:attribute"
+    kind: Literal["app", "function"]  # `app`: attribute is a `get_app()` returning a typer.Typer. `function`: attribute is a plain typer command function.
+    help: str
+    hidden: bool
+    no_args_is_help: bool
+
+
+def load_subcommand(name: str, spec: LazySubcommand) -> click.Command:
+    module_name, attribute = spec.import_path.split(":")
+    target = getattr(importlib.import_module(module_name), attribute)
+    if spec.kind == "app":
+        command = typer.main.get_command(target())
+    else:
+        app = typer.Typer(add_completion=False)
+        app.command(name)(target)
+        command = typer.main.get_command(app)
+    command.help = spec.help
+    command.hidden = spec.hidden
+    command.no_args_is_help = spec.no_args_is_help
+    return command
+
+
+def get_lazy_group_class(subcommands: dict[str, LazySubcommand]) -> type[TyperGroup]:
+    """Returns a TyperGroup subclass to be passed as `typer.Typer(cls=...)`. `subcommands` maps command name (aliases included) to its spec."""
+    class LazyTyperGroup(TyperGroup):
+        lazy_subcommands = subcommands
+
+        def __init__(self, *args: Any, **kwargs: Any) -> None:
+            super().__init__(*args, **kwargs)
+            self._listing = False
+            self._loaded: dict[str, click.Command] = {}
+
+        def list_commands(self, ctx: click.Context) -> list[str]:
+            return super().list_commands(ctx) + [name for name in self.lazy_subcommands if name not in self.commands]
+
+        def get_command(self, ctx: click.Context, cmd_name: str) -> click.Command | None:
+            spec = self.lazy_subcommands.get(cmd_name)
+            if spec is None: return super().get_command(ctx, cmd_name)
+            if self._listing: return click.Command(name=cmd_name, help=spec.help, hidden=spec.hidden)  # help page only needs the name and help text.
+            if cmd_name not in self._loaded: self._loaded[cmd_name] = load_subcommand(cmd_name, spec)
+            return self._loaded[cmd_name]
+
+        def format_help(self, ctx: click.Context, formatter: click.HelpFormatter) -> None:
+            self._listing = True
+            try: super().format_help(ctx, formatter)
+            finally: self._listing = False
+
+    return LazyTyperGroup
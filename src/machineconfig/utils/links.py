@@ -2,10 +2,15 @@ from machineconfig.utils.path_extended import PathExtended, PLike
 from machineconfig.utils.accessories import randstr
 from rich.console import Console
 from rich.panel import Panel
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Optional, TypedDict, Literal
 import hashlib
-from typing import TypedDict, Literal
+import json
+import os
 
 console = Console()
+LINKS_HASH_MANIFEST_PATH = Path.home().joinpath("tmp_results", "cache", "links_hashes.json")
 
 
 ActionType = Literal[
@@ -44,21 +49,80 @@ class OperationRecord(TypedDict):
     status: str
 
 
-def files_are_identical(file1: PathExtended, file2: PathExtended) -> bool:
-    """Check if two files are identical by comparing their SHA256 hashes."""
-    def get_file_hash(path: PathExtended) -> str:
+class HashManifest:
+    """sha256 of files keyed by absolute path and validated by (size, mtime_ns). Persisted between runs so unchanged files are never re-read."""
+    def __init__(self, path: Optional[Path]):
+        self.path = path
+        self.entries: dict[str, list[Any]] = {}
+        if path is not None and path.exists():
+            try: self.entries = json.loads(path.read_text(encoding="utf-8"))
+            except (json.JSONDecodeError, OSError): self.entries = {}
+
+    def digest(self, file: PLike) -> str:
+        key = os.path.abspath(os.path.expanduser(str(file)))
+        stat = os.stat(key)
+        cached = self.entries.get(key)
+        if cached is not None and cached[0] == stat.st_size and cached[1] == stat.st_mtime_ns: return cached[2]
         hash_sha256 = hashlib.sha256()
-        with open(path, "rb") as f:
-            for chunk in iter(lambda: f.read(4096), b""):
-                hash_sha256.update(chunk)
+        with open(key, "rb") as f:
+            while chunk := f.read(1024 ** 2): hash_sha256.update(chunk)
+        self.entries[key] = [stat.st_size, stat.st_mtime_ns, hash_sha256.hexdigest()]
         return hash_sha256.hexdigest()
-    
+
+    def prefetch(self, files: list[PLike], workers: int) -> None:
+        def safe_digest(file: PLike) -> None:
+            try: self.digest(file)
+            except OSError: pass
+        with ThreadPoolExecutor(max_workers=workers) as pool: list(pool.map(safe_digest, files))
+
+    def save(self) -> None:
+        if self.path is None: return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_suffix(f".{os.getpid()}.tmp")
+        tmp_path.write_text(json.dumps(self.entries), encoding="utf-8")
+        os.replace(tmp_path, self.path)  # a concurrent reader never sees a half-written manifest.
+
+
+def files_are_identical(file1: PathExtended, file2: PathExtended, hashes: Optional[HashManifest] = None) -> bool:
+    """Check if two files are identical: sizes first, then SHA256 hashes (served from `hashes` when the files did not change)."""
     try:
-        return get_file_hash(file1) == get_file_hash(file2)
+        if os.stat(file1).st_size != os.stat(file2).st_size: return False
+        hashes = hashes if hashes is not None else HashManifest(path=None)
+        return hashes.digest(file1) == hashes.digest(file2)
     except (OSError, IOError):
         return False
 
 
+def plan_map(config_file_default_path: PathExtended, self_managed_config_file_path: PathExtended, method: Literal["symlink", "copy"],
+             on_conflict: Literal["throwError", "overwriteSelfManaged", "backupSelfManaged", "overwriteDefaultPath", "backupDefaultPath"], hashes: HashManifest
+             ) -> tuple[OperationResult, bool]:
+    """Side-effect free prediction of what `symlink_map` / `copy_map` would do. The flag is False when the pair is already in the desired state."""
+    default_path = PathExtended(config_file_default_path).expanduser().absolute()
+    self_managed = PathExtended(self_managed_config_file_path).expanduser().absolute()
+    if default_path.resolve() == self_managed.resolve():
+        return {"action": "already_linked", "details": "defaultPath and selfManaged resolve to same location - already correctly configured"}, False
+    if default_path.is_symlink() and not default_path.exists():
+        return {"action": "fixing_broken_link", "details": f"Broken symlink at default path will be replaced by a {method}"}, True
+    match (default_path.exists(), self_managed.exists()):
+        case (True, True):
+            if default_path.is_symlink(): return {"action": "relinking", "details": "Symlink at default path points elsewhere"}, True
+            if files_are_identical(default_path, self_managed, hashes=hashes):
+                if method == "copy": return {"action": "identical_files", "details": "Copy is identical to self-managed config"}, False
+                return {"action": "identical_files", "details": "Files identical, default path will be replaced by a symlink"}, True
+            match on_conflict:
+                case "throwError": return {"action": "error", "details": "Conflict: both exist with different content"}, True
+                case "overwriteSelfManaged" | "backupSelfManaged": return {"action": "backing_up_target", "details": f"Conflict resolved by {on_conflict}"}, True
+                case "overwriteDefaultPath" | "backupDefaultPath": return {"action": "backupConfigDefaultPath", "details": f"Conflict resolved by {on_conflict}"}, True
+        case (True, False):
+            if default_path.is_symlink(): return {"action": "relink2newSelfManagedPath", "details": "Symlink at default path will point to a new self-managed file"}, True
+            return {"action": "move2selfManagedPath", "details": "Default path will be moved to self-managed location"}, True
+        case (False, True):
+            return {"action": "new_link", "details": f"New {method} of existing self-managed config"}, True
+        case (False, False):
+            return {"action": "newLinkAndSelfManagedPath", "details": f"Self-managed file will be created along with a {method}"}, True
+    raise RuntimeError("unreachable")
+
+
 def build_links(target_paths: list[tuple[PLike, str]], repo_root: PLike):
     """Build symboic links from various relevant paths (e.g. data) to `repo_root/links/<name>` to facilitate easy access from
     tree explorer of the IDE.
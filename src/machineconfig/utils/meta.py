@@ -1,11 +1,14 @@
 """Metaprogramming utilities for analyzing and serializing Python functions."""
 
 import ast
+import functools
 import inspect
 import textwrap
-from collections.abc import Callable, Mapping
-from types import FunctionType, ModuleType
-from typing import Any, ParamSpec
+from collections.abc import Callable, Mapping, Sequence
+from dataclasses import dataclass
+from pathlib import Path
+from types import CodeType, FunctionType, ModuleType
+from typing import Any, Optional, ParamSpec
 
 P = ParamSpec("P")
 
@@ -15,7 +18,8 @@ def function_to_script(func: Callable[P, object], call_with_kwargs: Mapping[str,
     
     This function analyzes a given function and generates a complete Python script
     that includes all necessary imports, global variables, the function definition,
-    and optionally a function call.
+    and optionally a function call. Source extraction and AST analysis are memoized per code object,
+    so repeated calls for the same function only re-serialize its globals and the call statement.
     
     Args:
         func: The function to convert to a script
@@ -63,43 +67,36 @@ def function_to_script(func: Callable[P, object], call_with_kwargs: Mapping[str,
 
 def _get_function_source(func: FunctionType) -> str:
     """Extract the source code of a function."""
-    try:
-        source = inspect.getsource(func)
-        return textwrap.dedent(source)
-    except (OSError, TypeError) as e:
-        raise ValueError(f"Cannot get source code for function {func.__name__}: {e}") from e
+    return _analyze_code(func.__code__)[0]
 
 
-def _extract_imports(func: FunctionType) -> str:
-    """Extract all import statements needed by the function."""
-    import_statements: set[str] = set()
-    
-    source = _get_function_source(func)
-    func_globals = func.__globals__
-    
+@functools.lru_cache(maxsize=512)
+def _analyze_code(code: CodeType) -> tuple[str, frozenset[str]]:
+    """Dedented source and the global names it references (including in argument defaults). Cached per code object:
+    nested helpers defined inside methods share one code object across calls, so this runs once per process per function."""
+    try:
+        source = textwrap.dedent(inspect.getsource(code))
+    except (OSError, TypeError) as e:
+        raise ValueError(f"Cannot get source code for function {code.co_name}: {e}") from e
     try:
         tree = ast.parse(source)
     except SyntaxError as e:
         raise ValueError(f"Failed to parse function source: {e}") from e
-    
     used_names: set[str] = set()
-    for node in ast.walk(tree):
+    for node in ast.walk(tree):  # argument defaults are sub-nodes of the def, so this walk covers them too.
         if isinstance(node, ast.Name):
             used_names.add(node.id)
         elif isinstance(node, ast.Attribute):
             if isinstance(node.value, ast.Name):
                 used_names.add(node.value.id)
-    
-    for node in ast.walk(tree):
-        if isinstance(node, ast.FunctionDef):
-            for default in node.args.defaults + node.args.kw_defaults:
-                if default is not None:
-                    for subnode in ast.walk(default):
-                        if isinstance(subnode, ast.Name):
-                            used_names.add(subnode.id)
-                        elif isinstance(subnode, ast.Attribute):
-                            if isinstance(subnode.value, ast.Name):
-                                used_names.add(subnode.value.id)
+    return source, frozenset(used_names)
+
+
+def _extract_imports(func: FunctionType) -> str:
+    """Extract all import statements needed by the function."""
+    import_statements: set[str] = set()
+    func_globals = func.__globals__
+    _source, used_names = _analyze_code(func.__code__)
     
     for name in used_names:
         if name in func_globals:
@@ -145,33 +142,8 @@ def _extract_globals(func: FunctionType) -> str:
     """Extract global variables needed by the function."""
     global_assignments: list[str] = []
     needed_types: set[type] = set()
-    
-    source = _get_function_source(func)
     func_globals = func.__globals__
-    
-    try:
-        tree = ast.parse(source)
-    except SyntaxError as e:
-        raise ValueError(f"Failed to parse function source: {e}") from e
-    
-    used_names: set[str] = set()
-    for node in ast.walk(tree):
-        if isinstance(node, ast.Name):
-            used_names.add(node.id)
-        elif isinstance(node, ast.Attribute):
-            if isinstance(node.value, ast.Name):
-                used_names.add(node.value.id)
-    
-    for node in ast.walk(tree):
-        if isinstance(node, ast.FunctionDef):
-            for default in node.args.defaults + node.args.kw_defaults:
-                if default is not None:
-                    for subnode in ast.walk(default):
-                        if isinstance(subnode, ast.Name):
-                            used_names.add(subnode.id)
-                        elif isinstance(subnode, ast.Attribute):
-                            if isinstance(subnode.value, ast.Name):
-                                used_names.add(subnode.value.id)
+    _source, used_names = _analyze_code(func.__code__)
     
     for name in used_names:
         if name in func_globals:
@@ -245,6 +217,71 @@ def _generate_call_statement(func: FunctionType, kwargs: dict[str, object]) -> s
     return f"{func.__name__}({args_str})"
 
 
+@dataclass(frozen=True)
+class PayloadBundle:
+    digest: str
+    module_path: Path  # payload_<digest>.py, the functions plus a `main(argv)` dispatcher.
+    launcher_path: Path  # run_<digest>.py, a two-line script that imports the module so its cached bytecode gets used.
+    bytecode_path: Optional[Path]  # __pycache__/payload_<digest>.<tag>.pyc, ignored by interpreters with a different tag.
+
+    def files(self) -> list[Path]:
+        return [self.module_path, self.launcher_path] + ([self.bytecode_path] if self.bytecode_path is not None else [])
+
+
+def functions_to_module(functions: Sequence[FunctionType]) -> str:
+    """Bundle several functions (with their imports and globals) into one module that dispatches on the command line:
+    `python module.py <function_name> <encode_payload_call(kwargs)>`. Ship it once, invoke it many times."""
+    imports: set[str] = set()
+    globals_parts: list[str] = []
+    sources: list[str] = []
+    for func in functions:
+        imports.update(line for line in _extract_imports(func).splitlines() if line)
+        globals_needed = _extract_globals(func)
+        if globals_needed and globals_needed not in globals_parts: globals_parts.append(globals_needed)
+        sources.append(_get_function_source(func).rstrip())
+    dispatcher = """def main(argv: list[str]) -> None:
+    import base64
+    import json
+    function_name, encoded_kwargs = argv
+    globals()[function_name](**json.loads(base64.urlsafe_b64decode(encoded_kwargs.encode("ascii"))))
+
+
+if __name__ == '__main__':
+    import sys
+    main(sys.argv[1:])"""
+    parts = ["\n".join(sorted(imports)), "\n\n".join(globals_parts), "\n\n\n".join(sources), dispatcher]
+    return "\n\n\n".join(part for part in parts if part) + "\n"
+
+
+def encode_payload_call(call_with_kwargs: Mapping[str, object]) -> str:
+    """kwargs for a payload module call as one shell-safe token (urlsafe base64 of JSON), identical under bash and PowerShell."""
+    import base64
+    import json
+    return base64.urlsafe_b64encode(json.dumps(dict(call_with_kwargs)).encode("utf-8")).decode("ascii")
+
+
+def write_payload(functions: Sequence[FunctionType], directory: Path, precompile: bool) -> PayloadBundle:
+    """Content-addressed payload: files are only written when this exact module was never written to `directory` before.
+    With `precompile`, the module is also compiled to an unchecked-hash .pyc so a remote interpreter of the same version skips parsing."""
+    import hashlib
+    import importlib.util
+    import py_compile
+    module_source = functions_to_module(functions)
+    digest = hashlib.blake2b(module_source.encode("utf-8"), digest_size=8).hexdigest()
+    module_path = directory.joinpath(f"payload_{digest}.py")
+    launcher_path = directory.joinpath(f"run_{digest}.py")
+    if not module_path.exists():
+        directory.mkdir(parents=True, exist_ok=True)
+        module_path.write_text(module_source, encoding="utf-8")
+        launcher_path.write_text(f"import os, sys\nsys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))\nfrom payload_{digest} import main\nmain(sys.argv[1:])\n", encoding="utf-8")
+    bytecode_path: Optional[Path] = None
+    if precompile:
+        bytecode_path = Path(importlib.util.cache_from_source(str(module_path)))
+        if not bytecode_path.exists():  # source never changes for a given digest, so the pyc does not need to be validated against it.
+            py_compile.compile(str(module_path), cfile=str(bytecode_path), doraise=True, invalidation_mode=py_compile.PycInvalidationMode.UNCHECKED_HASH)
+    return PayloadBundle(digest=digest, module_path=module_path, launcher_path=launcher_path, bytecode_path=bytecode_path)
+
+
 def lambda_to_defstring(lmb: Callable[[], Any], in_global: bool = False) -> str:
     """
     Given a no-arg lambda like `lambda: func(a=var1, b=var2)`,
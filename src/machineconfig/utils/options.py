@@ -11,33 +11,28 @@ def choose_from_options[T](msg: str, options: Iterable[T], multi: Literal[False]
 @overload
 def choose_from_options[T](msg: str, options: Iterable[T], multi: Literal[True], custom_input: bool = True, header: str = "", tail: str = "", prompt: str = "", default: Optional[T] = None, fzf: bool = False, ) -> list[T]: ...
 def choose_from_options[T](msg: str, options: Iterable[T], multi: bool, custom_input: bool = True, header: str = "", tail: str = "", prompt: str = "", default: Optional[T] = None, fzf: bool = False, ) -> Union[T, list[T]]:
+    """`options` may be any iterable, including a lazy generator: with fzf it is consumed while the picker is already open."""
     # TODO: replace with https://github.com/tmbo/questionary
     # # also see https://github.com/charmbracelet/gum
-    options_strings: list[str] = [str(x) for x in options]
-    default_string = str(default) if default is not None else None
     console = Console()
     fzf_exists = check_tool_exists("fzf")
     # print("\n" * 10, f"{fzf=}, {fzf_exists=}", "\n" * 10)
     if fzf and fzf_exists:
-        from pyfzf.pyfzf import FzfPrompt
-        fzf_prompt = FzfPrompt()
         nl = "\n"
-        choice_string_multi: list[str] = fzf_prompt.prompt(choices=options_strings, fzf_options=("--multi" if multi else "") + f' --prompt "{prompt.replace(nl, " ")}" ')  # --border-label={msg.replace(nl, ' ')}")
-        # --border=rounded doens't work on older versions of fzf installed at Ubuntu 20.04
+        choices = stream_to_fzf(options=options, fzf_args=(*(["--multi"] if multi else []), "--prompt", prompt.replace(nl, " ")))
         if not multi:
             try:
-                choice_one_string = choice_string_multi[0]
-                choice_idx = options_strings.index(choice_one_string)
-                return list(options)[choice_idx]
+                return choices[0]
             except IndexError as ie:
-                print(f"❌ Error: {options=}, {choice_string_multi=}")
-                print(f"🔍 Available choices: {choice_string_multi}")
+                print(f"❌ Error: no option was selected out of {options=}")
                 raise ie
-        choice_idx_s = [options_strings.index(x) for x in choice_string_multi]
-        return [list(options)[x] for x in choice_idx_s]
+        return choices
     else:
+        options = list(options)  # may be a one-shot iterator, it is indexed and printed below.
+        options_strings: list[str] = [str(x) for x in options]
+        default_string = str(default) if default is not None else None
         if default is not None:
-            assert default in options, f"Default `{default}` option not in options `{list(options)}`"
+            assert default in options, f"Default `{default}` option not in options `{options}`"
             default_msg = Text(" <<<<-------- DEFAULT", style="bold red")
         else:
             default_msg = Text("")
@@ -62,11 +57,11 @@ def choose_from_options[T](msg: str, options: Iterable[T], multi: bool, custom_i
         else:
             try:
                 choice_idx = int(choice_string, base=10)
-                choice_one = list(options)[choice_idx]
+                choice_one = options[choice_idx]
             except IndexError as ie:  # i.e. converting to integer was successful but indexing failed.
                 if choice_string in options_strings:  # string input
-                    choice_idx = options_strings.index(choice_one)  # type: ignore
-                    choice_one = list(options)[choice_idx]
+                    choice_idx = options_strings.index(choice_string)
+                    choice_one = options[choice_idx]
                 elif custom_input:
                     return str(choice_string)  # type: ignore
                 else:
@@ -76,8 +71,8 @@ def choose_from_options[T](msg: str, options: Iterable[T], multi: bool, custom_i
                     return choose_from_options(msg=msg, options=options, header=header, tail=tail, prompt=prompt, default=default, fzf=fzf, multi=multi, custom_input=custom_input)
             except (TypeError, ValueError) as te:  # int(choice_string) failed due to # either the number is invalid, or the input is custom.
                 if choice_string in options_strings:  # string input
-                    choice_idx = options_strings.index(choice_one)  # type: ignore
-                    choice_one = list(options)[choice_idx]
+                    choice_idx = options_strings.index(choice_string)
+                    choice_one = options[choice_idx]
                 elif custom_input:
                     return choice_string  # type: ignore
                 else:
@@ -91,6 +86,40 @@ def choose_from_options[T](msg: str, options: Iterable[T], multi: bool, custom_i
     return choice_one
 
 
+def stream_to_fzf[T](options: Iterable[T], fzf_args: tuple[str, ...]) -> list[T]:
+    """Feeds `options` to `fzf --read0` from a thread as NUL-terminated `index<TAB>label` records, so fzf shows results before the iterable is exhausted.
+    Only the label is displayed/matched (`--with-nth 2..`) and selections map back to the original objects by index, duplicates labels included."""
+    import threading
+    items: list[T] = []
+    process = subprocess.Popen(["fzf", "--read0", "--print0", "--delimiter", "\t", "--with-nth", "2..", *fzf_args], stdin=subprocess.PIPE, stdout=subprocess.PIPE)
+    assert process.stdin is not None and process.stdout is not None
+    stdin = process.stdin
+
+    def feed() -> None:
+        try:
+            batch: list[bytes] = []
+            for idx, item in enumerate(options):
+                items.append(item)
+                batch.append(f"{idx}\t{str(item).replace(chr(0), ' ')}\0".encode("utf-8", errors="replace"))
+                if len(batch) >= 1024:
+                    stdin.write(b"".join(batch))
+                    batch.clear()
+            stdin.write(b"".join(batch))
+        except (BrokenPipeError, OSError):
+            pass  # fzf exited (selection made or aborted) before all options were generated.
+        finally:
+            try: stdin.close()
+            except (BrokenPipeError, OSError): pass
+
+    feeder = threading.Thread(target=feed, daemon=True)
+    feeder.start()
+    output = process.stdout.read()
+    process.wait()
+    feeder.join()
+    records = [record for record in output.split(b"\0") if record]
+    return [items[int(record.split(b"\t", 1)[0])] for record in records]
+
+
 def choose_cloud_interactively() -> str:
     console = Console()
     console.print(Panel("🔍 LISTING CLOUD REMOTES | Fetching available cloud remotes...", border_style="bold blue", expand=False))
@@ -7,13 +7,19 @@ import sys
 import subprocess
 import os
 from platform import system
-from typing import Any, Optional, Union, Callable, TypeAlias, Literal
+from typing import TYPE_CHECKING, Any, BinaryIO, Iterator, Optional, Union, Callable, TypeAlias, Literal
+
+if TYPE_CHECKING:
+    import tarfile
 
 
 OPLike: TypeAlias = Union[str, "PathExtended", Path, None]
 PLike: TypeAlias = Union[str, "PathExtended", Path]
 FILE_MODE: TypeAlias = Literal["r", "w", "x", "a"]
 SHUTIL_FORMATS: TypeAlias = Literal["zip", "tar", "gztar", "bztar", "xztar"]
+ARCHIVE_FORMATS: TypeAlias = Literal["zip", "tar.zst"]
+COMPRESSION_SUFFIXES: dict[str, str] = {".tar.gz": "gz", ".tgz": "gz", ".tar.xz": "xz", ".txz": "xz", ".tar.bz2": "bz2", ".tar.bz": "bz2", ".tbz": "bz2", ".tar.zst": "zst", ".tzst": "zst",
+                                        ".gz": "gz", ".xz": "xz", ".bz2": "bz2", ".bz": "bz2", ".zst": "zst"}
 
 
 def _is_user_admin() -> bool:
@@ -139,6 +145,175 @@ def timestamp(fmt: Optional[str] = None, name: Optional[str] = None) -> str:
     return ((name + "_") if name is not None else "") + datetime.now().strftime(fmt or "%Y-%m-%d-%I-%M-%S-%p-%f")  # isoformat is not compatible with file naming convention, fmt here is.
 
 
+DIR_SIZE_CACHE_PATH = Path.home().joinpath("tmp_results", "cache", "dir_sizes.json")
+
+
+def _directory_record(directory: str, cache: dict[str, Any], visited: set[str]) -> Optional[dict[str, Any]]:
+    """Own-file bytes, hard-linked files and subdirectory names of `directory`, re-listed only when its mtime moved since it was cached.
+    Files rewritten in place do not bump their parent's mtime, so the cache trades that accuracy for speed."""
+    visited.add(directory)
+    try: mtime_ns = os.stat(directory, follow_symlinks=False).st_mtime_ns
+    except OSError: return None
+    record = cache.get(directory)
+    if record is not None and record["mtime_ns"] == mtime_ns: return record
+    own_bytes, links, sub_dirs = 0, [], []
+    try:
+        with os.scandir(directory) as it:
+            for entry in it:
+                try:
+                    if entry.is_dir(follow_symlinks=False):
+                        sub_dirs.append(entry.name)
+                    elif entry.is_file(follow_symlinks=False):
+                        stat = entry.stat(follow_symlinks=False)
+                        if stat.st_nlink > 1: links.append([stat.st_dev, stat.st_ino, stat.st_size])
+                        else: own_bytes += stat.st_size
+                except OSError: continue
+    except OSError: return None
+    record = {"mtime_ns": mtime_ns, "bytes": own_bytes, "links": links, "dirs": sub_dirs}
+    cache[directory] = record
+    return record
+
+
+def _subtree_size(directory: str, cache: dict[str, Any], hard_links: dict[tuple[int, int], int], visited: set[str]) -> int:
+    """Bytes of single-link files below `directory`; multiply-linked files go to `hard_links` keyed by inode so each counts once."""
+    total = 0
+    stack = [directory]
+    while stack:
+        a_dir = stack.pop()
+        record = _directory_record(a_dir, cache, visited)
+        if record is None: continue
+        total += record["bytes"]
+        for dev, ino, size in record["links"]: hard_links[(dev, ino)] = size
+        stack.extend(os.path.join(a_dir, name) for name in record["dirs"])
+    return total
+
+
+def _directory_size(root: str, workers: int, cache_path: Optional[Path]) -> int:
+    """`root` must be resolved, cache keys are absolute paths. Cached directories below `root` that were not reached by this walk no longer exist and are pruned."""
+    import json
+    cache: dict[str, Any] = {}
+    if cache_path is not None and cache_path.exists():
+        try: cache = json.loads(cache_path.read_text(encoding="utf-8"))
+        except (json.JSONDecodeError, OSError): cache = {}
+    visited: set[str] = set()
+    record = _directory_record(root, cache, visited)
+    if record is None: return 0
+    hard_links: dict[tuple[int, int], int] = {(dev, ino): size for dev, ino, size in record["links"]}
+    sub_dirs = [os.path.join(root, name) for name in record["dirs"]]
+    def size_subtree(a_dir: str) -> tuple[int, dict[tuple[int, int], int]]:
+        subtree_links: dict[tuple[int, int], int] = {}
+        return _subtree_size(a_dir, cache, subtree_links, visited), subtree_links
+    if workers > 1 and len(sub_dirs) > 1:
+        from concurrent.futures import ThreadPoolExecutor
+        with ThreadPoolExecutor(max_workers=workers) as pool: results = list(pool.map(size_subtree, sub_dirs))
+    else:
+        results = [size_subtree(a_dir) for a_dir in sub_dirs]
+    for _subtree_bytes, subtree_links in results: hard_links.update(subtree_links)
+    if cache_path is not None:
+        below_root = root.rstrip(os.sep) + os.sep
+        for stale in [a_dir for a_dir in cache if a_dir.startswith(below_root) and a_dir not in visited]: del cache[stale]
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = cache_path.with_suffix(f".{os.getpid()}.tmp")
+        tmp_path.write_text(json.dumps(cache), encoding="utf-8")
+        os.replace(tmp_path, cache_path)  # concurrent callers never read a half written cache.
+    return record["bytes"] + sum(subtree_bytes for subtree_bytes, _subtree_links in results) + sum(hard_links.values())
+
+
+def _split_archive_suffix(name: str) -> tuple[str, Optional[str], bool]:
+    """`foo.tar.xz` -> (`foo`, `xz`, True); `foo.gz` -> (`foo`, `gz`, False); `foo.tar` -> (`foo`, None, True); anything else -> (name, None, False)."""
+    for suffix, codec in COMPRESSION_SUFFIXES.items():
+        if name.endswith(suffix): return name[: -len(suffix)], codec, suffix.startswith(".t")
+    if name.endswith(".tar"): return name[: -len(".tar")], None, True
+    return name, None, False
+
+
+def _decompressing_reader(stream: BinaryIO, codec: Optional[str]) -> BinaryIO:
+    """Wrap `stream` so reads yield decompressed bytes incrementally; memory stays bounded by the codec's window, not the payload."""
+    match codec:
+        case None: return stream
+        case "gz":
+            import gzip
+            return gzip.GzipFile(fileobj=stream, mode="rb")  # type: ignore[return-value]
+        case "xz":
+            import lzma
+            return lzma.LZMAFile(stream, mode="rb")  # type: ignore[return-value]
+        case "bz2":
+            import bz2
+            return bz2.BZ2File(stream, mode="rb")  # type: ignore[return-value]
+        case "zst":
+            import zstandard
+            return zstandard.ZstdDecompressor().stream_reader(stream)  # type: ignore[return-value]
+        case _: raise ValueError(f"Unsupported compression codec `{codec}`")
+
+
+def extract_stream(stream: BinaryIO, archive_name: str, folder: Path, workers: int = 8) -> Path:
+    """Decompress and extract `stream` (a file or a download) straight into `folder` in a single pass, without intermediate files.
+    Tarballs land in `folder/<stem>/`, single compressed files in `folder/<stem>`. Zip archives need random access and are not supported here."""
+    import shutil
+    import tarfile
+
+    stem, codec, is_tar = _split_archive_suffix(archive_name)
+    destination = folder.joinpath(stem)
+    if not is_tar and codec is None: raise ValueError(f"`{archive_name}` is not a tarball nor a compressed file, nothing to extract.")
+    reader = _decompressing_reader(stream, codec)
+    try:
+        if is_tar:
+            destination.mkdir(parents=True, exist_ok=True)
+            with tarfile.open(fileobj=reader, mode="r|") as tar: _extract_tar_stream(tar=tar, destination=destination, workers=workers)
+        else:
+            destination.parent.mkdir(parents=True, exist_ok=True)
+            with open(destination, "wb") as handle: shutil.copyfileobj(reader, handle, length=1024 ** 2)
+    finally:
+        if reader is not stream: reader.close()
+    return destination
+
+
+TAR_SMALL_FILE_BYTES = 8 * 1024 ** 2  # members up to this size are read whole and written by the pool, larger ones are streamed in place.
+TAR_IN_FLIGHT_BYTES = 64 * 1024 ** 2
+
+
+def _extract_tar_stream(tar: "tarfile.TarFile", destination: Path, workers: int) -> None:
+    """Extract a tar opened in stream mode (`r|`). Small regular files are buffered and written by a thread pool (at most `TAR_IN_FLIGHT_BYTES`
+    buffered at a time), large ones are streamed in place, and every member goes through tarfile's `data` filter so archives cannot escape `destination`."""
+    import shutil
+    import tarfile
+    from collections import deque
+    from concurrent.futures import ThreadPoolExecutor, Future
+
+    def write_file(target: Path, payload: bytes, mode: int, mtime: float) -> None:
+        target.write_bytes(payload)
+        os.chmod(target, mode)
+        os.utime(target, (mtime, mtime))
+
+    pending: deque[tuple[Future[None], int]] = deque()
+    in_flight = 0  # bytes read from the archive whose write has not completed yet, capped at TAR_IN_FLIGHT_BYTES.
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+        for member in tar:
+            member = tarfile.data_filter(member, str(destination))
+            target = destination.joinpath(member.name)
+            if member.isreg():
+                target.parent.mkdir(parents=True, exist_ok=True)
+                source = tar.extractfile(member)
+                assert source is not None, f"Could not read `{member.name}` from the archive."
+                if member.size <= TAR_SMALL_FILE_BYTES:
+                    while pending and in_flight + member.size > TAR_IN_FLIGHT_BYTES:  # backpressure: wait for the oldest writes before reading more.
+                        future, size = pending.popleft()
+                        future.result()
+                        in_flight -= size
+                    pending.append((pool.submit(write_file, target, source.read(), member.mode or 0o644, member.mtime), member.size))
+                    in_flight += member.size
+                else:
+                    with open(target, "wb") as handle: shutil.copyfileobj(source, handle, length=1024 ** 2)
+                    os.chmod(target, member.mode or 0o644)
+                    os.utime(target, (member.mtime, member.mtime))
+            else:
+                for future, _size in pending: future.result()  # links may point at files still being written.
+                pending.clear()
+                in_flight = 0
+                tar.extract(member, path=str(destination), filter="data")
+        for future, _size in pending: future.result()
+
+
 class PathExtended(type(Path()), Path):  # type: ignore # pylint: disable=E0241
     # ============= Path management ==================
     """The default behaviour of methods acting on underlying disk object is to perform the action and return a new path referring to the mutated object in disk drive.
@@ -223,10 +398,12 @@ class PathExtended(type(Path()), Path):  # type: ignore # pylint: disable=E0241
         return dest if not orig else self
 
     # ======================================= File Editing / Reading ===================================
-    def download(self, folder: OPLike = None, name: Optional[str] = None, allow_redirects: bool = True, timeout: Optional[int] = None, params: Any = None) -> "PathExtended":
+    def download(self, folder: OPLike = None, name: Optional[str] = None, allow_redirects: bool = True, timeout: Optional[int] = None, params: Any = None, extract: bool = False) -> "PathExtended":
+        """With `extract`, tarballs and compressed files are decompressed straight off the socket into `folder` (nothing is saved in between),
+        zip archives are saved then unzipped, and anything else is just saved."""
         import requests
 
-        response = requests.get(self.as_url_str(), allow_redirects=allow_redirects, timeout=timeout, params=params)  # Alternative: from urllib import request; request.urlopen(url).read().decode('utf-8').
+        response = requests.get(self.as_url_str(), allow_redirects=allow_redirects, timeout=timeout, params=params, stream=True)  # Alternative: from urllib import request; request.urlopen(url).read().decode('utf-8').
         assert response.status_code == 200, f"Download failed with status code {response.status_code}\n{response.text}"
         if name is not None:
             f_name = name
@@ -235,9 +412,16 @@ class PathExtended(type(Path()), Path):  # type: ignore # pylint: disable=E0241
                 f_name = response.headers["Content-Disposition"].split("filename=")[1].replace('"', "")
             except (KeyError, IndexError):
                 f_name = validate_name(str(PathExtended(response.history[-1].url).name if len(response.history) > 0 else PathExtended(response.url).name))
-        dest_path = (PathExtended.home().joinpath("Downloads") if folder is None else PathExtended(folder)).joinpath(f_name)
+        dest_folder = PathExtended.home().joinpath("Downloads") if folder is None else PathExtended(folder)
+        _stem, codec, is_tar = _split_archive_suffix(f_name)
+        if extract and (is_tar or codec is not None):
+            response.raw.decode_content = True  # undo any transport-level Content-Encoding, leaving the archive's own compression.
+            with response: return PathExtended(extract_stream(response.raw, archive_name=f_name, folder=dest_folder))
+        dest_path = dest_folder.joinpath(f_name)
         dest_path.parent.mkdir(parents=True, exist_ok=True)
-        dest_path.write_bytes(response.content)
+        with response, open(dest_path, "wb") as handle:
+            for chunk in response.iter_content(chunk_size=1024 ** 2): handle.write(chunk)
+        if extract and f_name.endswith(".zip"): return dest_path.decompress()
         return dest_path
 
     def append(self, name: str = "", index: bool = False, suffix: Optional[str] = None, verbose: bool = True, **kwargs: Any) -> "PathExtended":
@@ -373,8 +557,8 @@ class PathExtended(type(Path()), Path):  # type: ignore # pylint: disable=E0241
             return "📍 Relative " + "'" + str(self) + "'"  # not much can be said about a relative path.
 
     # def to_str(self) -> str: return str(self)
-    def size(self, units: Literal["b", "kb", "mb", "gb"] = "mb") -> float:  # ===================================== File Specs ==========================================================================================
-        total_size = self.stat().st_size if self.is_file() else sum([item.stat().st_size for item in self.rglob("*") if item.is_file()])
+    def size(self, units: Literal["b", "kb", "mb", "gb"] = "mb", workers: int = 8, cache: bool = False) -> float:  # ===================================== File Specs ==========================================================================================
+        total_size = self.stat().st_size if self.is_file() else _directory_size(str(self.expanduser().resolve()), workers=workers, cache_path=DIR_SIZE_CACHE_PATH if cache else None)
         tmp: int
         match units:
             case "b":
@@ -464,19 +648,6 @@ class PathExtended(type(Path()), Path):  # type: ignore # pylint: disable=E0241
         exts: Optional[list[str]] = None,
         win_order: bool = False,
     ) -> list["PathExtended"]:
-        if isinstance(not_in, list):
-            filters_notin = [lambda x: all([str(a_not_in) not in str(x) for a_not_in in not_in])]  # type: ignore
-        else:
-            filters_notin = []
-        if isinstance(exts, list):
-            filters_extension = [lambda x: any([ext in x.name for ext in exts])]  # type: ignore
-        else:
-            filters_extension = []
-        filters_total = (filters_total or []) + filters_notin + filters_extension
-        if not files:
-            filters_total.append(lambda x: x.is_dir())
-        if not folders:
-            filters_total.append(lambda x: x.is_file())
         slf = self.expanduser().resolve()
         if ".zip" in str(slf) and compressed:  # the root (self) is itself a zip archive (as opposed to some search results are zip archives)
             import zipfile
@@ -487,39 +658,108 @@ class PathExtended(type(Path()), Path):  # type: ignore # pylint: disable=E0241
                 raw = list(root.iterdir())
             else:
                 raw = [root.joinpath(item) for item in zipfile.ZipFile(str(slf)).namelist()]
-            # res1 = raw.filter(lambda zip_path: fnmatch.fnmatch(zip_path.at, pattern))  # type: ignore
-            res1 = [item for item in raw if fnmatch.fnmatch(item.at, pattern)]
-            # return res1.filter(lambda x: (folders or x.is_file()) and (files or x.is_dir()))
+            res1 = [item for item in raw if fnmatch.fnmatch(item.at, pattern) and (exts is None or any(ext in item.name for ext in exts))]
             return [item for item in res1 if (folders or item.is_file()) and (files or item.is_dir())]  # type: ignore
-        elif dotfiles:
-            raw = slf.glob(pattern) if not r else self.rglob(pattern)
-        else:
-            from glob import glob
-
-            if r:
-                raw = glob(str(slf / "**" / pattern), recursive=r)
-            else:
-                raw = glob(str(slf.joinpath(pattern)))  # glob ignroes dot and hidden files
-        if ".zip" not in str(slf) and compressed:
-            filters_notin = [
-                PathExtended(comp_file).search(pattern=pattern, r=r, files=files, folders=folders, compressed=True, dotfiles=dotfiles, filters_total=filters_total, not_in=not_in, win_order=win_order) for comp_file in self.search("*.zip", r=r)
-            ]
-            from functools import reduce
-
-            # haha = List(filters_notin).reduce(func=lambda x, y: x + y)
-            haha = reduce(lambda x, y: x + y, filters_notin) if len(filters_notin) else []
-            raw = raw + haha  # type: ignore
-        processed = []
-        for item in raw:
-            item_ = PathExtended(item)
-            if all([afilter(item_) for afilter in filters_total]):
-                processed.append(item_)
+        processed = list(self.search_iter(pattern=pattern, r=r, files=files, folders=folders, compressed=compressed, dotfiles=dotfiles, filters_total=filters_total, not_in=not_in, exts=exts, workers=1, limit=None))
         if not win_order:
-            return list(processed)
+            return processed
         import re
 
         processed.sort(key=lambda x: [int(k) if k.isdigit() else k for k in re.split("([0-9]+)", string=x.stem)])
-        return list(processed)
+        return processed
+
+    def search_iter(
+        self,
+        pattern: str = "*",
+        r: bool = False,
+        files: bool = True,
+        folders: bool = True,
+        compressed: bool = False,
+        dotfiles: bool = False,
+        filters_total: Optional[list[Callable[[Any], bool]]] = None,
+        not_in: Optional[list[str]] = None,
+        exts: Optional[list[str]] = None,
+        workers: int = 1,
+        limit: Optional[int] = None,
+    ) -> Iterator["PathExtended"]:
+        """Streaming `search` on top of `os.scandir`: excluded folders are pruned during descent and the walk stops after `limit` hits.
+        A pattern with a slash (e.g. `sub/*.py`) is matched against the path relative to `self` with glob rules, anywhere below `self` when `r`.
+        With `workers > 1`, directories are scanned concurrently and results are yielded in completion order."""
+        import fnmatch
+        import glob
+        import re
+
+        slf = self.expanduser().resolve()
+        root_len = len(str(slf).rstrip(os.sep)) + 1
+        path_pattern = os.path.normcase(pattern).replace(os.sep, "/")
+        by_path = "/" in path_pattern.rstrip("/")
+        if by_path:
+            pattern_matches = re.compile(glob.translate(("**/" if r else "") + path_pattern, recursive=True, include_hidden=True)).match
+            max_depth = None if r or "**" in path_pattern else path_pattern.count("/")  # without `r`, `a/*/b` still has to look two folders down.
+        else:
+            pattern_matches = re.compile(fnmatch.translate(path_pattern)).match
+            max_depth = None if r else 0
+        show_hidden = dotfiles or pattern.startswith(".")
+        not_in_tuple = tuple(not_in) if not_in is not None else ()
+        exts_tuple = tuple(exts) if exts is not None else ()
+        extra_filters = filters_total or []
+
+        def matches(entry: os.DirEntry[str], is_dir: bool) -> bool:
+            if is_dir and not folders: return False
+            if not is_dir and not files: return False
+            subject = os.path.normcase(entry.path[root_len:]).replace(os.sep, "/") if by_path else os.path.normcase(entry.name)
+            if pattern_matches(subject) is None: return False
+            if exts_tuple and not any(ext in entry.name for ext in exts_tuple): return False
+            return True
+
+        def scan(directory: str, depth: int) -> tuple[list["PathExtended"], list[tuple[str, int]]]:
+            hits: list["PathExtended"] = []
+            sub_dirs: list[tuple[str, int]] = []
+            descend = max_depth is None or depth < max_depth
+            try:
+                with os.scandir(directory) as it:
+                    for entry in it:
+                        if not show_hidden and entry.name.startswith("."): continue
+                        if not_in_tuple and any(a_not_in in entry.path for a_not_in in not_in_tuple): continue  # prunes the whole subtree too.
+                        try: is_dir = entry.is_dir()
+                        except OSError: is_dir = False
+                        if descend and is_dir and not entry.is_symlink(): sub_dirs.append((entry.path, depth + 1))
+                        if compressed and not is_dir and entry.name.endswith(".zip"):
+                            hits.extend(PathExtended(entry.path).search(pattern=pattern, r=r, files=files, folders=folders, compressed=True, dotfiles=dotfiles, filters_total=filters_total, not_in=not_in, exts=exts))
+                        if not matches(entry, is_dir): continue
+                        item = PathExtended(entry.path)
+                        if all(a_filter(item) for a_filter in extra_filters): hits.append(item)
+            except (PermissionError, FileNotFoundError, NotADirectoryError):
+                pass
+            return hits, sub_dirs
+
+        count = 0
+        if workers <= 1:
+            stack = [(str(slf), 0)]
+            while stack:
+                hits, sub_dirs = scan(*stack.pop())
+                for hit in hits:
+                    yield hit
+                    count += 1
+                    if limit is not None and count >= limit: return
+                stack.extend(reversed(sub_dirs))
+            return
+        from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED, Future
+
+        pool = ThreadPoolExecutor(max_workers=workers)
+        try:
+            pending: set[Future[tuple[list["PathExtended"], list[tuple[str, int]]]]] = {pool.submit(scan, str(slf), 0)}
+            while pending:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    hits, sub_dirs = future.result()
+                    pending.update(pool.submit(scan, a_dir, depth) for a_dir, depth in sub_dirs)
+                    for hit in hits:
+                        yield hit
+                        count += 1
+                        if limit is not None and count >= limit: return
+        finally:
+            pool.shutdown(wait=False, cancel_futures=True)
 
     @staticmethod
     def tmpdir(prefix: str = "") -> "PathExtended":
@@ -677,12 +917,47 @@ class PathExtended(type(Path()), Path):  # type: ignore # pylint: disable=E0241
                 print("P._return warning: UnicodeEncodeError, could not print message.")
         return ret
 
-    def untar(self, folder: OPLike = None, name: Optional[str] = None, path: OPLike = None, inplace: bool = False, orig: bool = False, verbose: bool = True) -> "PathExtended":
-        op_path = self._resolve_path(folder, name, path, self.name.replace(".tar", "")).expanduser().resolve()
+    def tar_zst(self, path: OPLike = None, folder: OPLike = None, name: Optional[str] = None, level: int = 3, threads: int = -1, inplace: bool = False, verbose: bool = True, orig: bool = False) -> "PathExtended":
+        """Stream `self` into a `.tar.zst` archive: tar members are piped straight into a multithreaded zstd writer, no intermediate tar is made.
+        `threads=-1` uses all cores."""
         import tarfile
+        import zstandard
 
-        with tarfile.open(str(self.expanduser().resolve()), "r") as tf:
-            tf.extractall(path=str(op_path))
+        slf = self.expanduser().resolve()
+        op_path = self._resolve_path(folder, name, path, slf.name).expanduser().resolve()
+        op_path = op_path if str(op_path).endswith(".tar.zst") else PathExtended(str(op_path) + ".tar.zst")
+        op_path.parent.mkdir(parents=True, exist_ok=True)
+        compressor = zstandard.ZstdCompressor(level=level, threads=threads)
+        with open(op_path, "wb") as raw_file, compressor.stream_writer(raw_file, closefd=False) as zst_stream, tarfile.open(fileobj=zst_stream, mode="w|") as tar:
+            tar.add(str(slf), arcname=slf.name)
+        msg = f"TAR.ZSTED {repr(slf)} ==>  {repr(op_path)}"
+        ret = self if orig else op_path
+        if inplace:
+            self.delete(sure=True, verbose=False)
+            msg += f"\nDELETED 🗑️❌ {repr(self)}."
+        if verbose:
+            try:
+                print(msg)
+            except UnicodeEncodeError:
+                print("P._return warning: UnicodeEncodeError, could not print message.")
+        return ret
+
+    def untar_zst(self, folder: OPLike = None, name: Optional[str] = None, path: OPLike = None, workers: int = 8, inplace: bool = False, orig: bool = False, verbose: bool = True) -> "PathExtended":
+        return self.untar(folder=folder, name=name, path=path, inplace=inplace, orig=orig, verbose=verbose, workers=workers)
+
+    def untar(self, folder: OPLike = None, name: Optional[str] = None, path: OPLike = None, inplace: bool = False, orig: bool = False, verbose: bool = True, workers: int = 8) -> "PathExtended":
+        """Handles plain and compressed (gz, xz, bz2, zst) tarballs in one streaming pass, no decompressed tar is written to disk."""
+        import tarfile
+
+        stem, codec, _is_tar = _split_archive_suffix(self.name)
+        op_path = self._resolve_path(folder, name, path, stem).expanduser().resolve()
+        op_path.mkdir(parents=True, exist_ok=True)
+        with open(self.expanduser().resolve(), "rb") as raw_file:
+            reader = _decompressing_reader(raw_file, codec)
+            try:
+                with tarfile.open(fileobj=reader, mode="r|") as tar: _extract_tar_stream(tar=tar, destination=op_path, workers=workers)
+            finally:
+                if reader is not raw_file: reader.close()
         msg = f"UNTARRED {repr(self)} ==>  {repr(op_path)}"
         ret = self if orig else PathExtended(op_path)
         delayed_msg = ""
@@ -704,8 +979,10 @@ class PathExtended(type(Path()), Path):  # type: ignore # pylint: disable=E0241
     def ungz(self, folder: OPLike = None, name: Optional[str] = None, path: OPLike = None, inplace: bool = False, orig: bool = False, verbose: bool = True) -> "PathExtended":
         op_path = self._resolve_path(folder, name, path, self.name.replace(".gz", "")).expanduser().resolve()
         import gzip
+        import shutil
 
-        PathExtended(str(op_path)).write_bytes(gzip.decompress(PathExtended(str(self.expanduser().resolve())).read_bytes()))
+        with gzip.open(self.expanduser().resolve(), "rb") as source, open(op_path, "wb") as target:
+            shutil.copyfileobj(source, target, length=1024**2)
         msg = f"UNGZED {repr(self)} ==>  {repr(op_path)}"
         ret = self if orig else PathExtended(op_path)
         delayed_msg = ""
@@ -727,8 +1004,10 @@ class PathExtended(type(Path()), Path):  # type: ignore # pylint: disable=E0241
     def unxz(self, folder: OPLike = None, name: Optional[str] = None, path: OPLike = None, inplace: bool = False, orig: bool = False, verbose: bool = True) -> "PathExtended":
         op_path = self._resolve_path(folder, name, path, self.name.replace(".xz", "")).expanduser().resolve()
         import lzma
+        import shutil
 
-        PathExtended(str(op_path)).write_bytes(lzma.decompress(PathExtended(str(self.expanduser().resolve())).read_bytes()))
+        with lzma.open(self.expanduser().resolve(), "rb") as source, open(op_path, "wb") as target:
+            shutil.copyfileobj(source, target, length=1024**2)
         msg = f"UNXZED {repr(self)} ==>  {repr(op_path)}"
         ret = self if orig else PathExtended(op_path)
         delayed_msg = ""
@@ -750,8 +1029,10 @@ class PathExtended(type(Path()), Path):  # type: ignore # pylint: disable=E0241
     def unbz(self, folder: OPLike = None, name: Optional[str] = None, path: OPLike = None, inplace: bool = False, orig: bool = False, verbose: bool = True) -> "PathExtended":
         op_path = self._resolve_path(folder=folder, name=name, path=path, default_name=self.name.replace(".bz", "").replace(".tbz", ".tar")).expanduser().resolve()
         import bz2
+        import shutil
 
-        PathExtended(str(op_path)).write_bytes(bz2.decompress(PathExtended(str(self.expanduser().resolve())).read_bytes()))
+        with bz2.open(self.expanduser().resolve(), "rb") as source, open(op_path, "wb") as target:
+            shutil.copyfileobj(source, target, length=1024**2)
         msg = f"UNBZED {repr(self)} ==>  {repr(op_path)}"
         ret = self if orig else PathExtended(op_path)
         delayed_msg = ""
@@ -771,17 +1052,15 @@ class PathExtended(type(Path()), Path):  # type: ignore # pylint: disable=E0241
         return ret
 
     def decompress(self, folder: OPLike = None, name: Optional[str] = None, path: OPLike = None, inplace: bool = False, orig: bool = False, verbose: bool = True) -> "PathExtended":
-        if ".tar.gz" in str(self) or ".tgz" in str(self):
-            # res = self.ungz_untar(folder=folder, path=path, name=name, inplace=inplace, verbose=verbose, orig=orig)
-            return self.ungz(name=f"tmp_{randstr()}.tar", inplace=inplace).untar(folder=folder, name=name, path=path, inplace=True, orig=orig, verbose=verbose)  # this works for .tgz suffix as well as .tar.gz
-        elif ".gz" in str(self):
+        _stem, codec, is_tar = _split_archive_suffix(self.name)
+        if is_tar:
+            res = self.untar(folder=folder, name=name, path=path, inplace=inplace, orig=orig, verbose=verbose)
+        elif codec == "gz":
             res = self.ungz(folder=folder, path=path, name=name, inplace=inplace, verbose=verbose, orig=orig)
-        elif ".tar.bz" in str(self) or "tbz" in str(self):
-            res = self.unbz(name=f"tmp_{randstr()}.tar", inplace=inplace)
-            return res.untar(folder=folder, name=name, path=path, inplace=True, orig=orig, verbose=verbose)
-        elif ".tar.xz" in str(self):
-            # res = self.unxz_untar(folder=folder, path=path, name=name, inplace=inplace, verbose=verbose, orig=orig)
-            res = self.unxz(inplace=inplace).untar(folder=folder, name=name, path=path, inplace=True, orig=orig, verbose=verbose)
+        elif codec == "xz":
+            res = self.unxz(folder=folder, path=path, name=name, inplace=inplace, verbose=verbose, orig=orig)
+        elif codec == "bz2":
+            res = self.unbz(folder=folder, path=path, name=name, inplace=inplace, verbose=verbose, orig=orig)
         elif ".zip" in str(self):
             res = self.unzip(folder=folder, path=path, name=name, inplace=inplace, verbose=verbose, orig=orig)
         else:
@@ -836,11 +1115,16 @@ class PathExtended(type(Path()), Path):  # type: ignore # pylint: disable=E0241
                 print("P._return warning: UnicodeEncodeError, could not print message.")
         return ret
 
-    def zip_n_encrypt(self, key: Optional[bytes] = None, pwd: Optional[str] = None, inplace: bool = False, verbose: bool = True, orig: bool = False, content: bool = False) -> "PathExtended":
-        return self.zip(inplace=inplace, verbose=verbose, content=content).encrypt(key=key, pwd=pwd, verbose=verbose, inplace=True) if not orig else self
+    def zip_n_encrypt(self, key: Optional[bytes] = None, pwd: Optional[str] = None, inplace: bool = False, verbose: bool = True, orig: bool = False, content: bool = False, archive: ARCHIVE_FORMATS = "zip") -> "PathExtended":
+        if orig: return self
+        archived = self.tar_zst(inplace=inplace, verbose=verbose) if archive == "tar.zst" else self.zip(inplace=inplace, verbose=verbose, content=content)
+        return archived.encrypt(key=key, pwd=pwd, verbose=verbose, inplace=True)
 
     def decrypt_n_unzip(self, key: Optional[bytes] = None, pwd: Optional[str] = None, inplace: bool = False, verbose: bool = True, orig: bool = False) -> "PathExtended":
-        return self.decrypt(key=key, pwd=pwd, verbose=verbose, inplace=inplace).unzip(folder=None, inplace=True, content=False) if not orig else self
+        if orig: return self
+        decrypted = self.decrypt(key=key, pwd=pwd, verbose=verbose, inplace=inplace)
+        if str(decrypted).endswith(".tar.zst"): return decrypted.untar_zst(inplace=True, verbose=verbose)
+        return decrypted.unzip(folder=None, inplace=True, content=False)
 
     def _resolve_path(self, folder: OPLike, name: Optional[str], path: OPLike, default_name: str, rel2it: bool = False) -> "PathExtended":
         """:param rel2it: `folder` or `path` are relative to `self` as opposed to cwd. This is used when resolving '../dir'"""
@@ -3,12 +3,175 @@ from machineconfig.utils.options import choose_from_options
 from machineconfig.utils.source_of_truth import EXCLUDE_DIRS
 from rich.console import Console
 from rich.panel import Panel
+from typing import Any, Iterator, Optional
+import hashlib
+import json
+import os
 import platform
-import subprocess
+import re
+import time
 from pathlib import Path
 
 
 console = Console()
+FILE_NAME_INDEX_DIR = Path.home().joinpath("tmp_results", "cache", "file_name_index")
+FILE_NAME_INDEX_MAX_FILES = 64  # one index per searched root, the least recently used ones beyond this are deleted.
+
+
+def _trigrams(text: str) -> set[str]:
+    return {text[idx:idx + 3] for idx in range(len(text) - 2)}
+
+
+class FileNameIndex:
+    """Names of all files under `root` (EXCLUDE_DIRS pruned), persisted per root under `FILE_NAME_INDEX_DIR`.
+    `refresh` re-lists only directories whose mtime changed, and a trigram index over lowercase file names answers substring queries without scanning every name.
+    Index files are touched on every load and pruned least recently used first beyond `FILE_NAME_INDEX_MAX_FILES`."""
+    def __init__(self, root: Path):
+        self.root = os.path.abspath(root)
+        self.path = FILE_NAME_INDEX_DIR.joinpath(hashlib.sha256(self.root.encode("utf-8")).hexdigest()[:16] + ".json")
+        self.dirs: dict[str, list[Any]] = {}  # relative dir ("" for root) -> [mtime_ns, file names, sub dir names]
+        self.name_dirs: dict[str, list[str]] = {}  # lowercase file name -> relative dirs holding it
+        self.trigrams: dict[str, set[str]] = {}  # trigram -> lowercase file names containing it
+        self.dirty = False
+        if self.path.exists():
+            try:
+                content = json.loads(self.path.read_text(encoding="utf-8"))
+                self.dirs, self.name_dirs = content["dirs"], content["name_dirs"]
+                self.trigrams = {gram: set(names) for gram, names in content["trigrams"].items()}
+            except (json.JSONDecodeError, KeyError, OSError):
+                self.dirs, self.name_dirs, self.trigrams = {}, {}, {}
+
+    @staticmethod
+    def load(root: Path) -> "FileNameIndex":
+        index = FileNameIndex(root=root)
+        index.refresh()
+        if index.dirty: index.save()
+        elif index.path.exists(): os.utime(index.path)
+        return index
+
+    def _add_name(self, rel_dir: str, name: str) -> None:
+        key = name.lower()
+        holders = self.name_dirs.setdefault(key, [])
+        if not holders:
+            for gram in _trigrams(key): self.trigrams.setdefault(gram, set()).add(key)
+        holders.append(rel_dir)
+
+    def _remove_name(self, rel_dir: str, name: str) -> None:
+        key = name.lower()
+        holders = self.name_dirs.get(key, [])
+        if rel_dir in holders: holders.remove(rel_dir)
+        if holders: return
+        self.name_dirs.pop(key, None)
+        for gram in _trigrams(key):
+            names = self.trigrams.get(gram)
+            if names is None: continue
+            names.discard(key)
+            if not names: del self.trigrams[gram]
+
+    def refresh(self) -> None:
+        """Directory mtimes change whenever an entry is added, removed or renamed in them, so unchanged directories are only stat'ed, never listed."""
+        exclude = set(EXCLUDE_DIRS)
+        seen: set[str] = set()
+        visited: set[tuple[int, int]] = set()  # (st_dev, st_ino) guards against symlink loops.
+        stack = [""]
+        while stack:
+            rel_dir = stack.pop()
+            try: stat = os.stat(os.path.join(self.root, rel_dir))
+            except OSError: continue
+            if (stat.st_dev, stat.st_ino) in visited: continue
+            visited.add((stat.st_dev, stat.st_ino))
+            seen.add(rel_dir)
+            cached = self.dirs.get(rel_dir)
+            if cached is None or cached[0] != stat.st_mtime_ns:
+                files: list[str] = []
+                sub_dirs: list[str] = []
+                try:
+                    with os.scandir(os.path.join(self.root, rel_dir)) as it:
+                        for entry in it:
+                            try:
+                                if entry.is_dir():
+                                    if entry.name not in exclude: sub_dirs.append(entry.name)
+                                elif entry.is_file(): files.append(entry.name)
+                            except OSError: continue
+                except OSError: pass
+                old_files = set(cached[1]) if cached is not None else set()
+                for name in old_files.difference(files): self._remove_name(rel_dir, name)
+                for name in set(files).difference(old_files): self._add_name(rel_dir, name)
+                cached = self.dirs[rel_dir] = [stat.st_mtime_ns, files, sub_dirs]
+                self.dirty = True
+            stack.extend(os.path.join(rel_dir, a_dir) for a_dir in reversed(cached[2]))
+        for rel_dir in set(self.dirs).difference(seen):
+            for name in self.dirs.pop(rel_dir)[1]: self._remove_name(rel_dir, name)
+            self.dirty = True
+
+    def save(self) -> None:
+        if not self.dirty: return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_suffix(f".{os.getpid()}.tmp")
+        tmp_path.write_text(json.dumps({"dirs": self.dirs, "name_dirs": self.name_dirs, "trigrams": {gram: list(names) for gram, names in self.trigrams.items()}}), encoding="utf-8")
+        os.replace(tmp_path, self.path)
+        self.dirty = False
+        prune_file_name_indexes(FILE_NAME_INDEX_MAX_FILES)
+
+    def iter_files(self, suffixes: Optional[set[str]] = None) -> Iterator[Path]:
+        for rel_dir, (_mtime, files, _sub_dirs) in self.dirs.items():
+            for name in files:
+                if suffixes is None or os.path.splitext(name)[1] in suffixes: yield Path(self.root, rel_dir, name)
+
+    def names_containing(self, sub_string: str) -> set[str]:
+        """Lowercase file names containing `sub_string` (case-insensitive), via trigram posting intersection."""
+        query = sub_string.lower()
+        grams = sorted((self.trigrams.get(gram, set()) for gram in _trigrams(query)), key=len)
+        candidates = set.intersection(*grams) if grams else self.name_dirs.keys()
+        return {name for name in candidates if query in name}
+
+    def find(self, sub_string: str, suffixes: set[str]) -> tuple[list[Path], list[Path]]:
+        """(file name matches, matches in the path relative to root only), both ranked best first."""
+        query = sub_string.lower()
+        filename_matches: list[Path] = []
+        for key in self.names_containing(sub_string):
+            for rel_dir in self.name_dirs[key]:
+                filename_matches.extend(Path(self.root, rel_dir, name) for name in self.dirs[rel_dir][1] if name.lower() == key and os.path.splitext(name)[1] in suffixes)
+        partial_path_matches: list[Path] = []
+        for rel_dir, (_mtime, files, _sub_dirs) in self.dirs.items():
+            rel_dir_posix = rel_dir.replace(os.sep, "/").lower()
+            for name in files:
+                if os.path.splitext(name)[1] not in suffixes or query in name.lower(): continue
+                if query in f"{rel_dir_posix}/{name.lower()}": partial_path_matches.append(Path(self.root, rel_dir, name))
+        def rank(a_path: Path) -> tuple[bool, bool, int, int]:
+            return (a_path.stem.lower() != query, sub_string not in a_path.as_posix(), len(a_path.name), len(a_path.parts))
+        return sorted(filename_matches, key=rank), sorted(partial_path_matches, key=rank)
+
+    def fuzzy(self, sub_string: str, suffixes: set[str], limit: int) -> list[Path]:
+        """Paths (relative to root) that contain the characters of `sub_string` in order. Hits inside the file name rank first, then the tighter span, then shorter paths."""
+        pattern = re.compile(".*?".join(re.escape(char) for char in sub_string.lower()))
+        pattern_reversed = re.compile(".*?".join(re.escape(char) for char in reversed(sub_string.lower())))  # matched on the reversed path: the span closest to the file name.
+        scored: list[tuple[bool, int, int, Path]] = []
+        for a_path in self.iter_files(suffixes=suffixes):
+            rel_lower = os.path.relpath(a_path, self.root).lower()
+            match = pattern_reversed.search(rel_lower[::-1])
+            if match is None: continue
+            name_match = pattern.search(a_path.name.lower())
+            span = name_match.end() - name_match.start() if name_match is not None else match.end() - match.start()
+            scored.append((name_match is None, span, len(rel_lower), a_path))
+        scored.sort(key=lambda item: item[:3])
+        return [item[3] for item in scored[:limit]]
+
+
+def prune_file_name_indexes(max_files: int) -> list[Path]:
+    """Deletes all but the `max_files` most recently used index files, plus tmp files left behind by interrupted saves. Returns the deleted paths."""
+    if not FILE_NAME_INDEX_DIR.is_dir(): return []
+    indexes: list[tuple[float, Path]] = []
+    deleted: list[Path] = []
+    for a_path in FILE_NAME_INDEX_DIR.iterdir():
+        try: mtime = a_path.stat().st_mtime
+        except OSError: continue
+        if a_path.suffix == ".json": indexes.append((mtime, a_path))
+        elif a_path.suffix == ".tmp" and mtime < time.time() - 3600: deleted.append(a_path)
+    indexes.sort(reverse=True)
+    deleted.extend(a_path for _mtime, a_path in indexes[max_files:])
+    for a_path in deleted: a_path.unlink(missing_ok=True)
+    return deleted
 
 
 def sanitize_path(a_path: str) -> PathExtended:
@@ -49,28 +212,15 @@ def sanitize_path(a_path: str) -> PathExtended:
 
 
 def find_scripts(root: Path, name_substring: str, suffixes: set[str]) -> tuple[list[Path], list[Path]]:
-    filename_matches = []
-    partial_path_matches = []
-    for entry in root.iterdir():
-        if entry.is_dir():
-            if entry.name in set(EXCLUDE_DIRS):
-                # prune this entire subtree
-                continue
-            tmp1, tmp2 = find_scripts(entry, name_substring, suffixes)
-            filename_matches.extend(tmp1)
-            partial_path_matches.extend(tmp2)
-        elif entry.is_file() and entry.suffix in suffixes:
-            if name_substring.lower() in entry.name.lower():
-                filename_matches.append(entry)
-            elif name_substring.lower() in entry.as_posix().lower():
-                partial_path_matches.append(entry)
-    return filename_matches, partial_path_matches
+    """Served from the `FileNameIndex` of `root`, which is brought up to date first (only directories that changed are re-listed)."""
+    return FileNameIndex.load(root).find(name_substring, suffixes)
 
 
 def match_file_name(sub_string: str, search_root: PathExtended, suffixes: set[str]) -> PathExtended:
     search_root_obj = search_root.absolute()
+    index = FileNameIndex.load(search_root_obj)  # loaded (and refreshed) once, reused by the fuzzy fallback below.
     # assume subscript is filename only, not a sub_path. There is no need to fzf over the paths.
-    filename_matches, partial_path_matches = find_scripts(search_root_obj, sub_string, suffixes)
+    filename_matches, partial_path_matches = index.find(sub_string, suffixes)
     if len(filename_matches) == 1:
         return PathExtended(filename_matches[0])
     console.print(Panel(f"Partial filename {search_root_obj} match with case-insensitivity failed. This generated #{len(filename_matches)} results.", title="Search", expand=False))
@@ -98,26 +248,14 @@ def match_file_name(sub_string: str, search_root: PathExtended, suffixes: set[st
         if len(reduced_scripts) == 1:
             return PathExtended(reduced_scripts[0])
         print(f"Result: This still generated {len(reduced_scripts)} results.")
-    try:
-        fzf_cmd = f"cd '{search_root_obj}'; fd --type file --strip-cwd-prefix | fzf --ignore-case --exact --query={sub_string}"
-        console.print(Panel(f"🔍 Second attempt: SEARCH STRATEGY | Using fd to search for '{sub_string}' in '{search_root_obj}' ...\n{fzf_cmd}", title="Search Strategy", expand=False))
-        search_res_raw = subprocess.run(fzf_cmd, stdout=subprocess.PIPE, text=True, check=True, shell=True).stdout
-        search_res = search_res_raw.strip().split("\\n")[:-1]
-    except subprocess.CalledProcessError as cpe:
-        console.print(Panel(f"❌ ERROR | FZF search failed with '{sub_string}' in '{search_root_obj}'.\n{cpe}", title="Error", expand=False))
+    search_res = index.fuzzy(sub_string, suffixes=suffixes, limit=200)
+    console.print(Panel(f"🔍 Second attempt: SEARCH STRATEGY | Fuzzy matching '{sub_string}' against indexed paths in '{search_root_obj}' ...", title="Search Strategy", expand=False))
+    if len(search_res) == 0:
         import sys
 
         sys.exit(f"💥 FILE NOT FOUND | Path {sub_string} does not exist @ root {search_root_obj}. No search results.")
     if len(search_res) == 1:
-        return search_root_obj.joinpath(search_res_raw)
-
-    print(f"⚠️ WARNING | Multiple search results found for `{sub_string}`:\n'{search_res}'")
-    cmd = f"cd '{search_root_obj}'; fd --type file | fzf --select-1 --query={sub_string}"
-    console.print(Panel(f"🔍 SEARCH STRATEGY | Trying with raw fzf search ...\n{cmd}", title="Search Strategy", expand=False))
-    try:
-        res = subprocess.run(cmd, check=True, stdout=subprocess.PIPE, text=True, shell=True).stdout.strip()
-    except subprocess.CalledProcessError as cpe:
-        console.print(Panel(f"❌ ERROR | FZF search failed with '{sub_string}' in '{search_root_obj}'. {cpe}", title="Error", expand=False))
-        msg = Panel(f"💥 FILE NOT FOUND | Path {sub_string} does not exist @ root {search_root_obj}. No search results", title="File Not Found", expand=False)
-        raise FileNotFoundError(msg) from cpe
-    return search_root_obj.joinpath(res)
+        return PathExtended(search_res[0])
+    print(f"⚠️ WARNING | Multiple search results found for `{sub_string}`:\n'{[a_path.as_posix() for a_path in search_res[:10]]}'")
+    choice = choose_from_options(multi=False, msg="Multiple fuzzy matches found", options=search_res, fzf=True)
+    return PathExtended(choice)
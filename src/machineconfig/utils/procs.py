@@ -3,14 +3,18 @@
 import psutil
 from rich.progress import Progress, SpinnerColumn, TextColumn
 from machineconfig.utils.options import choose_from_options
-from typing import Optional, TypedDict, List, Dict
+from typing import TYPE_CHECKING, Any, Literal, Optional, TypedDict, List, Dict
 from rich.console import Console
 from rich.panel import Panel
 from datetime import datetime
 from machineconfig.utils.accessories import pprint
 
+if TYPE_CHECKING:
+    import polars as pl
+
 console = Console()
 
+SNAPSHOT_ATTRS = ["pid", "name", "username", "memory_info", "status", "create_time", "cmdline", "cpu_percent"]  # read by `process_iter` inside `oneshot()`.
 BOX_WIDTH = 78  # width for box drawing
 
 
@@ -32,28 +36,103 @@ class FileAccessInfo(TypedDict):
     files: List[str]
 
 
-def get_processes_accessing_file(path: str) -> List[FileAccessInfo]:
-    # header for searching processes
-    title = "🔍  SEARCHING FOR PROCESSES ACCESSING FILE"
-    console.print(Panel(title, title="[bold blue]Process Info[/bold blue]", border_style="blue"))
-    res: Dict[int, List[str]] = {}
+class FileHandleIndex:
+    """Absolute path -> pids of processes holding it open. On Linux the `/proc/<pid>/fd` links are read in a thread pool, elsewhere psutil `open_files()` is used.
+    `refresh()` re-scans only pids that are new or whose start time changed (i.e. pid reuse) and drops exited ones, so files opened since the last scan
+    by an already indexed process are only seen after `refresh(full=True)`."""
+    def __init__(self, workers: int = 16):
+        self.workers = workers
+        self.pid_files: dict[int, tuple[float, list[str]]] = {}  # pid -> (start time, open paths)
+        self.path_pids: dict[str, set[int]] = {}
+        self.sorted_paths: list[str] = []
+        self.rescanned_pids = 0  # pids whose handles were read by the last refresh.
+        self.refresh(full=True)
+
+    @staticmethod
+    def _start_times() -> dict[int, float]:
+        import os
+        if not os.path.isdir("/proc/self/fd"):
+            return {proc.info["pid"]: proc.info["create_time"] for proc in psutil.process_iter(attrs=["pid", "create_time"], ad_value=0.0)}
+        start_times: dict[int, float] = {}
+        for entry in os.listdir("/proc"):
+            if not entry.isdigit(): continue
+            try:
+                with open(f"/proc/{entry}/stat", "rb") as f: stat = f.read()
+            except OSError: continue
+            start_times[int(entry)] = float(stat[stat.rfind(b")") + 2:].split()[19])  # field 22 (starttime), counted after the `(comm)` field which may contain spaces.
+        return start_times
+
+    @staticmethod
+    def _open_paths(pid: int) -> list[str]:
+        import os
+        fd_dir = f"/proc/{pid}/fd"
+        if not os.path.isdir("/proc/self/fd"):
+            try: return [a_file.path for a_file in psutil.Process(pid).open_files()]
+            except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess): return []
+        paths: list[str] = []
+        try: fds = os.listdir(fd_dir)
+        except OSError: return []
+        for fd in fds:
+            try: target = os.readlink(f"{fd_dir}/{fd}")
+            except OSError: continue
+            if target.startswith("/"): paths.append(target)  # skips `socket:[..]`, `pipe:[..]` and `anon_inode:..`.
+        return paths
+
+    def refresh(self, full: bool = False) -> None:
+        from concurrent.futures import ThreadPoolExecutor
+        start_times = self._start_times()
+        stale = [pid for pid in self.pid_files if pid not in start_times or full or self.pid_files[pid][0] != start_times[pid]]
+        for pid in stale: del self.pid_files[pid]
+        to_scan = [pid for pid in start_times if pid not in self.pid_files]
+        with ThreadPoolExecutor(max_workers=self.workers) as pool:
+            for pid, paths in zip(to_scan, pool.map(self._open_paths, to_scan)): self.pid_files[pid] = (start_times[pid], paths)
+        self.rescanned_pids = len(to_scan)
+        if not stale and not to_scan: return
+        path_pids: dict[str, set[int]] = {}
+        for pid, (_start_time, paths) in self.pid_files.items():
+            for a_path in paths: path_pids.setdefault(a_path, set()).add(pid)
+        self.path_pids = path_pids
+        self.sorted_paths = sorted(path_pids)
 
+    def query(self, prefix: str) -> dict[str, set[int]]:
+        """Open paths equal to the absolute form of `prefix` (relative paths resolve against the cwd) or beneath it when it is a folder, found by bisecting
+        the sorted paths. Matching respects path components: `/a/b` matches `/a/b` and `/a/b/c`, never `/a/bc`."""
+        import bisect
+        import os
+        prefix = os.path.abspath(os.path.expanduser(prefix))
+        result: dict[str, set[int]] = {}
+        if prefix in self.path_pids: result[prefix] = self.path_pids[prefix]
+        under = prefix.rstrip(os.sep) + os.sep
+        for a_path in self.sorted_paths[bisect.bisect_left(self.sorted_paths, under):]:
+            if not a_path.startswith(under): break
+            result[a_path] = self.path_pids[a_path]
+        return result
+
+    def search(self, sub_string: str) -> dict[str, set[int]]:
+        """Open paths containing `sub_string` anywhere, a linear scan over the indexed paths."""
+        return {a_path: pids for a_path, pids in self.path_pids.items() if sub_string in a_path}
+
+
+def get_processes_accessing_files(paths: List[str], substring: bool = False) -> Dict[str, List[FileAccessInfo]]:
+    """Answers every query from one `FileHandleIndex` scan. Each path names a file, or a folder to match everything beneath it, and relative paths resolve
+    against the cwd (`FileHandleIndex.query`). With `substring=True` a path matches every open file whose path merely contains it (`FileHandleIndex.search`)."""
+    title = "🔍  SEARCHING FOR PROCESSES ACCESSING FILES"
+    console.print(Panel(title, title="[bold blue]Process Info[/bold blue]", border_style="blue"))
     with Progress(SpinnerColumn(), TextColumn("[progress.description]{task.description}")) as progress:
         progress.add_task("🔎 Scanning processes...", total=None)
+        index = FileHandleIndex()
+    results: Dict[str, List[FileAccessInfo]] = {}
+    for path in paths:
+        res: Dict[int, List[str]] = {}
+        for a_path, pids in (index.search(path) if substring else index.query(path)).items():
+            for pid in pids: res.setdefault(pid, []).append(a_path)
+        results[path] = [{"pid": pid, "files": files} for pid, files in res.items()]
+        console.print(Panel(f"✅ Found {len(res)} processes accessing `{path}`", title="[bold blue]Process Info[/bold blue]", border_style="blue"))
+    return results
 
-        for proc in psutil.process_iter():
-            try:
-                files = proc.open_files()
-            except psutil.AccessDenied:
-                continue
-            tmp = [file.path for file in files if path in file.path]
-            if len(tmp) > 0:
-                res[proc.pid] = tmp
 
-    # Convert to list of dictionaries for consistent data structure
-    result_data: List[FileAccessInfo] = [{"pid": pid, "files": files} for pid, files in res.items()]
-    console.print(Panel(f"✅ Found {len(res)} processes accessing the specified file", title="[bold blue]Process Info[/bold blue]", border_style="blue"))
-    return result_data
+def get_processes_accessing_file(path: str, substring: bool = False) -> List[FileAccessInfo]:
+    return get_processes_accessing_files(paths=[path], substring=substring)[path]
 
 
 def kill_process(name: str):
@@ -69,39 +148,121 @@ def kill_process(name: str):
     console.rule(style="dim")
 
 
+PROC_STATUSES = {"R": "running", "S": "sleeping", "D": "disk-sleep", "T": "stopped", "t": "tracing-stop", "Z": "zombie", "X": "dead", "x": "dead", "K": "wake-kill",
+                 "W": "waking", "P": "parked", "I": "idle"}  # the values of psutil's STATUS_* constants, by `/proc/<pid>/stat` state letter.
+
+
+def _read_proc_stat(pid: str) -> Optional[tuple[str, str, float, int]]:
+    """(comm, state letter, utime + stime in clock ticks, starttime in clock ticks) from `/proc/<pid>/stat`, None if the process is gone."""
+    try:
+        with open(f"/proc/{pid}/stat", "rb") as f: stat = f.read()
+    except OSError: return None
+    close = stat.rfind(b")")
+    fields = stat[close + 2:].split()  # fields from 3 (state) on, `comm` may contain spaces and parentheses.
+    return stat[stat.find(b"(") + 1:close].decode(errors="replace"), fields[0].decode(), float(int(fields[11]) + int(fields[12])), int(fields[19])
+
+
+def _snapshot_proc(cpu_interval: float) -> List[ProcessInfo]:
+    """Linux: three reads per process (`stat`, `statm`, `cmdline`) plus one `stat()` of its /proc folder for the owner, instead of psutil's per-attribute files."""
+    import os
+    import pwd
+    import time
+    clock_ticks, page_size, boot_time = os.sysconf("SC_CLK_TCK"), os.sysconf("SC_PAGE_SIZE"), psutil.boot_time()
+    users: dict[int, str] = {}
+    rows: list[tuple[str, tuple[str, str, float, int], int, str, list[str]]] = []
+    started = time.monotonic()
+    for pid in os.listdir("/proc"):
+        if not pid.isdigit(): continue
+        stat = _read_proc_stat(pid)
+        if stat is None: continue
+        try:
+            uid = os.stat(f"/proc/{pid}").st_uid
+            with open(f"/proc/{pid}/statm", "rb") as f: rss = int(f.read().split()[1]) * page_size
+            with open(f"/proc/{pid}/cmdline", "rb") as f: cmdline = [part.decode(errors="replace") for part in f.read().split(b"\0")]
+        except (OSError, IndexError, ValueError): continue
+        while cmdline and cmdline[-1] == "": cmdline.pop()
+        if uid not in users:
+            try: users[uid] = pwd.getpwuid(uid).pw_name
+            except KeyError: users[uid] = str(uid)
+        rows.append((pid, stat, rss, users[uid], cmdline))
+    cpu_percent: dict[str, float] = {}
+    if cpu_interval > 0:
+        time.sleep(cpu_interval)
+        elapsed = time.monotonic() - started
+        for pid, (_comm, _state, ticks, start_ticks), *_rest in rows:
+            later = _read_proc_stat(pid)
+            if later is not None and later[3] == start_ticks: cpu_percent[pid] = round((later[2] - ticks) / clock_ticks / elapsed * 100, 1)
+    process_info: List[ProcessInfo] = []
+    for pid, (comm, state, _ticks, start_ticks), rss, username, cmdline in rows:
+        name = comm
+        if len(comm) >= 15 and cmdline:  # the kernel truncates comm to 15 characters, psutil recovers the full name from the command line the same way.
+            exe_name = os.path.basename(cmdline[0])
+            if exe_name.startswith(comm): name = exe_name
+        process_info.append({"pid": int(pid), "name": name, "username": username, "cpu_percent": cpu_percent.get(pid, 0.0), "memory_usage_mb": rss / (1024 * 1024),
+                             "status": PROC_STATUSES.get(state, state), "create_time": datetime.fromtimestamp(boot_time + start_ticks / clock_ticks, tz=None),
+                             "command": " ".join(cmdline)})
+    return process_info
+
+
+def snapshot_processes(cpu_interval: float) -> List[ProcessInfo]:
+    """One sweep over all processes, then a second cpu sample after `cpu_interval` seconds shared by all of them (a single sample can only ever give 0.0).
+    With `cpu_interval <= 0` the second sample is skipped. On Linux `/proc` is read directly, elsewhere one `process_iter(attrs=...)` sweep (`oneshot()`) is used."""
+    import os
+    if os.path.isdir("/proc/self/fd"): return _snapshot_proc(cpu_interval=cpu_interval)
+    sampled: list[tuple[psutil.Process, dict[str, Any]]] = [(proc, proc.info) for proc in psutil.process_iter(attrs=SNAPSHOT_ATTRS, ad_value=None)]
+    if cpu_interval > 0:
+        import time
+        time.sleep(cpu_interval)
+        for proc, info in sampled:
+            try: info["cpu_percent"] = proc.cpu_percent(interval=None)
+            except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess): pass
+    process_info: List[ProcessInfo] = []
+    for _proc, info in sampled:
+        if info["create_time"] is None: continue  # the process vanished or is fully inaccessible.
+        process_info.append({
+            "pid": info["pid"],
+            "name": info["name"] or "",
+            "username": info["username"] or "",
+            "cpu_percent": info["cpu_percent"] or 0.0,
+            "memory_usage_mb": info["memory_info"].rss / (1024 * 1024) if info["memory_info"] is not None else 0.0,
+            "status": info["status"] or "",
+            "create_time": datetime.fromtimestamp(info["create_time"], tz=None),
+            "command": " ".join(info["cmdline"] or []),
+        })
+    return process_info
+
+
 class ProcessManager:
-    def __init__(self):
+    def __init__(self, cpu_interval: float = 0.2):
         # header for initializing process manager
         title = "📊  INITIALIZING PROCESS MANAGER"
         console.print(Panel(title, title="[bold blue]Process Info[/bold blue]", border_style="blue"))
-        process_info: List[ProcessInfo] = []
         with Progress(SpinnerColumn(), TextColumn("[progress.description]{task.description}")) as progress:
             progress.add_task("🔍 Reading system processes...", total=None)
-            for proc in psutil.process_iter():
-                try:
-                    mem_usage_mb = proc.memory_info().rss / (1024 * 1024)
-                    create_time = datetime.fromtimestamp(proc.create_time(), tz=None)
-
-                    process_info.append(
-                        {
-                            "pid": proc.pid,
-                            "name": proc.name(),
-                            "username": proc.username(),
-                            "cpu_percent": proc.cpu_percent(),
-                            "memory_usage_mb": mem_usage_mb,
-                            "status": proc.status(),
-                            "create_time": create_time,
-                            "command": " ".join(proc.cmdline()),
-                        }
-                    )
-                except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess):
-                    pass
-
+            process_info = snapshot_processes(cpu_interval=cpu_interval)
         # Sort by memory usage (descending)
         process_info.sort(key=lambda x: x["memory_usage_mb"], reverse=True)
         self.data = process_info
+        self._table: Optional["pl.DataFrame"] = None
         console.print(Panel(f"✅ Process Manager initialized with {len(process_info)} processes", title="[bold blue]Process Info[/bold blue]", border_style="blue"))
 
+    def table(self) -> Optional["pl.DataFrame"]:
+        """Columnar view of `self.data` (row order preserved) used for filtering, or None when polars is not installed."""
+        if self._table is None:
+            try: import polars as pl
+            except ImportError: return None
+            self._table = pl.DataFrame(self.data, schema={"command": pl.String, "pid": pl.Int64, "name": pl.String, "username": pl.String, "cpu_percent": pl.Float64,
+                                                          "memory_usage_mb": pl.Float64, "status": pl.String, "create_time": pl.Datetime}).with_row_index("row")
+        return self._table
+
+    def select(self, column: Literal["name", "command"], value: str, exact: bool) -> List[ProcessInfo]:
+        """Processes whose `column` equals (`exact`) or contains `value`, filtered with a vectorized expression when polars is available."""
+        table = self.table()
+        if table is None: return [p for p in self.data if (p[column] == value if exact else value in p[column])]
+        import polars as pl
+        expression = pl.col(column) == value if exact else pl.col(column).str.contains(value, literal=True)
+        return [self.data[row] for row in table.filter(expression).get_column("row").to_list()]
+
     def _format_process_table(self) -> str:
         """Format process data as table string for display."""
         if not self.data:
@@ -159,7 +320,7 @@ class ProcessManager:
         title = "🔍  FILTERING AND TERMINATING PROCESSES BY NAME"
         console.print(Panel(title, title="[bold blue]Process Info[/bold blue]", border_style="blue"))
         # Filter processes by name
-        filtered_processes = [p for p in self.data if p["name"] == name]
+        filtered_processes = self.select(column="name", value=name, exact=True) if name is not None else []
         # Sort by create_time (ascending)
         filtered_processes.sort(key=lambda x: x["create_time"])
         print(f"🎯 Found {len(filtered_processes)} processes matching name: '{name}'")
@@ -180,7 +341,7 @@ class ProcessManager:
             commands = []
         killed_count = 0
         for name in names:
-            matching_processes = [p for p in self.data if p["name"] == name]
+            matching_processes = self.select(column="name", value=name, exact=True)
             if len(matching_processes) > 0:
                 for process in matching_processes:
                     psutil.Process(process["pid"]).kill()
@@ -199,7 +360,7 @@ class ProcessManager:
             except psutil.NoSuchProcess:
                 print(f"❓ No process with PID {pid} found")
         for command in commands:
-            matching_processes = [p for p in self.data if command in p["command"]]
+            matching_processes = self.select(column="command", value=command, exact=False)
             if len(matching_processes) > 0:
                 for process in matching_processes:
                     psutil.Process(process["pid"]).kill()
@@ -0,0 +1,47 @@
+import shutil
+from pathlib import Path
+
+import pytest
+
+from machineconfig.scripts.python.helpers_devops import devops_backup_engine
+
+
+pytestmark = pytest.mark.skipif(shutil.which("rclone") is None, reason="rclone is not installed")
+
+
+@pytest.fixture()
+def items(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> dict[str, dict[str, str]]:
+    home, bucket = tmp_path.joinpath("home"), tmp_path.joinpath("bucket")
+    bucket.mkdir()
+    monkeypatch.setenv("HOME", str(home))
+    monkeypatch.setattr(devops_backup_engine, "BACKUP_MANIFEST_PATH", tmp_path.joinpath("manifest.json"))
+    monkeypatch.chdir(bucket)  # `:local:` remotes resolve relative to the daemon's working directory.
+    home.joinpath("notes", "sub").mkdir(parents=True)
+    home.joinpath("notes", "todo.md").write_text("- ship it", encoding="utf-8")
+    home.joinpath("notes", "sub", "ideas.md").write_text("- more", encoding="utf-8")
+    home.joinpath("archive").mkdir()
+    home.joinpath("archive", "old.txt").write_text("old", encoding="utf-8")
+    return {"notes": {"path": "~/notes", "zip": "False", "encrypt": "False", "rel2home": "True"},
+            "archive": {"path": "~/archive", "zip": "True", "encrypt": "False", "rel2home": "True"}}
+
+
+def _statuses(items: dict[str, dict[str, str]], force: bool = False) -> dict[str, str]:
+    reports = devops_backup_engine.run_backup(items=items, cloud=":local", jobs=2, bwlimit=None, force=force)
+    return {report.name: report.status for report in reports}
+
+
+def test_second_run_over_unchanged_items_uploads_nothing(items: dict[str, dict[str, str]], tmp_path: Path) -> None:
+    assert _statuses(items) == {"notes": "uploaded", "archive": "uploaded"}
+    uploaded = tmp_path.joinpath("bucket", "myhome", "generic_os", "archive.zip")
+    mtime_ns = uploaded.stat().st_mtime_ns
+    assert _statuses(items) == {"notes": "unchanged", "archive": "unchanged"}
+    assert uploaded.stat().st_mtime_ns == mtime_ns
+
+
+def test_content_change_or_force_reuploads(items: dict[str, dict[str, str]], tmp_path: Path) -> None:
+    _statuses(items)
+    tmp_path.joinpath("home", "notes", "sub", "ideas.md").write_text("- changed", encoding="utf-8")
+    assert _statuses(items) == {"notes": "uploaded", "archive": "unchanged"}
+    assert tmp_path.joinpath("bucket", "myhome", "generic_os", "notes", "sub", "ideas.md").read_text(encoding="utf-8") == "- changed"
+    assert _statuses(items, force=True) == {"notes": "uploaded", "archive": "uploaded"}
+    assert _statuses(items) == {"notes": "unchanged", "archive": "unchanged"}
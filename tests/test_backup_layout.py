@@ -0,0 +1,20 @@
+from pathlib import Path
+
+import pytest
+
+from machineconfig.scripts.python.helpers_cloud.cloud_helpers import Args
+from machineconfig.scripts.python.helpers_cloud.helpers2 import ES, parse_cloud_source_target
+from machineconfig.scripts.python.helpers_devops.devops_backup_engine import get_remote_target
+
+
+@pytest.mark.parametrize("item", [
+    {"path": "~/.thunderbird", "zip": "True", "encrypt": "True", "rel2home": "True"},
+    {"path": "~/dotfiles", "zip": "False", "encrypt": "True", "rel2home": "True"},
+    {"path": "/opt/shared/notes", "zip": "True", "encrypt": "False", "rel2home": "False"},
+])
+def test_backup_target_matches_retrieve_source(item: dict[str, str], tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setenv("HOME", str(tmp_path))
+    rel2home = item["rel2home"] == "True"
+    args = Args(zip=item["zip"] == "True", encrypt=item["encrypt"] == "True", rel2home=rel2home, root="myhome" if rel2home else None)  # what `cloud_copy $cloud <path> -zer` builds.
+    _cloud, source, _target = parse_cloud_source_target(args=args, source=f"mycloud:{ES}", target=item["path"])
+    assert f"mycloud:{get_remote_target(item)}" == source
@@ -0,0 +1,25 @@
+import pickle
+import sqlite3
+from pathlib import Path
+
+from machineconfig.utils.files import dbms
+
+
+def test_legacy_table_without_kind_is_migrated(tmp_path: Path) -> None:
+    path = tmp_path / "data.sqlite"
+    conn = sqlite3.connect(path)
+    conn.execute('CREATE TABLE "legacy" (time INT PRIMARY KEY, idx INT, idx_max INT, data BLOB)')
+    conn.execute('INSERT INTO "legacy" VALUES (1, 0, 2, ?)', (pickle.dumps([1, 2]),))
+    conn.commit()
+    conn.close()
+    dbms.to_db("legacy", 1, 2, {"a": 1}, path=path)
+    assert dbms.from_db("legacy", path=path)["data"].to_list() == [[1, 2], {"a": 1}]
+
+
+def test_from_db_mixed_payloads(tmp_path: Path) -> None:
+    path = tmp_path / "data.sqlite"
+    dbms.to_db("mixed", 0, 1, [1, 2], path=path)
+    dbms.to_db("mixed", 1, 1, {"x": 1}, path=path)
+    df = dbms.from_db("mixed", path=path)
+    assert df["idx"].to_list() == [0, 1]
+    assert df["data"].to_list() == [[1, 2], {"x": 1}]
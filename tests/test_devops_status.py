@@ -0,0 +1,43 @@
+import os
+import subprocess
+import sys
+import textwrap
+import time
+from pathlib import Path
+
+import machineconfig
+
+
+HUNG_CHECKS = """
+import threading
+from pathlib import Path
+from machineconfig.scripts.python.helpers_devops import devops_status
+
+def hang(*args, **kwargs):
+    threading.Event().wait()
+
+devops_status.CHECK_TIMEOUT_SECONDS = {{name: 1.0 for name in devops_status.CHECK_TIMEOUT_SECONDS}}
+devops_status.DEFAULTS_PATH = Path({defaults!r})
+devops_status.REPOS_STATUS_CACHE_PATH = Path({cache!r})
+devops_status._check_ssh_status = hang
+devops_status._repo_status = hang  # hangs inside the repos check's own fan-out.
+devops_status.main()
+print("MAIN RETURNED")
+"""
+
+
+def test_hung_checks_do_not_keep_the_process_alive(tmp_path: Path) -> None:
+    defaults = tmp_path.joinpath("defaults.ini")
+    defaults.write_text(f"[general]\nrepos = {tmp_path.joinpath('repo')}\n", encoding="utf-8")
+    script = textwrap.dedent(HUNG_CHECKS).format(defaults=str(defaults), cache=str(tmp_path.joinpath("repos_status.json")))
+    src = str(Path(machineconfig.__path__[0]).parent)
+    env = {**os.environ, "HOME": str(tmp_path), "COLUMNS": "200", "PYTHONPATH": os.pathsep.join([src, os.environ.get("PYTHONPATH", "")])}
+    start = time.monotonic()
+    completed = subprocess.run([sys.executable, "-c", script], capture_output=True, text=True, env=env, timeout=60)
+    elapsed = time.monotonic() - start
+    assert completed.returncode == 0, completed.stderr
+    assert "MAIN RETURNED" in completed.stdout
+    assert "`ssh` check did not finish" in completed.stdout
+    assert "`repos` check did not finish" in completed.stdout
+    assert "Status report complete!" in completed.stdout
+    assert elapsed < 30, f"process took {elapsed:.1f}s to exit"
@@ -0,0 +1,47 @@
+import tracemalloc
+from pathlib import Path
+
+import pytest
+
+from machineconfig.scripts.python.helpers_fire.fire_agents_load_balancer import READ_CHUNK_BYTES, bytes_tokenizer, chunk_prompts, iter_prompts
+
+
+JOINER = "\n@-@\n"
+
+
+def _max_over_mean(paths: list[Path]) -> float:
+    loads = [sum(bytes_tokenizer(item.decode("utf-8")) for item in iter_prompts(path, JOINER)) for path in paths]
+    return max(loads) / (sum(loads) / len(loads))
+
+
+@pytest.mark.parametrize("max_tokens", [None, 20_000])
+def test_few_heavy_prompts_do_not_skew_agents(tmp_path: Path, max_tokens: int | None) -> None:
+    """Three 40 KB prompts among 2000 one-liners used to give 155 agents at max/mean 40.9, the agent count now follows the token weight."""
+    prompts = [f"heavy {idx} " + "x" * 40_000 for idx in range(3)] + [f"fix item {idx}" for idx in range(2000)]
+    source = tmp_path.joinpath("todo.md")
+    source.write_text(JOINER.join(prompts), encoding="utf-8")
+    paths = chunk_prompts(source, JOINER, tasks_per_prompt=13, max_tokens_per_agent=max_tokens, tokenizer=bytes_tokenizer, output_dir=tmp_path.joinpath("agents"))
+    assert 1 < len(paths) <= 4
+    assert _max_over_mean(paths) < 1.2
+    written = [item.decode("utf-8") for path in paths for item in iter_prompts(path, JOINER)]
+    assert sorted(written) == sorted(prompts)
+    for path in paths:  # each agent keeps the source order of its entries.
+        indices = [prompts.index(item.decode("utf-8")) for item in iter_prompts(path, JOINER)]
+        assert indices == sorted(indices)
+
+
+def test_memory_stays_flat_in_the_material_size(tmp_path: Path) -> None:
+    source = tmp_path.joinpath("todo.md")
+    entry = "y" * 100_000
+    with open(source, "w", encoding="utf-8") as f:
+        for idx in range(500): f.write(f"{JOINER if idx else ''}task {idx} {entry}")
+    tracemalloc.start()
+    try: paths = chunk_prompts(source, JOINER, tasks_per_prompt=13, max_tokens_per_agent=None, tokenizer=bytes_tokenizer, output_dir=tmp_path.joinpath("agents"))
+    finally:
+        _current, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+    size = source.stat().st_size
+    print(f"\n{size / 1024 ** 2:.0f} MiB of material into {len(paths)} agents, peak python memory {peak / 1024 ** 2:.1f} MiB")
+    assert len(paths) == 39
+    assert sum(path.stat().st_size for path in paths) == size - (len(paths) - 1) * len(JOINER)  # one separator fewer per extra agent.
+    assert peak < 8 * READ_CHUNK_BYTES < size / 5
@@ -0,0 +1,67 @@
+import json
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+from machineconfig.scripts.python.helpers_fire_command import fire_jobs_memo
+
+
+JOB = """
+import time
+from helper import factor
+
+
+def slow(x):
+    time.sleep({seconds})
+    print(f"slow result {{x * factor()}}")
+    return x * factor()
+"""
+
+
+@pytest.fixture()
+def project(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Path:
+    monkeypatch.setenv("HOME", str(tmp_path.joinpath("home")))
+    monkeypatch.setattr(fire_jobs_memo, "MEMO_ROOT", tmp_path.joinpath("memo"))
+    root = tmp_path.joinpath("project")
+    root.mkdir()
+    root.joinpath("helper.py").write_text("def factor():\n    return 2\n", encoding="utf-8")
+    return root
+
+
+def _run(job: Path) -> float:
+    start = time.perf_counter()
+    fire_jobs_memo.run_memoized(file_path=job, function="slow", fire_args="", kwargs={"x": 21}, repo_root=None, ve_root=None,
+                                activate_ve_line=f'export PATH="{Path(sys.executable).parent}:$PATH"', optimized=False)
+    return time.perf_counter() - start
+
+
+def _results() -> list[str]:
+    return sorted(json.loads(meta.read_text(encoding="utf-8"))["result_repr"] for meta in fire_jobs_memo.MEMO_ROOT.glob("*/*/meta.json"))
+
+
+def test_slow_job_runs_once_then_hits(project: Path, capfd: pytest.CaptureFixture[str]) -> None:
+    job = project.joinpath("job.py")
+    job.write_text(JOB.format(seconds=5), encoding="utf-8")
+    first = _run(job)
+    assert "memo miss" in capfd.readouterr().out
+    second = _run(job)
+    out = capfd.readouterr().out
+    print(f"\nfirst run {first:.2f}s, memo hit {second:.2f}s")
+    assert first >= 5 and second < 1
+    assert "memo hit" in out and "slow result 42" in out
+    assert _results() == ["42"]
+
+
+def test_editing_an_imported_helper_invalidates(project: Path, capfd: pytest.CaptureFixture[str]) -> None:
+    job = project.joinpath("job.py")
+    job.write_text(JOB.format(seconds=0), encoding="utf-8")
+    _run(job)
+    _run(job)
+    assert "memo hit" in capfd.readouterr().out
+    project.joinpath("helper.py").write_text("def factor():\n    return 3\n", encoding="utf-8")
+    _run(job)
+    out = capfd.readouterr().out
+    assert "memo miss" in out and "memo hit" not in out and "slow result 63" in out
+    assert _results() == ["42", "63"]
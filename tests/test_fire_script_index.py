@@ -0,0 +1,73 @@
+import os
+from pathlib import Path
+
+import pytest
+
+from machineconfig.scripts.python.helpers_fire import helpers4
+from machineconfig.utils.path_extended import PathExtended
+
+
+def _age(root: Path) -> None:
+    """Pushes every folder's mtime out of the racy window, as if the tree was last touched a minute ago."""
+    for dirpath, _dirnames, _filenames in os.walk(root):
+        os.utime(dirpath, ns=(os.stat(dirpath).st_atime_ns, os.stat(dirpath).st_mtime_ns - 60 * 10 ** 9))
+
+
+@pytest.fixture()
+def project(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Path:
+    monkeypatch.setattr(helpers4, "FIRE_INDEX_DIR", tmp_path.joinpath("index"))
+    root = tmp_path.joinpath("project")
+    root.joinpath("pkg", "deep").mkdir(parents=True)
+    root.joinpath(".venv").mkdir()
+    root.joinpath("main.py").write_text("def main(x: int = 1):\n    return x\n", encoding="utf-8")
+    root.joinpath("run.sh").write_text("echo hi\n", encoding="utf-8")
+    root.joinpath("pkg", "__init__.py").write_text("", encoding="utf-8")
+    root.joinpath("pkg", "deep", "job.py").write_text("def job():\n    pass\n", encoding="utf-8")
+    root.joinpath(".venv", "hidden.py").write_text("", encoding="utf-8")
+    root.joinpath("notes.txt").write_text("", encoding="utf-8")
+    _age(root)
+    return root
+
+
+def _names(files: list[PathExtended]) -> list[str]:
+    return [a_file.name for a_file in files]
+
+
+def test_unchanged_tree_is_served_from_the_index(project: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    first = helpers4.search_for_files_of_interest(PathExtended(project))
+    assert sorted(_names(first)) == ["job.py", "main.py", "run.sh"] and _names(first)[-1] == "run.sh"
+
+    def no_walk(root: str) -> tuple[list[str], dict[str, int]]:
+        raise AssertionError(f"walked {root} although no folder changed")
+    monkeypatch.setattr(helpers4, "_walk_scripts", no_walk)
+    assert helpers4.search_for_files_of_interest(PathExtended(project)) == first
+
+
+def test_adding_or_removing_a_script_invalidates_the_listing(project: Path) -> None:
+    helpers4.search_for_files_of_interest(PathExtended(project))
+    project.joinpath("pkg", "deep", "new.py").write_text("", encoding="utf-8")
+    assert "new.py" in _names(helpers4.search_for_files_of_interest(PathExtended(project)))
+    project.joinpath("run.sh").unlink()
+    _age(project)
+    assert sorted(_names(helpers4.search_for_files_of_interest(PathExtended(project)))) == ["job.py", "main.py", "new.py"]
+
+
+def test_recently_touched_folders_are_rescanned(project: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    helpers4.search_for_files_of_interest(PathExtended(project))
+    os.utime(project.joinpath("pkg"))  # a change in the same timestamp tick as the walk would leave the mtime as recorded.
+    walked: list[str] = []
+    real_walk = helpers4._walk_scripts
+    monkeypatch.setattr(helpers4, "_walk_scripts", lambda root: walked.append(root) or real_walk(root))
+    helpers4.search_for_files_of_interest(PathExtended(project))
+    assert walked == [os.path.realpath(project)]
+
+
+def test_listing_and_parsing_share_one_key(project: Path, tmp_path: Path) -> None:
+    link = tmp_path.joinpath("link")
+    link.symlink_to(project)
+    helpers4.search_for_files_of_interest(PathExtended(link))
+    options, _func_args = helpers4.parse_pyfile(str(link.joinpath("main.py")))
+    assert options[1].startswith("main -- x")
+    index = helpers4.ScriptIndex.for_path(str(project))
+    assert list(index.listings) == [os.path.realpath(project)]
+    assert list(index.entries) == [os.path.realpath(project.joinpath("main.py"))]
@@ -0,0 +1,32 @@
+import os
+from pathlib import Path
+
+import pytest
+
+import machineconfig
+from machineconfig.scripts.python.helpers_devops.import_budget import ENTRY_POINT_BUDGETS_MS, machine_factor, measure_import_ms, parse_importtime
+
+
+SRC = os.pathsep.join([str(Path(machineconfig.__path__[0]).parent), os.environ.get("PYTHONPATH", "")])  # the imports run in fresh interpreters.
+
+
+def test_parse_importtime_reads_the_cumulative_column() -> None:
+    stderr = "import time: self [us] | cumulative | imported package\nimport time:       120 |        340 |   json\nimport time:      2500 |      41000 | machineconfig.scripts.python.entry\n"
+    assert parse_importtime(stderr, "machineconfig.scripts.python.entry") == 41.0
+    with pytest.raises(ValueError): parse_importtime(stderr, "machineconfig.scripts.python.cloud")
+
+
+@pytest.fixture(scope="module")
+def factor() -> float:
+    with pytest.MonkeyPatch.context() as monkeypatch:
+        monkeypatch.setenv("PYTHONPATH", SRC)
+        return machine_factor(repeats=5)
+
+
+@pytest.mark.parametrize("module", list(ENTRY_POINT_BUDGETS_MS))
+def test_entry_point_import_budget(module: str, factor: float, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setenv("PYTHONPATH", SRC)
+    elapsed = measure_import_ms(module, repeats=5)
+    budget = ENTRY_POINT_BUDGETS_MS[module] * factor
+    print(f"\n{module}: {elapsed:.1f} ms (budget {budget:.0f} ms, x{factor:.2f} for this machine)")
+    assert elapsed <= budget
@@ -0,0 +1,60 @@
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+pytest.importorskip("jupyter_client")
+pytest.importorskip("ipykernel")
+
+from machineconfig.scripts.python.helpers_croshell import kernel_pool
+
+
+ENV = "--project fake"
+
+
+@pytest.fixture()
+def pool(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> kernel_pool.KernelPool:
+    monkeypatch.setattr(kernel_pool, "POOL_DIR", tmp_path.joinpath("pool"))
+    monkeypatch.setattr(kernel_pool, "WARMUP_CODE", "")
+    monkeypatch.setenv("IPYTHONDIR", str(tmp_path.joinpath("ipython")))
+    for profile, mark in (("default", "default"), ("croshell_test", "croshell_test")):
+        startup = tmp_path.joinpath("ipython", f"profile_{profile}", "startup")
+        startup.mkdir(parents=True)
+        startup.joinpath("00_mark.py").write_text(f"PROFILE_MARK = {mark!r}\n", encoding="utf-8")
+    pool = kernel_pool.KernelPool(size=0, idle_timeout=60)
+    kernel_pool.POOL_DIR.mkdir(parents=True)
+    pool.pythons[ENV] = sys.executable  # instead of resolving `uv run {ENV}`.
+    return pool
+
+
+def _profile_mark(connection_file: str) -> str:
+    from jupyter_client.blocking.client import BlockingKernelClient
+    client = BlockingKernelClient(connection_file=connection_file)
+    client.load_connection_file()
+    client.start_channels()
+    try:
+        client.wait_for_ready(timeout=60)
+        reply = client.execute_interactive("", user_expressions={"mark": "PROFILE_MARK"}, timeout=60, output_hook=lambda _msg: None)
+    finally:
+        client.stop_channels()
+    return reply["content"]["user_expressions"]["mark"]["data"]["text/plain"]
+
+
+def test_pooled_kernels_are_keyed_and_started_by_profile(pool: kernel_pool.KernelPool) -> None:
+    kernels = [pool.acquire(env=ENV, profile=profile, pid=1) for profile in ("default", "croshell_test")]
+    try:
+        assert [_profile_mark(kernel.connection_file) for kernel in kernels] == ["'default'", "'croshell_test'"]
+        assert kernel_pool.env_key(ENV, "default") != kernel_pool.env_key(ENV, "croshell_test")
+        specs = sorted(kernel_pool.POOL_DIR.joinpath("kernels").glob("*/kernel.json"))
+        assert len(specs) == 2 and any("--profile=croshell_test" in spec.read_text(encoding="utf-8") for spec in specs)
+    finally:
+        for kernel in kernels: pool.release(kernel.connection_file)
+
+
+def test_ensure_daemon_does_not_keep_the_log_open(pool: kernel_pool.KernelPool, monkeypatch: pytest.MonkeyPatch) -> None:
+    launched: list[object] = []
+    monkeypatch.setattr(kernel_pool, "DAEMON_START_TIMEOUT_SECONDS", 0.3)
+    monkeypatch.setattr(subprocess, "Popen", lambda *_args, **kwargs: launched.append(kwargs["stdout"]))
+    with pytest.raises(RuntimeError, match="did not start"): kernel_pool.ensure_daemon(uv_args=ENV, size=1, idle_timeout=60)
+    assert len(launched) == 1 and getattr(launched[0], "closed")
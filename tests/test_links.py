@@ -0,0 +1,78 @@
+import hashlib
+import os
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+from machineconfig.profile import create_links
+from machineconfig.utils import links
+from machineconfig.utils.links import HashManifest, plan_map
+from machineconfig.utils.path_extended import PathExtended
+
+
+@pytest.fixture()
+def hashes(tmp_path: Path) -> HashManifest:
+    return HashManifest(path=tmp_path.joinpath("hashes.json"))
+
+
+def test_plan_map_predicts_without_touching_disk(tmp_path: Path, hashes: HashManifest) -> None:
+    managed = tmp_path.joinpath("managed.conf")
+    managed.write_text("a", encoding="utf-8")
+    default = tmp_path.joinpath("default.conf")
+    assert plan_map(PathExtended(default), PathExtended(managed), method="symlink", on_conflict="throwError", hashes=hashes) == ({"action": "new_link", "details": "New symlink of existing self-managed config"}, True)
+    default.symlink_to(managed)
+    assert plan_map(PathExtended(default), PathExtended(managed), method="symlink", on_conflict="throwError", hashes=hashes)[0]["action"] == "already_linked"
+    default.unlink()
+    default.write_text("a", encoding="utf-8")
+    assert plan_map(PathExtended(default), PathExtended(managed), method="copy", on_conflict="throwError", hashes=hashes)[1] is False  # identical copy, nothing to do.
+    assert plan_map(PathExtended(default), PathExtended(managed), method="symlink", on_conflict="throwError", hashes=hashes)[1] is True
+    default.write_text("b", encoding="utf-8")
+    assert plan_map(PathExtended(default), PathExtended(managed), method="copy", on_conflict="backupDefaultPath", hashes=hashes)[0]["action"] == "backupConfigDefaultPath"
+    assert default.read_text(encoding="utf-8") == "b" and not default.is_symlink()
+
+
+def test_apply_mapper_dry_run_then_apply(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(create_links, "LINKS_HASH_MANIFEST_PATH", tmp_path.joinpath("hashes.json"))
+    monkeypatch.setattr(create_links, "CONFIG_ROOT", tmp_path.joinpath("config_root"))
+    managed, home = tmp_path.joinpath("managed"), tmp_path.joinpath("home")
+    managed.joinpath("nvim").mkdir(parents=True)
+    managed.joinpath("nvim", "init.lua").write_text("vim", encoding="utf-8")
+    managed.joinpath("nvim", "lazy.lua").write_text("lazy", encoding="utf-8")
+    managed.joinpath("gitconfig").write_text("[user]", encoding="utf-8")
+    home.mkdir()
+    mapper: dict[str, list[Any]] = {"editor": [
+        {"file_name": "nvim", "config_file_default_path": str(home.joinpath(".config", "nvim")), "self_managed_config_file_path": str(managed.joinpath("nvim")), "contents": True, "copy": None},
+        {"file_name": "git", "config_file_default_path": str(home.joinpath(".gitconfig")), "self_managed_config_file_path": str(managed.joinpath("gitconfig")), "contents": None, "copy": None},
+    ]}
+
+    records = create_links.apply_mapper(mapper, on_conflict="throwError", method="symlink", dry_run=True)
+    assert sorted((record["operation"], record["status"]) for record in records) == [("contents_symlink", "planned"), ("contents_symlink", "planned"), ("symlink", "planned")]
+    assert list(home.iterdir()) == []  # the dry run changed nothing.
+
+    records = create_links.apply_mapper(mapper, on_conflict="throwError", method="symlink")
+    assert {record["status"] for record in records} == {"success"}
+    assert home.joinpath(".config", "nvim", "init.lua").resolve() == managed.joinpath("nvim", "init.lua")
+    assert home.joinpath(".gitconfig").resolve() == managed.joinpath("gitconfig")
+
+    records = create_links.apply_mapper(mapper, on_conflict="throwError", method="symlink", dry_run=True)
+    assert {record["action"] for record in records} == {"already_linked"} and {record["status"] for record in records} == {"success"}
+
+
+def test_manifest_serves_unchanged_files_without_rereading(tmp_path: Path, hashes: HashManifest, monkeypatch: pytest.MonkeyPatch) -> None:
+    a_file = tmp_path.joinpath("big.bin")
+    a_file.write_bytes(b"x" * 4096)
+    expected = hashlib.sha256(b"x" * 4096).hexdigest()
+    assert hashes.digest(a_file) == expected
+    hashes.save()
+    assert not [a_path for a_path in tmp_path.iterdir() if a_path.suffix == ".tmp"]
+
+    def no_hashing(*args: object, **kwargs: object) -> None:
+        raise AssertionError("re-hashed a file whose size and mtime did not change")
+    monkeypatch.setattr(links.hashlib, "sha256", no_hashing)
+    assert HashManifest(path=hashes.path).digest(a_file) == expected  # hit after a reload from disk.
+
+    monkeypatch.undo()
+    a_file.write_bytes(b"y" * 4096)
+    os.utime(a_file, ns=(os.stat(a_file).st_atime_ns, os.stat(a_file).st_mtime_ns + 10 ** 9))
+    assert HashManifest(path=hashes.path).digest(a_file) == hashlib.sha256(b"y" * 4096).hexdigest()
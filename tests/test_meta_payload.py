@@ -0,0 +1,76 @@
+import shutil
+import subprocess
+import sys
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+from machineconfig.utils.meta import encode_payload_call, functions_to_module, write_payload
+
+
+GREETING = "hello"
+
+
+def greet(name: str, times: int) -> None:
+    import json
+    print(json.dumps({"greeting": GREETING, "name": name, "times": times}))
+
+
+def add(a: int, b: int) -> None:
+    print(a + b)
+
+
+def _run(launcher: Path, function_name: str, kwargs: dict[str, Any]) -> str:
+    completed = subprocess.run([sys.executable, str(launcher), function_name, encode_payload_call(kwargs)], capture_output=True, text=True, check=True)
+    return completed.stdout.strip()
+
+
+def test_module_dispatches_to_each_function(tmp_path: Path) -> None:
+    source = functions_to_module([greet, add])
+    assert "GREETING = 'hello'" in source and "import json" in source
+    bundle = write_payload(functions=[greet, add], directory=tmp_path, precompile=False)
+    assert bundle.bytecode_path is None
+    assert _run(bundle.launcher_path, "greet", {"name": "ünïcode 'quoted' $HOME", "times": 2}) == '{"greeting": "hello", "name": "\\u00fcn\\u00efcode \'quoted\' $HOME", "times": 2}'
+    assert _run(bundle.launcher_path, "add", {"a": 2, "b": 3}) == "5"
+
+
+def test_precompiled_bytecode_is_what_runs(tmp_path: Path) -> None:
+    bundle = write_payload(functions=[greet, add], directory=tmp_path, precompile=True)
+    assert bundle.bytecode_path is not None and bundle.bytecode_path.parent.name == "__pycache__"
+    assert int.from_bytes(bundle.bytecode_path.read_bytes()[4:8], "little") == 0b01  # unchecked-hash pyc: flags word, bit 0 set, bit 1 clear.
+    assert write_payload(functions=[greet, add], directory=tmp_path, precompile=True) == bundle  # content addressed, nothing rewritten.
+    bundle.module_path.write_text("raise SystemExit('source was parsed instead of the cached bytecode')\n", encoding="utf-8")
+    assert _run(bundle.launcher_path, "add", {"a": 40, "b": 2}) == "42"
+
+
+def test_ssh_ships_the_payload_once_and_runs_the_launcher(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    from machineconfig.utils.ssh import SSH, UV_RUN_CMD
+    local_home, remote_home = tmp_path.joinpath("local"), tmp_path.joinpath("remote")
+    local_home.mkdir()
+    remote_home.mkdir()
+    monkeypatch.setenv("HOME", str(local_home))
+    uploads: list[str] = []
+    ssh = SSH.__new__(SSH)  # no server here: uploads land in `remote_home` and commands run locally from it.
+    ssh._shipped_payloads = set()
+    ssh._remote_machine = "Linux"
+
+    def put(local_path: Path) -> None:
+        relative = local_path.relative_to(local_home)
+        uploads.append(relative.as_posix())
+        remote_home.joinpath(relative).parent.mkdir(parents=True, exist_ok=True)
+        shutil.copy2(local_path, remote_home.joinpath(relative))
+
+    def run_shell(command: str, verbose_output: bool, description: str, strict_stderr: bool, strict_return_code: bool) -> str:
+        assert command.startswith(UV_RUN_CMD)
+        _python, launcher, function_name, token = command.removeprefix(UV_RUN_CMD).split()
+        completed = subprocess.run([sys.executable, launcher, function_name, token], cwd=remote_home, capture_output=True, text=True, check=True)
+        return completed.stdout.strip()
+    monkeypatch.setattr(ssh, "_sftp_put_home_relative", put, raising=False)
+    monkeypatch.setattr(ssh, "run_shell", run_shell, raising=False)
+
+    kwargs: dict[str, Any] = {"dependencies": [], "venv_path": None, "description": "test", "verbose_output": False, "strict_stderr": True, "strict_return_code": True}
+    assert ssh.run_py_payload(func=add, call_with_kwargs={"a": 1, "b": 2}, **kwargs) == "3"
+    assert sorted(Path(an_upload).suffix for an_upload in uploads) == [".py", ".py", ".pyc"]
+    assert ssh.run_py_payload(func=add, call_with_kwargs={"a": 5, "b": 5}, **kwargs) == "10"
+    assert len(uploads) == 3  # the second call only sends kwargs.
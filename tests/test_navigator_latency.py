@@ -0,0 +1,96 @@
+import asyncio
+import statistics
+import time
+
+import pytest
+from textual.widgets import Input
+
+from machineconfig.scripts.python.helpers_navigator import command_tree, main_app
+from machineconfig.scripts.python.helpers_navigator.command_index import CommandSearchIndex
+from machineconfig.scripts.python.helpers_navigator.data_models import CommandInfo
+
+
+N_GROUPS = 200
+N_LEAVES = 25
+QUERY = "group-0173 leaf-19"
+MEDIAN_KEYSTROKE_SECONDS = 0.025
+MAX_KEYSTROKE_SECONDS = 0.2  # the odd keystroke shares its frame with a repaint of the expanded tree.
+SEARCH_SECONDS = 0.005  # the request's budget: results update in under 5 ms.
+
+
+def _entries() -> tuple[list[CommandInfo], list[int]]:
+    """A tree about ten times the size of the real one, so the latency budget leaves room for the command set to grow."""
+    entries: list[CommandInfo] = []
+    parents: list[int] = []
+    for group in range(N_GROUPS):
+        entries.append(CommandInfo(name=f"group-{group:04d}", description=f"group number {group}", command=f"group-{group:04d}", is_group=True))
+        parents.append(-1)
+        group_index = len(entries) - 1
+        for leaf in range(N_LEAVES):
+            path = f"group-{group:04d} leaf-{leaf:02d}"
+            entries.append(CommandInfo(name=f"leaf-{leaf:02d}", description=f"does thing {leaf} of group {group}", command=path, parent=f"group-{group:04d}",
+                                       help_text=f"{path} <target> --force"))
+            parents.append(group_index)
+    return entries, parents
+
+
+def test_keystroke_latency(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Pilot.press waits for the app to go idle, so latency is taken inside the app: from the key being sent until the search input handler returned,
+    and separately the debounced search that runs once typing pauses."""
+    monkeypatch.setattr(command_tree, "load_command_entries", _entries)
+    handled: list[float] = []
+    searches: list[float] = []
+    on_input_changed, apply_search = main_app.CommandNavigatorApp.on_input_changed, main_app.CommandNavigatorApp._apply_search
+
+    def timed_input_changed(self: main_app.CommandNavigatorApp, event: Input.Changed) -> None:
+        on_input_changed(self, event)
+        handled.append(time.perf_counter())
+
+    def timed_apply_search(self: main_app.CommandNavigatorApp, search_term: str) -> None:
+        start = time.perf_counter()
+        apply_search(self, search_term)
+        searches.append(time.perf_counter() - start)
+
+    monkeypatch.setattr(main_app.CommandNavigatorApp, "on_input_changed", timed_input_changed)
+    monkeypatch.setattr(main_app.CommandNavigatorApp, "_apply_search", timed_apply_search)
+
+    async def type_query() -> tuple[list[float], str, CommandInfo | None]:
+        app = main_app.CommandNavigatorApp()
+        async with app.run_test(size=(160, 50)) as pilot:
+            await pilot.press("slash")
+            latencies: list[float] = []
+            for char in QUERY:
+                start = time.perf_counter()
+                await pilot.press("space" if char == " " else char)
+                latencies.append(handled[-1] - start)
+            await pilot.pause(main_app.SEARCH_DEBOUNCE_SECONDS * 4)
+            node = app.query_one(command_tree.CommandTree).cursor_node
+            return latencies, app.sub_title, node.data if node is not None else None
+
+    latencies, sub_title, selected = asyncio.run(type_query())
+    print(f"\n{len(latencies)} keystrokes over {N_GROUPS * (N_LEAVES + 1)} commands: median {statistics.median(latencies) * 1000:.1f} ms, worst {max(latencies) * 1000:.1f} ms per keystroke, "
+          f"{len(searches)} search(es) of worst {max(searches) * 1000:.1f} ms")
+    assert len(handled) == len(QUERY)
+    assert statistics.median(latencies) < MEDIAN_KEYSTROKE_SECONDS and max(latencies) < MAX_KEYSTROKE_SECONDS
+    assert searches and statistics.median(searches) < MEDIAN_KEYSTROKE_SECONDS
+    assert sub_title.startswith("1 match for")
+    assert selected is not None and selected.command == QUERY
+
+
+def test_search_index_answers_every_prefix_within_budget() -> None:
+    """Every prefix a user types on the way to QUERY, plus a fuzzy-only and a hopeless query, each best of five to shed scheduler noise."""
+    entries, _parents = _entries()
+    index = CommandSearchIndex(entries)
+    queries = [QUERY[:end] for end in range(1, len(QUERY) + 1)] + ["g173lf19", "zzz"]
+    timings: dict[str, float] = {}
+    for query in queries:
+        best = float("inf")
+        for _ in range(5):
+            start = time.perf_counter()
+            index.search(query)
+            best = min(best, time.perf_counter() - start)
+        timings[query] = best
+    slowest = max(timings, key=timings.__getitem__)
+    print(f"\nsearch over {len(entries)} commands: slowest {slowest!r} at {timings[slowest] * 1000:.2f} ms")
+    assert entries[index.search(QUERY)[0]].command == QUERY
+    assert timings[slowest] < SEARCH_SECONDS
@@ -0,0 +1,128 @@
+import json
+import os
+import threading
+from collections.abc import Iterator
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any
+from urllib.parse import parse_qs
+
+import pytest
+
+from machineconfig.utils.cloud.onedrive import transaction
+
+
+class StubGraph:
+    """Just enough of Graph and the token endpoint for token refresh and resumable uploads."""
+
+    def __init__(self) -> None:
+        self.requests: list[tuple[str, str, dict[str, str]]] = []
+        self.uploads: dict[str, bytearray] = {}
+        self.received: dict[str, list[tuple[int, int]]] = {}
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), self._handler())
+        self.base = f"http://127.0.0.1:{self.server.server_address[1]}"
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+
+    def _handler(self) -> type[BaseHTTPRequestHandler]:
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, format: str, *args: Any) -> None: pass
+
+            def _reply(self, status: int, payload: dict[str, Any]) -> None:
+                body = json.dumps(payload).encode()
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def _body(self) -> bytes: return self.rfile.read(int(self.headers.get("Content-Length", 0)))
+
+            def do_POST(self) -> None:
+                stub.requests.append(("POST", self.path, dict(self.headers)))
+                body = self._body()
+                if self.path == "/oauth/token":
+                    form = parse_qs(body.decode())
+                    assert form["grant_type"] == ["refresh_token"] and form["refresh_token"] == ["old-refresh"]
+                    return self._reply(200, {"access_token": "fresh-token", "refresh_token": "new-refresh", "expires_in": 3600})
+                if self.path.endswith(":/createUploadSession"):
+                    session = f"s{len(stub.uploads)}"
+                    stub.uploads[session] = bytearray()
+                    return self._reply(200, {"uploadUrl": f"{stub.base}/upload/{session}"})
+                self._reply(404, {})
+
+            def do_GET(self) -> None:
+                stub.requests.append(("GET", self.path, dict(self.headers)))
+                session = self.path.removeprefix("/upload/")
+                if session in stub.uploads: return self._reply(200, {"nextExpectedRanges": [f"{len(stub.uploads[session])}-"]})
+                self._reply(404, {})
+
+            def do_PUT(self) -> None:
+                stub.requests.append(("PUT", self.path, dict(self.headers)))
+                session = self.path.removeprefix("/upload/")
+                first, last_total = self.headers["Content-Range"].removeprefix("bytes ").split("-")
+                last, total = (int(part) for part in last_total.split("/"))
+                data = self._body()
+                assert int(first) == len(stub.uploads[session]) and last - int(first) + 1 == len(data)
+                stub.uploads[session] += data
+                stub.received.setdefault(session, []).append((int(first), last))
+                if len(stub.uploads[session]) == total: return self._reply(201, {"id": session, "size": total})
+                self._reply(202, {"nextExpectedRanges": [f"{len(stub.uploads[session])}-"]})
+        return Handler
+
+
+@pytest.fixture()
+def graph(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Iterator[StubGraph]:
+    stub = StubGraph()
+    stub.thread.start()
+    monkeypatch.setenv("HOME", str(tmp_path))
+    monkeypatch.setattr(transaction, "GRAPH_API_BASE", f"{stub.base}/v1.0")
+    monkeypatch.setattr(transaction, "OAUTH_TOKEN_ENDPOINT", f"{stub.base}/oauth/token")
+    monkeypatch.setattr(transaction, "UPLOAD_SESSIONS_PATH", tmp_path.joinpath("tmp_results", "cache", "onedrive_upload_sessions.json"))
+    monkeypatch.setattr(transaction, "_token_file_loaded", True)
+    monkeypatch.setattr(transaction, "_cached_config", {"token": {"access_token": "stale", "refresh_token": "old-refresh", "expiry": "2000-01-01T00:00:00"}, "drive_id": "d1", "drive_type": "personal"})
+    yield stub
+    stub.server.shutdown()
+    stub.server.server_close()
+
+
+def test_token_endpoint_is_overridable_from_env(monkeypatch: pytest.MonkeyPatch) -> None:
+    import importlib
+    monkeypatch.setenv("ONEDRIVE_OAUTH_TOKEN_ENDPOINT", "http://127.0.0.1:1/token")
+    try: assert importlib.reload(transaction).OAUTH_TOKEN_ENDPOINT == "http://127.0.0.1:1/token"
+    finally:
+        monkeypatch.delenv("ONEDRIVE_OAUTH_TOKEN_ENDPOINT")
+        importlib.reload(transaction)
+
+
+def test_resumable_upload_refreshes_token_and_persists_session_privately(graph: StubGraph, tmp_path: Path) -> None:
+    payload = os.urandom(6 * 1024 ** 2 + 123)
+    local = tmp_path.joinpath("big.bin")
+    local.write_bytes(payload)
+    assert transaction.push_to_onedrive(str(local), "/big.bin")
+    assert bytes(graph.uploads["s0"]) == payload
+    assert [path for method, path, _headers in graph.requests if method == "POST"] == ["/oauth/token", "/v1.0/drives/d1/root:/big.bin:/createUploadSession"]
+    create_headers = next(headers for _method, path, headers in graph.requests if path.endswith("createUploadSession"))
+    assert create_headers["Authorization"] == "Bearer fresh-token"
+    assert all("Authorization" not in headers for method, _path, headers in graph.requests if method == "PUT")  # upload urls are pre-authenticated.
+    sessions_path = transaction.UPLOAD_SESSIONS_PATH
+    assert sessions_path.stat().st_mode & 0o777 == 0o600
+    assert json.loads(sessions_path.read_text(encoding="utf-8")) == {}
+    assert not list(sessions_path.parent.glob("*.tmp"))
+    assert not tmp_path.joinpath(".onedrive_upload_sessions.json").exists()
+
+
+def test_resumable_upload_continues_saved_session(graph: StubGraph, tmp_path: Path) -> None:
+    payload = os.urandom(6 * 1024 ** 2)
+    local = tmp_path.joinpath("big.bin")
+    local.write_bytes(payload)
+    already = 3 * 320 * 1024
+    graph.uploads["s0"] = bytearray(payload[:already])
+    stat = local.stat()
+    key = f"{local.absolute()}|/big.bin"
+    transaction._save_upload_session(key, {"uploadUrl": f"{graph.base}/upload/s0", "size": stat.st_size, "mtime_ns": stat.st_mtime_ns})  # pyright: ignore[reportPrivateUsage]
+    assert transaction.resumable_upload(local, "/big.bin")
+    assert bytes(graph.uploads["s0"]) == payload
+    assert graph.received["s0"][0][0] == already
+    assert not any(path.endswith("createUploadSession") for _method, path, _headers in graph.requests)
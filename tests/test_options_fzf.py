@@ -0,0 +1,67 @@
+import os
+import shutil
+import sys
+import time
+import tracemalloc
+from collections.abc import Iterator
+from pathlib import Path
+
+import pytest
+
+from machineconfig.utils.options import stream_to_fzf
+
+
+REAL_FZF = shutil.which("fzf")
+pytestmark = pytest.mark.skipif(REAL_FZF is None, reason="fzf is not installed")
+N_OPTIONS = 1_000_000
+WRAPPER = """#!{python}
+import os, shutil, subprocess, sys, time
+first = sys.stdin.buffer.read1(65536)
+with open(os.environ["FZF_FIRST_BYTE_FILE"], "w") as f: f.write(repr(time.perf_counter()))
+process = subprocess.Popen([{fzf!r}, *sys.argv[1:]], stdin=subprocess.PIPE)
+process.stdin.write(first)
+shutil.copyfileobj(sys.stdin.buffer, process.stdin, 1024 ** 2)
+process.stdin.close()
+sys.exit(process.wait())
+"""
+
+
+@pytest.fixture()
+def timed_fzf(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Path:
+    """An `fzf` first on PATH that records when the first byte of input reaches it, then hands everything to the real fzf."""
+    wrapper = tmp_path.joinpath("bin", "fzf")
+    wrapper.parent.mkdir()
+    wrapper.write_text(WRAPPER.format(python=sys.executable, fzf=REAL_FZF), encoding="utf-8")
+    wrapper.chmod(0o755)
+    monkeypatch.setenv("PATH", f"{wrapper.parent}{os.pathsep}{os.environ['PATH']}")
+    first_byte_file = tmp_path.joinpath("first_byte")
+    monkeypatch.setenv("FZF_FIRST_BYTE_FILE", str(first_byte_file))
+    return first_byte_file
+
+
+def _options() -> Iterator[str]:
+    for idx in range(N_OPTIONS): yield f"option number {idx:07d}"
+
+
+def test_stream_to_fzf_filter_million_options(timed_fzf: Path) -> None:
+    tracemalloc.start()
+    start = time.perf_counter()
+    try: selected = stream_to_fzf(_options(), fzf_args=("--filter", "number 0999999", "--exact"))
+    finally:
+        _current, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+    total = time.perf_counter() - start
+    first_byte = float(timed_fzf.read_text(encoding="utf-8")) - start
+    print(f"\n{N_OPTIONS} options: first byte at fzf after {first_byte * 1000:.0f} ms, done in {total:.2f}s, peak python memory {peak / 1024 ** 2:.0f} MiB")
+    assert selected == ["option number 0999999"]
+    assert first_byte < 1.0 and first_byte < total / 5  # fzf gets input long before the iterable is exhausted.
+    assert peak < 160 * 1024 ** 2  # the options themselves plus 1024-record batches, never one buffer of all records.
+
+
+def test_stream_to_fzf_maps_duplicate_labels_by_index() -> None:
+    class Item:
+        def __init__(self, label: str): self.label = label
+        def __str__(self) -> str: return self.label
+    items = [Item("same"), Item("other"), Item("same")]
+    selected = stream_to_fzf(iter(items), fzf_args=("--filter", "same"))
+    assert sorted(id(item) for item in selected) == sorted([id(items[0]), id(items[2])])
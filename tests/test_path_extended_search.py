@@ -0,0 +1,76 @@
+import os
+import zipfile
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+from machineconfig.utils.path_extended import PathExtended
+
+
+@pytest.fixture()
+def tree(tmp_path: Path) -> PathExtended:
+    for rel in ("a.py", "b.txt", "sub/c.py", "sub/deep/d.py", "sub/deep/notes.txt", ".hidden/e.py", "skip/f.py", "skip/inner/g.py"):
+        tmp_path.joinpath(rel).parent.mkdir(parents=True, exist_ok=True)
+        tmp_path.joinpath(rel).write_text(rel, encoding="utf-8")
+    with zipfile.ZipFile(tmp_path.joinpath("sub", "arch.zip"), "w") as archive:
+        archive.writestr("x.py", "x")
+        archive.writestr("y.txt", "y")
+    return PathExtended(tmp_path)
+
+
+def _rel(root: PathExtended, found: list[PathExtended]) -> list[str]:
+    return sorted(Path(a_path).relative_to(root).as_posix() for a_path in found)
+
+
+def test_name_patterns(tree: PathExtended) -> None:
+    assert _rel(tree, tree.search("*.py")) == ["a.py"]
+    assert _rel(tree, tree.search("*.py", r=True)) == ["a.py", "skip/f.py", "skip/inner/g.py", "sub/c.py", "sub/deep/d.py"]
+    assert "hidden/e.py" in " ".join(_rel(tree, tree.search("*.py", r=True, dotfiles=True)))
+
+
+@pytest.mark.parametrize("pattern, r, expected", [
+    ("sub/*.py", False, ["sub/c.py"]),
+    ("sub/*/*.py", False, ["sub/deep/d.py"]),
+    ("sub/**/*.py", False, ["sub/c.py", "sub/deep/d.py"]),
+    ("deep/*.py", False, []),
+    ("deep/*.py", True, ["sub/deep/d.py"]),
+    ("*/*.py", True, ["skip/f.py", "skip/inner/g.py", "sub/c.py", "sub/deep/d.py"]),
+])
+def test_slash_patterns_match_the_relative_path(tree: PathExtended, pattern: str, r: bool, expected: list[str]) -> None:
+    assert _rel(tree, list(tree.search_iter(pattern=pattern, r=r))) == expected
+
+
+@pytest.fixture()
+def scanned(monkeypatch: pytest.MonkeyPatch) -> list[str]:
+    """Folders `os.scandir` was called on."""
+    calls: list[str] = []
+    real_scandir = os.scandir
+    def recording_scandir(path: str) -> Any:
+        calls.append(path)
+        return real_scandir(path)
+    monkeypatch.setattr(os, "scandir", recording_scandir)
+    return calls
+
+
+def test_not_in_prunes_the_subtree(tree: PathExtended, scanned: list[str]) -> None:
+    assert _rel(tree, tree.search("*.py", r=True, not_in=["skip"])) == ["a.py", "sub/c.py", "sub/deep/d.py"]
+    assert not [a_dir for a_dir in scanned if "skip" in a_dir]
+
+
+def test_limit_stops_the_walk(tree: PathExtended, scanned: list[str]) -> None:
+    assert len(list(tree.search_iter("*", r=True, folders=False, limit=1))) == 1
+    assert scanned == [str(tree)]  # the root already has a hit, nothing below it is read.
+
+
+def test_folders_files_and_filters(tree: PathExtended) -> None:
+    assert _rel(tree, tree.search("*", r=True, files=False)) == ["skip", "skip/inner", "sub", "sub/deep"]
+    assert _rel(tree, tree.search("*", folders=False)) == ["a.py", "b.txt"]
+    assert _rel(tree, tree.search("*", r=True, exts=[".txt"])) == ["b.txt", "sub/deep/notes.txt"]
+    assert _rel(tree, tree.search("*.py", r=True, filters_total=[lambda item: item.parent.name == "deep"])) == ["sub/deep/d.py"]
+    assert _rel(tree, list(tree.search_iter("*.py", r=True, workers=3))) == _rel(tree, tree.search("*.py", r=True))
+
+
+def test_compressed_search_honours_exts(tree: PathExtended) -> None:
+    inside = [a_path for a_path in tree.search("*", r=True, compressed=True, exts=[".py"]) if ".zip" in str(a_path)]
+    assert sorted(a_path.name for a_path in inside) == ["x.py"]
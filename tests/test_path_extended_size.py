@@ -0,0 +1,27 @@
+import json
+import os
+import shutil
+from pathlib import Path
+
+import pytest
+
+from machineconfig.utils import path_extended
+from machineconfig.utils.path_extended import PathExtended
+
+
+def test_size_cache_is_keyed_on_resolved_paths_and_pruned(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    cache_path = tmp_path / "cache" / "dir_sizes.json"
+    monkeypatch.setattr(path_extended, "DIR_SIZE_CACHE_PATH", cache_path)
+    root = tmp_path / "tree"
+    root.joinpath("a", "b").mkdir(parents=True)
+    root.joinpath("a", "b", "f.bin").write_bytes(b"x" * 1000)
+    root.joinpath("g.bin").write_bytes(b"y" * 24)
+    monkeypatch.chdir(root)
+    assert PathExtended(".").size(units="b", cache=True) == 1024
+    keys = set(json.loads(cache_path.read_text(encoding="utf-8")))
+    assert str(root.resolve()) in keys and "." not in keys
+    shutil.rmtree(root / "a" / "b")
+    os.utime(root / "a")
+    assert PathExtended(".").size(units="b", cache=True) == 24
+    assert str(root.resolve() / "a" / "b") not in json.loads(cache_path.read_text(encoding="utf-8"))
+    assert not list(cache_path.parent.glob("*.tmp"))
@@ -0,0 +1,133 @@
+import io
+import tarfile
+from pathlib import Path
+
+import pytest
+
+from machineconfig.utils import path_extended
+
+
+def _make_archive(path: Path, n_files: int, payload_size: int) -> None:
+    with tarfile.open(path, "w") as tar:
+        for idx in range(n_files):
+            info = tarfile.TarInfo(f"flat/file_{idx:05d}.bin")
+            info.size = payload_size
+            tar.addfile(info, io.BytesIO(bytes([idx % 251]) * payload_size))
+        link = tarfile.TarInfo("flat/link")
+        link.type = tarfile.SYMTYPE
+        link.linkname = "file_00000.bin"
+        tar.addfile(link)
+
+
+def test_extract_tar_stream_bounds_buffered_bytes(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    archive = tmp_path.joinpath("flat.tar")
+    _make_archive(archive, n_files=300, payload_size=4096)
+    budget = 10 * 4096
+    monkeypatch.setattr(path_extended, "TAR_IN_FLIGHT_BYTES", budget)
+    peak = 0
+    in_flight = 0
+    original_extractfile = tarfile.TarFile.extractfile
+
+    def tracking_extractfile(self: tarfile.TarFile, member: "str | tarfile.TarInfo"):
+        nonlocal in_flight, peak
+        handle = original_extractfile(self, member)
+        assert handle is not None
+        original_read = handle.read
+
+        def read(size: int = -1) -> bytes:
+            nonlocal in_flight, peak
+            data = original_read(size)
+            in_flight += len(data)
+            peak = max(peak, in_flight)
+            return data
+        handle.read = read  # type: ignore[method-assign]
+        return handle
+
+    original_write_bytes = Path.write_bytes
+
+    def tracking_write_bytes(self: Path, data: bytes) -> int:  # type: ignore[override]
+        nonlocal in_flight
+        written = original_write_bytes(self, data)
+        in_flight -= len(data)
+        return written
+
+    monkeypatch.setattr(tarfile.TarFile, "extractfile", tracking_extractfile)
+    monkeypatch.setattr(Path, "write_bytes", tracking_write_bytes)
+    destination = tmp_path.joinpath("out")
+    with tarfile.open(archive, "r|") as tar:
+        path_extended._extract_tar_stream(tar, destination, workers=4)  # pyright: ignore[reportPrivateUsage]
+    assert peak <= budget + 4096
+    files = sorted(destination.joinpath("flat").glob("file_*.bin"))
+    assert len(files) == 300
+    assert files[7].read_bytes() == bytes([7]) * 4096
+    assert destination.joinpath("flat", "link").resolve() == files[0].resolve()
+
+
+def _make_tree(root: Path, n_files: int, payload_size: int) -> dict[str, str]:
+    """Nested folders of half compressible, half random files. Returns the digest of each, keyed by relative path."""
+    import hashlib
+    import os
+    contents: dict[str, str] = {}
+    for idx in range(n_files):
+        relative = f"level_{idx % 4}/sub_{idx % 7}/file_{idx:05d}.bin"
+        payload = (f"line {idx}\n".encode() * payload_size)[:payload_size // 2] + os.urandom(payload_size - payload_size // 2)
+        root.joinpath(relative).parent.mkdir(parents=True, exist_ok=True)
+        root.joinpath(relative).write_bytes(payload)
+        contents[relative] = hashlib.sha256(payload).hexdigest()
+    return contents
+
+
+def _read_tree(root: Path) -> dict[str, str]:
+    import hashlib
+    return {item.relative_to(root).as_posix(): hashlib.sha256(item.read_bytes()).hexdigest() for item in root.rglob("*") if item.is_file()}
+
+
+def test_tar_zst_round_trip(tmp_path: Path) -> None:
+    source = tmp_path.joinpath("data")
+    expected = _make_tree(source, n_files=60, payload_size=20_000)
+    source.joinpath("empty_dir").mkdir()
+    archive = path_extended.PathExtended(source).tar_zst(folder=tmp_path.joinpath("archives"), level=3, verbose=False)
+    assert archive.name == "data.tar.zst" and archive.stat().st_size < 60 * 20_000
+    restored = archive.untar_zst(folder=tmp_path.joinpath("restored"), verbose=False)
+    assert restored == tmp_path.joinpath("restored", "data")
+    assert _read_tree(restored.joinpath("data")) == expected
+    assert restored.joinpath("data", "empty_dir").is_dir()
+
+
+@pytest.mark.parametrize("archive", ["zip", "tar.zst"])
+def test_zip_n_encrypt_round_trip(tmp_path: Path, archive: path_extended.ARCHIVE_FORMATS) -> None:
+    source = tmp_path.joinpath("secrets")
+    expected = _make_tree(source, n_files=12, payload_size=5_000)
+    encrypted = path_extended.PathExtended(source).zip_n_encrypt(pwd="hunter2", inplace=True, verbose=False, archive=archive)
+    assert encrypted.name == f"secrets.{archive}.enc" and not source.exists()
+    assert b"line 0" not in encrypted.read_bytes()
+    decrypted = encrypted.decrypt_n_unzip(pwd="hunter2", inplace=True, verbose=False)
+    assert not encrypted.exists()
+    assert decrypted == source and _read_tree(source.joinpath("secrets")) == expected  # both formats unpack next to the archive, into `<stem>/<name>`.
+
+
+@pytest.mark.slow
+def test_zip_vs_tar_zst_benchmark(tmp_path: Path) -> None:
+    """The zip path against tar.zst on a ~200 MB directory of 2000 files, compression and extraction."""
+    import time
+    source = tmp_path.joinpath("big")
+    expected = _make_tree(source, n_files=2000, payload_size=100_000)
+    size = 2000 * 100_000
+    timings: dict[str, tuple[float, float, int]] = {}
+    for backend in ("zip", "tar.zst"):
+        out = tmp_path.joinpath(f"out_{backend}")
+        start = time.perf_counter()
+        if backend == "zip": archive = path_extended.PathExtended(source).zip(folder=out, verbose=False)
+        else: archive = path_extended.PathExtended(source).tar_zst(folder=out, verbose=False)
+        packed = time.perf_counter() - start
+        start = time.perf_counter()
+        if backend == "zip": restored = archive.unzip(folder=out.joinpath("restored"), verbose=False).joinpath("big")
+        else: restored = archive.untar_zst(folder=out.joinpath("restored"), verbose=False).joinpath("big")
+        unpacked = time.perf_counter() - start
+        assert _read_tree(restored) == expected
+        timings[backend] = (packed, unpacked, archive.stat().st_size)
+    print(f"\n{size / 1024 ** 2:.0f} MiB in {len(expected)} files:")
+    for backend, (packed, unpacked, archive_size) in timings.items():
+        print(f"  {backend:8s} compress {packed:6.2f}s  extract {unpacked:6.2f}s  archive {archive_size / 1024 ** 2:6.1f} MiB")
+    assert timings["tar.zst"][0] < timings["zip"][0]
+    assert timings["tar.zst"][2] <= timings["zip"][2] * 1.05
@@ -0,0 +1,49 @@
+import os
+from pathlib import Path
+
+import pytest
+
+from machineconfig.utils import path_helper
+from machineconfig.utils.path_extended import PathExtended
+
+
+@pytest.fixture()
+def index_dir(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Path:
+    directory = tmp_path.joinpath("file_name_index")
+    monkeypatch.setattr(path_helper, "FILE_NAME_INDEX_DIR", directory)
+    return directory
+
+
+def test_match_file_name_loads_index_once(tmp_path: Path, index_dir: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    root = tmp_path.joinpath("repo")
+    root.joinpath("pkg").mkdir(parents=True)
+    root.joinpath("pkg", "abc_one.py").write_text("", encoding="utf-8")
+    root.joinpath("zzz.py").write_text("", encoding="utf-8")
+    loads: list[Path] = []
+    original_load = path_helper.FileNameIndex.load
+
+    def counting_load(root: Path) -> path_helper.FileNameIndex:
+        loads.append(root)
+        return original_load(root)
+    monkeypatch.setattr(path_helper.FileNameIndex, "load", staticmethod(counting_load))
+    match = path_helper.match_file_name("aoe", PathExtended(root), suffixes={".py"})  # no substring hit, resolved by the fuzzy fallback.
+    assert match == root.joinpath("pkg", "abc_one.py")
+    assert len(loads) == 1
+
+
+def test_index_files_are_pruned_least_recently_used_first(tmp_path: Path, index_dir: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(path_helper, "FILE_NAME_INDEX_MAX_FILES", 3)
+    roots = [tmp_path.joinpath(f"root_{idx}") for idx in range(5)]
+    for idx, root in enumerate(roots):
+        root.mkdir()
+        root.joinpath("a.py").write_text("", encoding="utf-8")
+        path_helper.FileNameIndex.load(root)
+        os.utime(path_helper.FileNameIndex(root).path, (1000 + idx, 1000 + idx))
+    path_helper.FileNameIndex.load(roots[0])  # unchanged root: only touched, which makes it the most recently used.
+    stale_tmp = index_dir.joinpath("deadbeef.123.tmp")
+    stale_tmp.write_text("", encoding="utf-8")
+    os.utime(stale_tmp, (1000, 1000))
+    roots[4].joinpath("b.py").write_text("", encoding="utf-8")
+    path_helper.FileNameIndex.load(roots[4])  # changed root: saved, which prunes.
+    kept = {a_path.name for a_path in index_dir.iterdir()}
+    assert kept == {path_helper.FileNameIndex(root).path.name for root in (roots[0], roots[3], roots[4])}
@@ -0,0 +1,100 @@
+import subprocess
+import sys
+import time
+from collections.abc import Callable, Iterator
+from pathlib import Path
+from typing import Any
+
+import psutil
+import pytest
+
+from machineconfig.utils import procs
+
+
+pytestmark = pytest.mark.skipif(not sys.platform.startswith("linux"), reason="counts read syscalls through /proc/self/io")
+
+
+@pytest.fixture(scope="module")
+def sleepers() -> Iterator[list[subprocess.Popen[bytes]]]:
+    children = [subprocess.Popen(["sleep", "300"]) for _ in range(500)]
+    yield children
+    for child in children: child.kill()
+    for child in children: child.wait()
+
+
+def _per_attribute_snapshot() -> list[dict[str, Any]]:
+    """The snapshot as it was taken before `snapshot_processes`: one psutil call (and /proc read) per attribute."""
+    rows: list[dict[str, Any]] = []
+    for proc in psutil.process_iter():
+        try:
+            rows.append({"pid": proc.pid, "memory_usage_mb": proc.memory_info().rss / (1024 * 1024), "create_time": proc.create_time(), "name": proc.name(),
+                         "username": proc.username(), "cpu_percent": proc.cpu_percent(), "status": proc.status(), "command": " ".join(proc.cmdline())})
+        except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess): pass
+    return rows
+
+
+def _read_syscalls() -> int:
+    with open("/proc/self/io", encoding="utf-8") as f:
+        return next(int(line.split()[1]) for line in f if line.startswith("syscr:"))
+
+
+def _measure(snapshot: Callable[[], list[Any]]) -> tuple[float, int, int]:
+    """Best of three wall times, plus the read syscalls issued and the rows returned by the last run."""
+    timings: list[float] = []
+    reads, rows = 0, 0
+    for _ in range(3):
+        psutil.process_iter.cache_clear()  # type: ignore[attr-defined]  # fresh Process objects, as in a new `ProcessManager` process.
+        before = _read_syscalls()
+        start = time.perf_counter()
+        rows = len(snapshot())
+        timings.append(time.perf_counter() - start)
+        reads = _read_syscalls() - before
+    return min(timings), reads, rows
+
+
+def test_snapshot_reads_less_and_runs_faster_than_per_attribute_calls(sleepers: list[subprocess.Popen[bytes]]) -> None:
+    baseline_seconds, baseline_reads, baseline_rows = _measure(_per_attribute_snapshot)
+    seconds, reads, rows = _measure(lambda: procs.snapshot_processes(cpu_interval=0))
+    print(f"\nper-attribute: {baseline_seconds * 1000:.1f} ms, {baseline_reads} read syscalls | snapshot: {seconds * 1000:.1f} ms, {reads} read syscalls ({rows} processes)")
+    assert rows >= len(sleepers) and baseline_rows >= len(sleepers)
+    assert reads < baseline_reads / 2
+    assert seconds < baseline_seconds
+
+
+def test_snapshot_samples_real_cpu(sleepers: list[subprocess.Popen[bytes]]) -> None:
+    busy = subprocess.Popen([sys.executable, "-c", "while True: pass"])
+    try:
+        time.sleep(0.2)
+        rows = {row["pid"]: row for row in procs.snapshot_processes(cpu_interval=0.3)}
+        assert rows[busy.pid]["cpu_percent"] > 20
+        assert rows[sleepers[0].pid]["cpu_percent"] == 0.0
+    finally:
+        busy.kill()
+        busy.wait()
+
+
+def test_file_handle_index_matches_components_and_skips_rescans(tmp_path: Path) -> None:
+    held, sibling = tmp_path.joinpath("held"), tmp_path.joinpath("held-sibling")
+    held.mkdir()
+    sibling.mkdir()
+    holder_code = "import sys, time; handle = open(sys.argv[1]); print('ready', flush=True); time.sleep(60)"
+    children: list[subprocess.Popen[str]] = []
+    try:
+        for idx in range(20):
+            target = (held if idx % 2 == 0 else sibling).joinpath(f"file_{idx}.txt")
+            target.write_text("x", encoding="utf-8")
+            child = subprocess.Popen([sys.executable, "-c", holder_code, str(target)], stdout=subprocess.PIPE, text=True)
+            children.append(child)
+        for child in children:
+            assert child.stdout is not None and child.stdout.readline().strip() == "ready"
+        index = procs.FileHandleIndex()
+        under_held = index.query(str(held))
+        assert {pid for pids in under_held.values() for pid in pids} == {child.pid for child in children[::2]}  # `held` must not match `held-sibling`.
+        assert index.query(str(held.joinpath("file_0.txt"))) == {str(held.joinpath("file_0.txt")): {children[0].pid}}
+        assert {pid for pids in index.search("held").values() for pid in pids} >= {child.pid for child in children}
+        index.refresh()
+        assert index.rescanned_pids < len(children)  # only pids started since the first scan are read again.
+        assert index.query(str(held)) == under_held
+    finally:
+        for child in children: child.kill()
+        for child in children: child.wait()
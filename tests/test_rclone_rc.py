@@ -0,0 +1,77 @@
+import os
+import shutil
+from collections.abc import Iterator
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+from machineconfig.utils.cloud.rclone_rc import RcloneDaemon, TransferQueue
+
+
+pytestmark = pytest.mark.skipif(shutil.which("rclone") is None, reason="rclone is not installed")
+
+
+@pytest.fixture()
+def daemon(tmp_path: Path) -> Iterator[RcloneDaemon]:
+    tmp_path.joinpath("rclone.conf").write_text("", encoding="utf-8")
+    with RcloneDaemon(config_path=str(tmp_path.joinpath("rclone.conf"))) as rcd:
+        yield rcd
+
+
+def test_startup_failure_reports_stderr(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    fake = tmp_path.joinpath("bin", "rclone")
+    fake.parent.mkdir()
+    fake.write_text("#!/bin/sh\necho 'Failed to start remote control: bind: address already in use' >&2\nexit 3\n", encoding="utf-8")
+    fake.chmod(0o755)
+    monkeypatch.setenv("PATH", f"{fake.parent}{os.pathsep}{os.environ['PATH']}")
+    rcd = RcloneDaemon()
+    with pytest.raises(RuntimeError, match="code 3:\n.*address already in use"):
+        rcd.start()
+    assert rcd.stderr is None  # the spool file is closed on failure too.
+
+
+def test_transfer_queue_runs_jobs_concurrently(tmp_path: Path, daemon: RcloneDaemon) -> None:
+    source = tmp_path.joinpath("source")
+    source.mkdir()
+    for idx in range(6): source.joinpath(f"f{idx}.bin").write_bytes(os.urandom(1024 * (idx + 1)))
+    queue = TransferQueue(daemon=daemon, max_concurrent=2)
+    for idx in range(6): queue.put("copy", str(source.joinpath(f"f{idx}.bin")), f":memory:bucket/f{idx}.bin")
+    queue.put("copy", ":memory:bucket/missing.bin", str(tmp_path.joinpath("missing.bin")))
+    progress: list[dict[str, Any]] = []
+    jobs = queue.run(poll_interval=0.05, on_progress=progress.append)
+    assert [job.success for job in jobs] == [True] * 6 + [False]
+    assert "missing.bin" in jobs[-1].error or "not found" in jobs[-1].error
+    assert progress and progress[-1]["bytes"] >= sum(1024 * (idx + 1) for idx in range(6))
+    listing = daemon.call("operations/list", fs=":memory:bucket", remote="")["list"]
+    assert sorted(item["Path"] for item in listing) == [f"f{idx}.bin" for idx in range(6)]
+
+
+def test_backup_then_retrieve_round_trip(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    from cryptography.fernet import Fernet
+    from machineconfig.scripts.python.helpers_devops import devops_backup_engine
+    home, bucket = tmp_path.joinpath("home"), tmp_path.joinpath("bucket")
+    bucket.mkdir()
+    home.joinpath("dotfiles", "creds", "data").mkdir(parents=True)
+    home.joinpath("dotfiles", "creds", "data", "encrypted_files_key.bytes").write_bytes(Fernet.generate_key())
+    monkeypatch.setenv("HOME", str(home))
+    monkeypatch.setattr(devops_backup_engine, "BACKUP_MANIFEST_PATH", tmp_path.joinpath("manifest.json"))
+    monkeypatch.chdir(bucket)  # `:local:` remotes resolve relative to the daemon's working directory.
+    home.joinpath("notes").mkdir()
+    home.joinpath("notes", "todo.md").write_text("- ship it", encoding="utf-8")
+    home.joinpath("secrets").mkdir()
+    home.joinpath("secrets", "token.txt").write_text("s3cr3t", encoding="utf-8")
+    items = {"notes": {"path": "~/notes", "zip": "False", "encrypt": "False", "rel2home": "True"},
+             "secrets": {"path": "~/secrets", "zip": "True", "encrypt": "True", "rel2home": "True"},
+             "absent": {"path": "~/absent", "zip": "False", "encrypt": "False", "rel2home": "True"}}
+    reports = devops_backup_engine.run_backup(items={key: val for key, val in items.items() if key != "absent"}, cloud=":local", jobs=2, bwlimit=None, force=False)
+    assert {report.name: report.status for report in reports} == {"notes": "uploaded", "secrets": "uploaded"}
+    assert bucket.joinpath("myhome", "generic_os", "secrets.zip.enc").is_file()
+
+    shutil.rmtree(home.joinpath("notes"))
+    shutil.rmtree(home.joinpath("secrets"))
+    reports = devops_backup_engine.run_retrieve(items=items, cloud=":local", jobs=2, bwlimit=None)
+    assert {report.name: report.status for report in reports} == {"notes": "retrieved", "secrets": "retrieved", "absent": "failed"}
+    assert home.joinpath("notes", "todo.md").read_text(encoding="utf-8") == "- ship it"
+    assert home.joinpath("secrets", "token.txt").read_text(encoding="utf-8") == "s3cr3t"
+    assert not [a_path for a_path in home.iterdir() if a_path.suffix in (".zip", ".enc")]  # downloads are unpacked in place.
@@ -0,0 +1,212 @@
+import asyncio
+import base64
+import http.client
+import io
+import os
+import threading
+import time
+import zipfile
+from collections.abc import Iterator
+from pathlib import Path
+
+import pytest
+
+from machineconfig.scripts.python.helpers_devops import share_server
+
+
+AUTH = {"Authorization": "Basic " + base64.b64encode(b"user:secret").decode("ascii")}
+
+
+@pytest.fixture()
+def share(tmp_path: Path) -> Iterator[tuple[Path, int]]:
+    root = tmp_path.joinpath("shared").resolve()
+    root.mkdir()
+    config = share_server.ShareConfig(root=root, username="user", password="secret")
+    loop = asyncio.new_event_loop()
+    server = loop.run_until_complete(asyncio.start_server(lambda reader, writer: share_server.handle_connection(config, reader, writer), host="127.0.0.1", port=0,
+                                                          limit=share_server.MAX_HEADER_BYTES))
+    thread = threading.Thread(target=loop.run_forever, daemon=True)
+    thread.start()
+    yield root, server.sockets[0].getsockname()[1]
+    loop.call_soon_threadsafe(loop.stop)
+    thread.join()
+    server.close()
+    loop.run_until_complete(server.wait_closed())
+    loop.close()
+
+
+def _get(port: int, target: str, headers: dict[str, str]) -> tuple[int, dict[str, str], bytes]:
+    connection = http.client.HTTPConnection("127.0.0.1", port, timeout=30)
+    connection.request("GET", target, headers={**AUTH, **headers})
+    response = connection.getresponse()
+    body = response.read()
+    connection.close()
+    return response.status, {name.lower(): value for name, value in response.getheaders()}, body
+
+
+def test_listing_links_are_escaped(share: tuple[Path, int]) -> None:
+    root, port = share
+    evil = "x'><img src=y onerror=alert(1)>"
+    root.joinpath(evil).mkdir()
+    root.joinpath(evil, "a&b.txt").write_text("hello", encoding="utf-8")
+    status, _headers, body = _get(port, "/'><svg%20onload=alert(1)>/../", {})  # the raw request path is never echoed into the page.
+    page = body.decode("utf-8")
+    assert status == 200
+    assert "<svg" not in page and "<img" not in page
+    assert f"href='/{'x%27%3E%3Cimg%20src%3Dy%20onerror%3Dalert%281%29%3E'}/'" in page
+    status, _headers, body = _get(port, "/x%27%3E%3Cimg%20src%3Dy%20onerror%3Dalert%281%29%3E/", {})
+    assert status == 200 and "href='/x%27%3E%3Cimg%20src%3Dy%20onerror%3Dalert%281%29%3E/a%26b.txt'" in body.decode("utf-8")
+    status, _headers, body = _get(port, "/x%27%3E%3Cimg%20src%3Dy%20onerror%3Dalert%281%29%3E/a%26b.txt", {})
+    assert status == 200 and body == b"hello"
+
+
+def test_ranges_and_throughput(share: tuple[Path, int]) -> None:
+    root, port = share
+    payload = os.urandom(64 * 1024 ** 2)
+    root.joinpath("big.bin").write_bytes(payload)
+    start = time.perf_counter()
+    status, headers, body = _get(port, "/big.bin", {})
+    seconds = time.perf_counter() - start
+    print(f"\nfull GET of {len(payload) / 1024 ** 2:.0f} MiB: {len(payload) / 1024 ** 2 / seconds:.0f} MiB/s")
+    assert status == 200 and body == payload and headers["accept-ranges"] == "bytes"
+    assert len(payload) / seconds > 50 * 1024 ** 2
+    etag = headers["etag"]
+    status, headers, body = _get(port, "/big.bin", {"Range": "bytes=1000-1999"})
+    assert status == 206 and body == payload[1000:2000] and headers["content-range"] == f"bytes 1000-1999/{len(payload)}"
+    status, headers, body = _get(port, "/big.bin", {"Range": "bytes=-500"})
+    assert status == 206 and body == payload[-500:]
+    status, headers, body = _get(port, "/big.bin", {"Range": f"bytes={len(payload) - 10}-"})
+    assert status == 206 and body == payload[-10:]
+    status, _headers, body = _get(port, "/big.bin", {"Range": "bytes=0-99", "If-Range": '"stale"'})
+    assert status == 200 and len(body) == len(payload)
+    status, _headers, body = _get(port, "/big.bin", {"Range": "bytes=0-99", "If-Range": etag})
+    assert status == 206 and body == payload[:100]
+    status, headers, _body = _get(port, "/big.bin", {"Range": f"bytes={len(payload)}-"})
+    assert status == 416 and headers["content-range"] == f"bytes */{len(payload)}"
+    status, _headers, body = _get(port, "/big.bin", {"If-None-Match": etag})
+    assert status == 304 and body == b""
+
+
+def test_zip_stream(share: tuple[Path, int]) -> None:
+    root, port = share
+    root.joinpath("folder", "sub").mkdir(parents=True)
+    root.joinpath("folder", "one.txt").write_text("1", encoding="utf-8")
+    root.joinpath("folder", "sub", "two.txt").write_text("2", encoding="utf-8")
+    status, _headers, body = _get(port, "/folder/?zip", {})
+    assert status == 200
+    with zipfile.ZipFile(io.BytesIO(body)) as archive:
+        assert sorted(archive.namelist()) == ["folder/one.txt", "folder/sub/two.txt"]
+        assert archive.read("folder/sub/two.txt") == b"2"
+
+
+def test_zip_skips_symlinks_leaving_the_share(share: tuple[Path, int], tmp_path: Path) -> None:
+    root, port = share
+    outside = tmp_path.joinpath("outside.txt")
+    outside.write_text("top secret", encoding="utf-8")
+    root.joinpath("folder").mkdir()
+    root.joinpath("folder", "inside.txt").write_text("shared", encoding="utf-8")
+    root.joinpath("folder", "link.txt").symlink_to(outside)
+    root.joinpath("folder", "alias.txt").symlink_to(root.joinpath("folder", "inside.txt"))
+    assert _get(port, "/folder/link.txt", {})[0] == 403
+    status, _headers, body = _get(port, "/folder/?zip", {})
+    assert status == 200 and b"top secret" not in body
+    with zipfile.ZipFile(io.BytesIO(body)) as archive:
+        assert sorted(archive.namelist()) == ["folder/alias.txt", "folder/inside.txt"]
+
+
+def test_non_ascii_credentials_are_refused_not_dropped(share: tuple[Path, int]) -> None:
+    _root, port = share
+    status, headers, _body = _get(port, "/", {"Authorization": "Basic d\xe9j\xe0-vu"})
+    assert status == 401 and "www-authenticate" in headers
+
+
+SPARSE_BYTES = 3 * 1024 ** 3
+CLIENTS = 4
+
+
+@pytest.mark.slow
+def test_concurrent_sparse_download_benchmark(tmp_path: Path) -> None:
+    """A separate server process sends a 3 GiB sparse file to concurrent clients. Its RSS is sampled throughout, and every client splits its download in
+    two: the first connection is dropped mid-body, the rest is resumed with `Range` + `If-Range`, and the joined bytes must hash like the file."""
+    import hashlib
+    import socket
+    import subprocess
+    import sys
+    import psutil
+    root = tmp_path.joinpath("shared")
+    root.mkdir()
+    big = root.joinpath("sparse.bin")
+    with open(big, "wb") as f:
+        f.truncate(SPARSE_BYTES)
+        for offset in range(0, SPARSE_BYTES, 256 * 1024 ** 2):  # data islands in the holes, so a misplaced range shows up in the hash.
+            f.seek(offset)
+            f.write(os.urandom(4096))
+    expected = hashlib.sha256()
+    with open(big, "rb") as f:
+        while chunk := f.read(8 * 1024 ** 2): expected.update(chunk)
+    with socket.socket() as probe:
+        probe.bind(("127.0.0.1", 0))
+        port = probe.getsockname()[1]
+    code = ("import asyncio, sys; from pathlib import Path; from machineconfig.scripts.python.helpers_devops.share_server import ShareConfig, serve; "
+            "asyncio.run(serve(ShareConfig(root=Path(sys.argv[1]), username='user', password='secret'), host='127.0.0.1', port=int(sys.argv[2])))")
+    env = {**os.environ, "PYTHONPATH": os.pathsep.join([str(Path(share_server.__file__).parents[4]), os.environ.get("PYTHONPATH", "")])}
+    server = subprocess.Popen([sys.executable, "-c", code, str(root), str(port)], env=env)
+    try:
+        deadline = time.monotonic() + 30
+        while True:
+            try:
+                socket.create_connection(("127.0.0.1", port), timeout=1).close()
+                break
+            except OSError:
+                if time.monotonic() > deadline or server.poll() is not None: raise
+                time.sleep(0.1)
+        process = psutil.Process(server.pid)
+        idle_rss = process.memory_info().rss
+        peak_rss = idle_rss
+        sampling = True
+
+        def sample() -> None:
+            nonlocal peak_rss
+            while sampling:
+                peak_rss = max(peak_rss, process.memory_info().rss)
+                time.sleep(0.05)
+
+        def download(client: int) -> str:
+            """Reads up to a cut point that differs per client, drops the connection, then resumes."""
+            digest = hashlib.sha256()
+            cut = SPARSE_BYTES * (client + 1) // (CLIENTS + 1) + client * 7919
+            connection = http.client.HTTPConnection("127.0.0.1", port, timeout=60)
+            connection.request("GET", "/sparse.bin", headers=AUTH)
+            response = connection.getresponse()
+            etag = response.getheader("ETag")
+            received = 0
+            while received < cut:
+                chunk = response.read(min(1024 ** 2, cut - received))
+                digest.update(chunk)
+                received += len(chunk)
+            connection.sock.close()  # type: ignore[union-attr]  # abrupt drop mid-body, like a lost link.
+            connection.close()
+            connection = http.client.HTTPConnection("127.0.0.1", port, timeout=60)
+            connection.request("GET", "/sparse.bin", headers={**AUTH, "Range": f"bytes={received}-", "If-Range": str(etag)})
+            response = connection.getresponse()
+            assert response.status == 206 and response.getheader("Content-Range") == f"bytes {received}-{SPARSE_BYTES - 1}/{SPARSE_BYTES}"
+            while chunk := response.read(1024 ** 2): digest.update(chunk)
+            connection.close()
+            return digest.hexdigest()
+
+        sampler = threading.Thread(target=sample, daemon=True)
+        sampler.start()
+        from concurrent.futures import ThreadPoolExecutor
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=CLIENTS) as pool: digests = list(pool.map(download, range(CLIENTS)))
+        seconds = time.perf_counter() - start
+        sampling = False
+        sampler.join()
+    finally:
+        server.terminate()
+        server.wait(timeout=30)
+    total = SPARSE_BYTES * CLIENTS
+    print(f"\n{CLIENTS} clients x {SPARSE_BYTES / 1024 ** 3:.0f} GiB (dropped and resumed): {total / 1024 ** 2 / seconds:.0f} MiB/s aggregate in {seconds:.1f}s, "
+          f"server RSS {idle_rss / 1024 ** 2:.0f} MiB idle, {peak_rss / 1024 ** 2:.0f} MiB peak")
+    assert digests == [expected.hexdigest()] * CLIENTS
+    assert peak_rss - idle_rss < 32 * 1024 ** 2  # sendfile: memory does not grow with the file size or the number of clients.
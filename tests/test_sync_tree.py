@@ -0,0 +1,73 @@
+import os
+import time
+from pathlib import Path
+
+import pytest
+
+from machineconfig.profile import create_helper
+from machineconfig.profile.create_helper import sync_tree
+
+
+def _make_tree(root: Path, n_dirs: int, files_per_dir: int) -> None:
+    for dir_idx in range(n_dirs):
+        folder = root.joinpath(f"d{dir_idx:03d}")
+        folder.mkdir(parents=True)
+        for file_idx in range(files_per_dir): folder.joinpath(f"f{file_idx:04d}.txt").write_text(f"{dir_idx}-{file_idx}", encoding="utf-8")
+
+
+def _snapshot(root: Path) -> dict[str, int]:
+    return {os.path.join(dirpath, name): os.stat(os.path.join(dirpath, name)).st_mtime_ns for dirpath, dirnames, filenames in os.walk(root) for name in dirnames + filenames}
+
+
+def test_second_sync_writes_nothing(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    source, target, manifest = tmp_path.joinpath("src"), tmp_path.joinpath("dst"), tmp_path.joinpath("manifest.json")
+    _make_tree(source, n_dirs=5, files_per_dir=20)
+    source.joinpath("empty", "nested").mkdir(parents=True)
+    first = sync_tree(source, target, manifest, executable=False)
+    assert len(first["copied"]) == 100 and target.joinpath("empty", "nested").is_dir()
+    before = _snapshot(tmp_path)
+
+    def no_writes(*args: object, **kwargs: object) -> None:
+        raise AssertionError("an unchanged tree was written to")
+    for name in ("copyfile", "copy2", "copy"): monkeypatch.setattr(create_helper.shutil, name, no_writes)
+    for name in ("replace", "rename", "makedirs", "mkdir", "remove", "chmod"): monkeypatch.setattr(create_helper.os, name, no_writes)
+    second = sync_tree(source, target, manifest, executable=False)
+    assert second == {"copied": [], "deleted": [], "unchanged": 100}
+    assert _snapshot(tmp_path) == before
+
+
+def test_changes_and_deletions_are_mirrored(tmp_path: Path) -> None:
+    source, target, manifest = tmp_path.joinpath("src"), tmp_path.joinpath("dst"), tmp_path.joinpath("manifest.json")
+    _make_tree(source, n_dirs=2, files_per_dir=3)
+    sync_tree(source, target, manifest, executable=True)
+    assert os.stat(target.joinpath("d000", "f0000.txt")).st_mode & 0o111 == 0o111
+    source.joinpath("d000", "f0000.txt").write_text("changed", encoding="utf-8")
+    source.joinpath("d001", "f0002.txt").unlink()
+    target.joinpath("unmanaged.txt").write_text("keep me", encoding="utf-8")
+    report = sync_tree(source, target, manifest, executable=True)
+    assert report["copied"] == ["d000/f0000.txt"] and report["deleted"] == ["d001/f0002.txt"] and report["unchanged"] == 4
+    assert target.joinpath("d000", "f0000.txt").read_text(encoding="utf-8") == "changed"
+    assert not target.joinpath("d001", "f0002.txt").exists() and target.joinpath("unmanaged.txt").exists()
+
+
+@pytest.mark.slow
+def test_unchanged_50k_files_benchmark(tmp_path: Path) -> None:
+    """sync_tree against the path it replaced, `PathExtended(source).copy(folder=..., overwrite=True)`, which recopied the whole tree on every run."""
+    from machineconfig.utils.path_extended import PathExtended
+    source, target, manifest = tmp_path.joinpath("src"), tmp_path.joinpath("dst"), tmp_path.joinpath("manifest.json")
+    _make_tree(source, n_dirs=100, files_per_dir=500)
+    start = time.perf_counter()
+    first = sync_tree(source, target, manifest, executable=False)
+    copy_seconds = time.perf_counter() - start
+    start = time.perf_counter()
+    second = sync_tree(source, target, manifest, executable=False)
+    noop_seconds = time.perf_counter() - start
+    PathExtended(source).copy(folder=tmp_path.joinpath("old"), overwrite=True)  # populate, so the timed run is the unchanged case too.
+    start = time.perf_counter()
+    PathExtended(source).copy(folder=tmp_path.joinpath("old"), overwrite=True)
+    old_seconds = time.perf_counter() - start
+    print(f"\n50k files: first sync {copy_seconds:.2f}s, unchanged sync {noop_seconds:.2f}s, old copy(overwrite=True) of the unchanged tree {old_seconds:.2f}s")
+    assert len(first["copied"]) == 50_000 and second["unchanged"] == 50_000 and not second["copied"]
+    assert sorted(os.listdir(tmp_path.joinpath("old", "src"))) == sorted(os.listdir(target))
+    assert noop_seconds < copy_seconds / 3
+    assert noop_seconds < old_seconds / 3
@@ -0,0 +1,68 @@
+import json
+import subprocess
+from typing import Any
+
+import pytest
+
+from machineconfig.cluster.sessions_managers.wt_utils import process_monitor
+from machineconfig.cluster.sessions_managers.wt_utils.process_monitor import WTProcessMonitor
+from machineconfig.utils.schemas.layouts.layout_types import TabConfig
+
+
+class FakePowerShell:
+    """Stands in for `powershell -Command <probe>` on Linux: evaluates the probe's matching rule against a fixed process table and answers with
+    `ConvertTo-Json`-shaped output (single element arrays unwrapped, empty ones as null)."""
+
+    def __init__(self, processes: list[dict[str, Any]]):
+        self.processes = processes
+        self.launches: list[str] = []
+
+    def __call__(self, command: str, timeout: int) -> subprocess.CompletedProcess[str]:
+        self.launches.append(command)
+        assert process_monitor.PROBE_MARKER in command
+        specs = json.loads(command.split("ConvertFrom-Json '", 1)[1].split("')", 1)[0].replace("''", "'"))
+        by_tab: dict[str, Any] = {}
+        for spec in specs:
+            hits = [proc for proc in self.processes if spec["primary"] not in ("", "powershell") and spec["primary"] in proc["cmdline"]
+                    and sum(part in proc["cmdline"] for part in spec["parts"]) >= 2]
+            by_tab[spec["tab"]] = None if not hits else hits[0] if len(hits) == 1 else hits
+        payload = {"tabs": by_tab, "wt_windows": {"Id": 1, "ProcessName": "WindowsTerminal", "StartTime": "", "WindowTitle": "w"}}
+        return subprocess.CompletedProcess(args=command, returncode=0, stdout="noise\n" + json.dumps(payload) + "\n", stderr="")
+
+
+NAMES = ["alpha", "bravo", "charlie", "delta", "echo", "foxtrot", "golf", "hotel", "india", "juliet", "kilo", "lima"]
+
+
+def _tabs(count: int) -> list[TabConfig]:
+    return [{"tabName": f"tab{idx}", "startDir": "~", "command": f"python script_{name}.py --config {name}.yaml"} for idx, name in enumerate(NAMES[:count])]
+
+
+def test_one_launch_per_refresh_not_per_tab(monkeypatch: pytest.MonkeyPatch) -> None:
+    clock = [1000.0]
+    monkeypatch.setattr(process_monitor.time, "monotonic", lambda: clock[0])
+    tabs = _tabs(12)
+    running = [{"pid": 100 + idx, "name": "python.exe", "cmdline": tab["command"], "start_time": "", "parent_pid": 1} for idx, tab in enumerate(tabs) if idx % 3 == 0]
+    shell = FakePowerShell(running)
+    monitor = WTProcessMonitor(executor=shell)
+
+    status = monitor.check_all_commands_status(tabs)
+    assert len(shell.launches) == 1
+    assert [name for name, report in status.items() if report["running"]] == ["tab0", "tab3", "tab6", "tab9"]
+    assert status["tab3"]["processes"][0]["pid"] == 103
+
+    for tab in tabs: monitor.check_command_status(tab["tabName"], tabs)  # per-tab checks within the ttl reuse the probe.
+    assert monitor.get_windows_terminal_windows()["windows"][0]["Id"] == 1
+    assert len(shell.launches) == 1
+
+    clock[0] += process_monitor.STATUS_CACHE_TTL_SECONDS + 0.1  # next refresh of a monitoring loop.
+    monitor.check_all_commands_status(tabs)
+    assert len(shell.launches) == 2
+    monitor.check_all_commands_status(tabs[:5])  # a different tab set is probed afresh.
+    assert len(shell.launches) == 3
+
+
+def test_failed_probe_reports_every_tab() -> None:
+    def failing(command: str, timeout: int) -> subprocess.CompletedProcess[str]:
+        return subprocess.CompletedProcess(args=command, returncode=1, stdout="", stderr="boom")
+    status = WTProcessMonitor(executor=failing).check_all_commands_status(_tabs(3))
+    assert {report["status"] for report in status.values()} == {"error"} and len(status) == 3